@@ -0,0 +1,98 @@
+# bench/fake_odoo.py
+"""
+Local Odoo stand-in for provisioning benchmarks.
+
+Implements just the database-manager endpoints the onboarding stack calls:
+    POST /web/database/list       JSON-RPC or empty form -> {"result": [names]}
+    POST /web/database/create     form (master_pwd, name, ...) -> sleeps, then adds name
+    POST /web/database/duplicate  form (master_pwd, name, new_name) -> sleeps, then adds new_name
+    POST /web/database/drop       form (master_pwd, name)
+
+Latency and failures are configurable so the gateway/worker can be measured
+without a real Odoo:
+    FAKE_LIST_LATENCY_MS     default 20
+    FAKE_CREATE_LATENCY_MS   default 3000 (mean; +/- FAKE_JITTER)
+    FAKE_CLONE_LATENCY_MS    default 500
+    FAKE_JITTER              default 0.2 (fraction of the mean)
+    FAKE_ERROR_RATE          default 0.0 (fraction of creates answering HTTP 500)
+    FAKE_MASTER_PASSWORD     default "admin"
+
+Run:  uvicorn fake_odoo:app --port 8069
+"""
+
+import asyncio
+import os
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+LIST_LATENCY   = float(os.getenv("FAKE_LIST_LATENCY_MS", "20")) / 1000
+CREATE_LATENCY = float(os.getenv("FAKE_CREATE_LATENCY_MS", "3000")) / 1000
+CLONE_LATENCY  = float(os.getenv("FAKE_CLONE_LATENCY_MS", "500")) / 1000
+JITTER         = float(os.getenv("FAKE_JITTER", "0.2"))
+ERROR_RATE     = float(os.getenv("FAKE_ERROR_RATE", "0.0"))
+MASTER_PWD     = os.getenv("FAKE_MASTER_PASSWORD", "admin")
+
+app = FastAPI()
+_databases: set[str] = set()
+_stats = {"list": 0, "create": 0, "duplicate": 0, "drop": 0, "errors": 0}
+
+
+async def _sleep(mean: float) -> None:
+    await asyncio.sleep(max(0.0, random.uniform(mean * (1 - JITTER), mean * (1 + JITTER))))
+
+
+@app.post("/web/database/list")
+async def db_list():
+    _stats["list"] += 1
+    await _sleep(LIST_LATENCY)
+    return {"jsonrpc": "2.0", "id": None, "result": sorted(_databases)}
+
+
+@app.post("/web/database/create")
+async def db_create(request: Request):
+    _stats["create"] += 1
+    form = await request.form()
+    if form.get("master_pwd") != MASTER_PWD:
+        return PlainTextResponse("Access Denied", status_code=403)
+    await _sleep(CREATE_LATENCY)
+    if random.random() < ERROR_RATE:
+        _stats["errors"] += 1
+        return PlainTextResponse("Injected failure", status_code=500)
+    _databases.add(form["name"])
+    return PlainTextResponse("", status_code=303, headers={"Location": "/odoo"})
+
+
+@app.post("/web/database/duplicate")
+async def db_duplicate(request: Request):
+    _stats["duplicate"] += 1
+    form = await request.form()
+    if form.get("master_pwd") != MASTER_PWD or form.get("name") not in _databases:
+        return PlainTextResponse("Database duplication error", status_code=400)
+    await _sleep(CLONE_LATENCY)
+    _databases.add(form["new_name"])
+    return PlainTextResponse("", status_code=303, headers={"Location": "/web/database/manager"})
+
+
+@app.post("/web/database/drop")
+async def db_drop(request: Request):
+    _stats["drop"] += 1
+    form = await request.form()
+    if form.get("master_pwd") == MASTER_PWD:
+        _databases.discard(form.get("name"))
+    return PlainTextResponse("", status_code=303, headers={"Location": "/web/database/manager"})
+
+
+@app.get("/bench/stats")
+async def bench_stats():
+    """Call counters + current DB count (read by run_bench.py)."""
+    return JSONResponse({**_stats, "databases": len(_databases)})
+
+
+@app.post("/bench/reset")
+async def bench_reset():
+    _databases.clear()
+    for k in _stats:
+        _stats[k] = 0
+    return {"ok": True}
@@ -0,0 +1,179 @@
+# bench/run_bench.py
+"""
+Provisioning throughput benchmark for the onboarding gateway + worker.
+
+Each virtual user walks the real browser flow with its own cookie jar:
+    POST /submit -> POST /create-db (scrape nonce payload) -> POST /api/create-db
+    -> poll GET /api/jobs/{id} until succeeded/failed
+and the run is repeated for every concurrency level. Point the stack at
+bench/fake_odoo.py (see bench/docker-compose.bench.yml) to measure the gateway
+and worker without a real Odoo.
+
+Per level it reports p50/p95/p99 latency for each step and end to end,
+throughput (completed onboardings per minute) and error rate.
+
+Usage:
+    python run_bench.py --base-url http://localhost:8000 \\
+        --concurrency 1,5,10,25 --requests 50 [--fake-url http://localhost:8069] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import secrets
+import sys
+import time
+
+import httpx
+
+PAYLOAD_RE = re.compile(r"const payload = (\{.*?\});", re.S)
+STEPS = ("submit", "create_page", "enqueue", "provision", "total")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (values need not be sorted); None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+async def onboard_once(base_url, db_name, edition, poll_interval, job_timeout):
+    """Run one onboarding; returns ({step: seconds}, error or None)."""
+    timings = {}
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, follow_redirects=False) as client:
+        t = time.perf_counter()
+        r = await client.post("/submit", data={
+            "company_name": f"Bench {db_name}",
+            "db_name": db_name,
+            "admin_email": f"{db_name}@bench.invalid",
+            "odoo_edition": edition,
+        })
+        timings["submit"] = time.perf_counter() - t
+        if r.status_code != 302:
+            return timings, f"submit HTTP {r.status_code}"
+
+        t = time.perf_counter()
+        r = await client.post("/create-db", data={
+            "db_name": db_name,
+            "db_password": secrets.token_urlsafe(12),
+            "lang": "en_US",
+            "country": "ZM",
+            "edition": edition,
+        })
+        timings["create_page"] = time.perf_counter() - t
+        match = PAYLOAD_RE.search(r.text) if r.status_code == 200 else None
+        if not match:
+            return timings, f"create-db HTTP {r.status_code} (no payload)"
+        payload = json.loads(match.group(1))
+
+        t = time.perf_counter()
+        r = await client.post("/api/create-db", json=payload)
+        timings["enqueue"] = time.perf_counter() - t
+        body = r.json() if r.headers.get("content-type", "").startswith("application/json") else {}
+        if not body.get("ok"):
+            return timings, f"api/create-db HTTP {r.status_code}: {body.get('error')}"
+
+        t = time.perf_counter()
+        if body.get("job_id"):
+            deadline = t + job_timeout
+            while True:
+                await asyncio.sleep(poll_interval)
+                r = await client.get(f"/api/jobs/{body['job_id']}")
+                job = r.json()
+                if job.get("state") == "succeeded":
+                    break
+                if job.get("state") == "failed" or not job.get("ok"):
+                    timings["provision"] = time.perf_counter() - t
+                    return timings, f"job failed: {job.get('error')}"
+                if time.perf_counter() > deadline:
+                    timings["provision"] = time.perf_counter() - t
+                    return timings, "job timed out"
+        timings["provision"] = time.perf_counter() - t
+    timings["total"] = time.perf_counter() - started
+    return timings, None
+
+
+async def run_level(args, level, run_id):
+    """Run args.requests onboardings with `level` in flight at once."""
+    sem = asyncio.Semaphore(level)
+    results = []
+
+    async def one(i):
+        async with sem:
+            db_name = f"bench_{run_id}_c{level}_{i}"
+            try:
+                results.append(await onboard_once(args.base_url, db_name, args.edition,
+                                                  args.poll_interval, args.job_timeout))
+            except Exception as e:
+                results.append(({}, f"{type(e).__name__}: {e}"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    ok = [t for t, err in results if err is None]
+    errors = [err for _, err in results if err is not None]
+    report = {
+        "concurrency": level,
+        "requests": len(results),
+        "succeeded": len(ok),
+        "error_rate": len(errors) / len(results) if results else 0.0,
+        "elapsed_s": elapsed,
+        "throughput_per_min": len(ok) / elapsed * 60 if elapsed else 0.0,
+        "latency_s": {},
+        "sample_errors": sorted(set(errors))[:5],
+    }
+    for step in STEPS:
+        samples = [t[step] for t in ok if step in t]
+        report["latency_s"][step] = {f"p{p}": percentile(samples, p) for p in (50, 95, 99)}
+    return report
+
+
+def print_report(report):
+    fmt = lambda v: "-" if v is None else f"{v * 1000:8.0f}"
+    print(f"\n== concurrency {report['concurrency']}: {report['succeeded']}/{report['requests']} ok, "
+          f"error rate {report['error_rate']:.1%}, {report['throughput_per_min']:.1f} onboardings/min "
+          f"({report['elapsed_s']:.1f}s)")
+    print(f"   {'step':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for step, pcts in report["latency_s"].items():
+        print(f"   {step:<12}{fmt(pcts['p50'])} {fmt(pcts['p95'])} {fmt(pcts['p99'])}")
+    for err in report["sample_errors"]:
+        print(f"   ! {err}")
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000", help="onboarding web URL")
+    parser.add_argument("--fake-url", default="", help="fake Odoo URL (resets it and prints its counters)")
+    parser.add_argument("--concurrency", default="1,5,10,25", help="comma-separated levels")
+    parser.add_argument("--requests", type=int, default=50, help="onboardings per level")
+    parser.add_argument("--edition", default="Community", choices=("Community", "Enterprise"))
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="job poll interval (s)")
+    parser.add_argument("--job-timeout", type=float, default=600, help="give up on a job after (s)")
+    parser.add_argument("--json", default="", help="also write the reports to this file")
+    args = parser.parse_args(argv)
+
+    run_id = secrets.token_hex(3)
+    reports = []
+    async with httpx.AsyncClient(timeout=10) as admin:
+        for level in (int(c) for c in args.concurrency.split(",") if c.strip()):
+            if args.fake_url:
+                await admin.post(f"{args.fake_url}/bench/reset")
+            report = await run_level(args, level, run_id)
+            if args.fake_url:
+                report["fake_odoo"] = (await admin.get(f"{args.fake_url}/bench/stats")).json()
+            print_report(report)
+            reports.append(report)
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(reports, fh, indent=2)
+    return 0 if all(r["error_rate"] == 0 for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1 +1,5 @@
-CREATE TABLE IF NOT EXISTS clients (id SERIAL PRIMARY KEY, company_name VARCHAR(255) NOT NULL, admin_email VARCHAR(255) NOT NULL, odoo_edition VARCHAR(50) NOT NULL);
+CREATE TABLE IF NOT EXISTS clients (id SERIAL PRIMARY KEY, company_name VARCHAR(255) NOT NULL, admin_email VARCHAR(255) NOT NULL, odoo_edition VARCHAR(50) NOT NULL, db_name VARCHAR(63) NOT NULL DEFAULT '', created_at TIMESTAMPTZ NOT NULL DEFAULT now());
+CREATE INDEX IF NOT EXISTS idx_clients_db_name ON clients (db_name);
+CREATE INDEX IF NOT EXISTS idx_clients_created_at ON clients (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_clients_edition_created_at ON clients (odoo_edition, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_clients_admin_email ON clients (lower(admin_email) text_pattern_ops);
@@ -12,6 +12,9 @@ from markupsafe import Markup
 
 _logger = logging.getLogger(__name__)
 
+# Number of statement lines whose matching candidates are searched at once by the auto-reconciliation CRON
+AUTO_RECONCILE_MATCHING_BATCH_SIZE = 500
+
 class AccountBankStatement(models.Model):
     _name = "account.bank.statement"
     _inherit = ['mail.thread.main.attachment', 'account.bank.statement']
@@ -133,30 +136,43 @@ class AccountBankStatementLine(models.Model):
         # concurrent update in order to avoid the whole transaction to be rollbacked.
         self.env.cr.execute("SELECT 1 FROM account_bank_statement_line WHERE id in %s FOR UPDATE", [tuple(st_lines.ids)])
 
+        # The tokens of the statement lines are matched with the journal items by batches, instead of once per statement line.
+        reconcile_models = self.env['account.reconcile.model'].search([
+            ('rule_type', '=', 'invoice_matching'),
+            ('company_id', 'in', st_lines.company_id.ids),
+        ])
+        # The candidates of the current batch are read by the matching from the cursor cache (see _get_invoice_matching_amls_candidates).
         nb_auto_reconciled_lines = 0
-        for index, st_line in enumerate(st_lines):
-            # we want the cron to run only for limit_time seconds
-            if limit_time and fields.Datetime.now().timestamp() - start_time.timestamp() > limit_time:
-                remaining_line_id = st_line.id
-                st_lines = st_lines[:index]
-                break
-            wizard = self.env['bank.rec.widget'].with_context(default_st_line_id=st_line.id).new({})
-            wizard._action_trigger_matching_rules()
-            if wizard.state == 'valid' and wizard.matching_rules_allow_auto_reconcile:
-                try:
-                    wizard._action_validate()
-                    if st_line.is_reconciled:
-                        st_line.move_id.message_post(body=_(
-                            "This bank transaction has been automatically validated using the reconciliation model '%s'.",
-                            ', '.join(st_line.move_id.line_ids.reconcile_model_id.mapped('name')),
-                        ))
-                        nb_auto_reconciled_lines += 1
-                except UserError as e:
-                    _logger.info("Failed to auto reconcile statement line %s due to user error: %s",
-                        st_line.id,
-                        str(e)
+        try:
+            for index, st_line in enumerate(st_lines):
+                # we want the cron to run only for limit_time seconds
+                if limit_time and fields.Datetime.now().timestamp() - start_time.timestamp() > limit_time:
+                    remaining_line_id = st_line.id
+                    st_lines = st_lines[:index]
+                    break
+                if index % AUTO_RECONCILE_MATCHING_BATCH_SIZE == 0:
+                    self.env.cr.cache['invoice_matching_batch_candidates'] = reconcile_models._get_invoice_matching_batch_candidates(
+                        st_lines[index:index + AUTO_RECONCILE_MATCHING_BATCH_SIZE],
                     )
-                    continue
+                wizard = self.env['bank.rec.widget'].with_context(default_st_line_id=st_line.id).new({})
+                wizard._action_trigger_matching_rules()
+                if wizard.state == 'valid' and wizard.matching_rules_allow_auto_reconcile:
+                    try:
+                        wizard._action_validate()
+                        if st_line.is_reconciled:
+                            st_line.move_id.message_post(body=_(
+                                "This bank transaction has been automatically validated using the reconciliation model '%s'.",
+                                ', '.join(st_line.move_id.line_ids.reconcile_model_id.mapped('name')),
+                            ))
+                            nb_auto_reconciled_lines += 1
+                    except UserError as e:
+                        _logger.info("Failed to auto reconcile statement line %s due to user error: %s",
+                            st_line.id,
+                            str(e)
+                        )
+                        continue
+        finally:
+            self.env.cr.cache.pop('invoice_matching_batch_candidates', None)
 
         st_lines.write({'cron_last_check': start_time})
 
@@ -9,6 +9,8 @@ from odoo import fields, models, api, _, Command
 from odoo.exceptions import UserError
 from odoo.osv import expression
 from odoo.tools import SQL, float_compare
+from odoo.tools.sql import create_index, drop_index
+from odoo.addons.account_accountant.models.account_reconcile_model import INVOICE_MATCHING_AML_INDEX_WHERE, INVOICE_MATCHING_TOKENS_EXPRESSION
 
 
 _logger = logging.getLogger(__name__)
@@ -64,6 +66,20 @@ class AccountMove(models.Model):
     show_signature_area = fields.Boolean(compute='_compute_signature')
     signature = fields.Binary(compute='_compute_signature')  # can't be `related`: the sign module might not be there
 
+    def init(self):
+        super().init()
+        # Tokens of the number and reference of the entries, matched with the statement lines by the 'invoice_matching' rules.
+        for column in ('name', 'ref'):
+            # Previous definition, whose keys weren't bounded
+            drop_index(self.env.cr, f'account_move_invoice_matching_{column}_tokens_idx', self._table)
+            create_index(
+                self.env.cr,
+                f'account_move_invoice_matching_{column}_token_keys_idx',
+                self._table,
+                [INVOICE_MATCHING_TOKENS_EXPRESSION.format(column=column)],
+                method='gin',
+            )
+
     @api.depends('state', 'move_type', 'invoice_user_id')
     def _compute_signing_user(self):
         other_moves = self.filtered(lambda move: not move.is_sale_document())
@@ -452,6 +468,19 @@ class AccountMoveLine(models.Model):
     has_deferred_moves = fields.Boolean(compute='_compute_has_deferred_moves')
     has_abnormal_deferred_dates = fields.Boolean(compute='_compute_has_abnormal_deferred_dates')
 
+    def init(self):
+        super().init()
+        # Tokens of the label of the open items, matched with the statement lines by the 'invoice_matching' rules.
+        drop_index(self.env.cr, 'account_move_line_invoice_matching_name_tokens_idx', self._table)  # Previous definition
+        create_index(
+            self.env.cr,
+            'account_move_line_invoice_matching_name_token_keys_idx',
+            self._table,
+            [INVOICE_MATCHING_TOKENS_EXPRESSION.format(column='name')],
+            method='gin',
+            where=INVOICE_MATCHING_AML_INDEX_WHERE,
+        )
+
     def _order_to_sql(self, order, query, alias=None, reverse=False):
         sql_order = super()._order_to_sql(order, query, alias, reverse)
         preferred_aml_residual_value = self._context.get('preferred_aml_value')
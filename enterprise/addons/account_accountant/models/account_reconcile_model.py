@@ -5,6 +5,24 @@ import re
 from collections import defaultdict
 from dateutil.relativedelta import relativedelta
 
+# The tokens a text column of the journal items/entries may match with the tokens of a statement line: its numerical tokens and
+# its whole value (see _get_invoice_matching_aml_tokens_query). It is indexed (see AccountMove.init / AccountMoveLine.init),
+# so that the candidates of the 'invoice_matching' rules are found with index probes instead of splitting all the journal items.
+# The keys of a GIN index can't exceed a third of a page: the whole value is only indexed on its first
+# INVOICE_MATCHING_EXACT_TOKEN_SIZE characters, and the numerical tokens are only taken from the first 2000 characters.
+INVOICE_MATCHING_EXACT_TOKEN_SIZE = 200
+INVOICE_MATCHING_TOKENS_EXPRESSION = (
+    r"""(REGEXP_SPLIT_TO_ARRAY(SUBSTRING(REGEXP_REPLACE(LEFT({column}, 2000), '[^0-9\s]', '', 'g'), '\S(?:.*\S)*'), '\s+')"""
+    r""" || ARRAY[LEFT({column}, %s)::text])""" % INVOICE_MATCHING_EXACT_TOKEN_SIZE
+)
+# The journal items whose label is indexed: the open items, the only ones the 'invoice_matching' rules can match. The journal items
+# of the accounts that are not reconcilable have no residual amount.
+INVOICE_MATCHING_AML_INDEX_WHERE = """parent_state = 'posted' AND reconciled IS NOT TRUE AND (amount_residual != 0 OR amount_residual_currency != 0)"""
+
+# Maximum number of candidates kept for a statement line by _get_invoice_matching_batch_candidates. The statement lines having more are
+# left out of the batch, to be matched on their own with their whole domain.
+INVOICE_MATCHING_BATCH_CANDIDATES_LIMIT = 100
+
 
 class AccountReconcileModel(models.Model):
     _inherit = 'account.reconcile.model'
@@ -231,81 +249,36 @@ class AccountReconcileModel(models.Model):
         tables = query.from_clause
         where_clause = query.where_clause or SQL("TRUE")
 
-        aml_cte = SQL()
-        sub_queries: list[SQL] = []
         numerical_tokens, exact_tokens, _text_tokens = self._get_invoice_matching_st_line_tokens(st_line)
         if numerical_tokens or exact_tokens:
-            aml_cte = SQL('''
-                WITH aml_cte AS (
-                    SELECT
-                        account_move_line.id as account_move_line_id,
-                        account_move_line.date as account_move_line_date,
-                        account_move_line.date_maturity as account_move_line_date_maturity,
-                        account_move_line.name as account_move_line_name,
-                        account_move_line__move_id.name as account_move_line__move_id_name,
-                        account_move_line__move_id.ref as account_move_line__move_id_ref
-                    FROM %s
-                    JOIN account_move account_move_line__move_id ON account_move_line__move_id.id = account_move_line.move_id
-                    WHERE %s
-                )
-            ''', tables, where_clause)
-        if numerical_tokens:
-            for table_alias, field in (
-                ('account_move_line', 'name'),
-                ('account_move_line__move_id', 'name'),
-                ('account_move_line__move_id', 'ref'),
-            ):
-                sub_queries.append(SQL(r'''
-                    SELECT
-                        account_move_line_id as id,
-                        account_move_line_date as date,
-                        account_move_line_date_maturity as date_maturity,
-                        UNNEST(
-                            REGEXP_SPLIT_TO_ARRAY(
-                                SUBSTRING(
-                                    REGEXP_REPLACE(%(field)s, '[^0-9\s]', '', 'g'),
-                                    '\S(?:.*\S)*'
-                                ),
-                                '\s+'
-                            )
-                        ) AS token
-                    FROM aml_cte
-                    WHERE %(field)s IS NOT NULL
-                ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
-        if exact_tokens:
-            for table_alias, field in (
-                ('account_move_line', 'name'),
-                ('account_move_line__move_id', 'name'),
-                ('account_move_line__move_id', 'ref'),
-            ):
-                sub_queries.append(SQL('''
-                    SELECT
-                        account_move_line_id as id,
-                        account_move_line_date as date,
-                        account_move_line_date_maturity as date_maturity,
-                        %(field)s AS token
-                    FROM aml_cte
-                    WHERE %(field)s != ''
-                ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
-        if sub_queries:
-            order_by = get_order_by_clause(prefix=SQL('sub.'))
-            candidate_ids = [r[0] for r in self.env.execute_query(SQL(
-                '''
-                    %s
-                    SELECT
-                        sub.id,
-                        COUNT(*) AS nb_match
-                    FROM (%s) AS sub
-                    WHERE sub.token IN %s
-                    GROUP BY sub.date_maturity, sub.date, sub.id
-                    HAVING COUNT(*) > 0
-                    ORDER BY nb_match DESC, %s
-                ''',
-                aml_cte,
-                SQL(" UNION ALL ").join(sub_queries),
-                tuple(numerical_tokens + exact_tokens),
-                order_by,
-            ))]
+            batch_candidates = self.env.cr.cache.get('invoice_matching_batch_candidates', {}).get(self.id, {})
+            if st_line.id in batch_candidates:
+                # The tokens were already matched for a whole batch of statement lines: only keep the candidates in aml_domain
+                ranked_candidate_ids = batch_candidates[st_line.id]
+                kept_candidate_ids = set(self.env['account.move.line']._search([('id', 'in', ranked_candidate_ids)] + aml_domain))
+                candidate_ids = [candidate_id for candidate_id in ranked_candidate_ids if candidate_id in kept_candidate_ids]
+            else:
+                order_by = get_order_by_clause(prefix=SQL('sub.'))
+                candidate_ids = [r[0] for r in self.env.execute_query(SQL(
+                    '''
+                        WITH aml_cte AS (%s)
+                        SELECT
+                            sub.id,
+                            COUNT(*) AS nb_match
+                        FROM (%s) AS sub
+                        WHERE sub.token IN %s
+                        GROUP BY sub.date_maturity, sub.date, sub.id
+                        HAVING COUNT(*) > 0
+                        ORDER BY nb_match DESC, %s
+                    ''',
+                    self._get_invoice_matching_aml_cte_query(
+                        tables,
+                        SQL("%s AND %s", where_clause, self._get_invoice_matching_tokens_condition(numerical_tokens + exact_tokens)),
+                    ),
+                    self._get_invoice_matching_aml_tokens_query(numerical=bool(numerical_tokens), exact=bool(exact_tokens)),
+                    tuple(numerical_tokens + exact_tokens),
+                    order_by,
+                ))]
             if candidate_ids:
                 return {
                     'allow_auto_reconcile': True,
@@ -353,6 +326,181 @@ class AccountReconcileModel(models.Model):
                 'amls': amls,
             }
 
+    def _get_invoice_matching_aml_cte_query(self, tables, where_clause):
+        """ The journal items among which the tokens of the statement lines are searched, with the fields they are matched on. """
+        return SQL(
+            """
+            SELECT
+                account_move_line.id as account_move_line_id,
+                account_move_line.date as account_move_line_date,
+                account_move_line.date_maturity as account_move_line_date_maturity,
+                account_move_line.name as account_move_line_name,
+                account_move_line__move_id.name as account_move_line__move_id_name,
+                account_move_line__move_id.ref as account_move_line__move_id_ref
+            FROM %s
+            JOIN account_move account_move_line__move_id ON account_move_line__move_id.id = account_move_line.move_id
+            WHERE %s
+            """,
+            tables,
+            where_clause,
+        )
+
+    def _get_invoice_matching_tokens_condition(self, tokens):
+        """ Restricts account_move_line to the journal items whose label, or whose journal entry's number or reference, may match one
+        of tokens, using the indexes on INVOICE_MATCHING_TOKENS_EXPRESSION. The tokens are still matched exactly afterwards.
+        """
+        # The whole values are indexed truncated: so are the tokens that may be one of them
+        tokens = set(tokens) | {token[:INVOICE_MATCHING_EXACT_TOKEN_SIZE] for token in tokens}
+        return SQL(
+            """
+            account_move_line.id IN (
+                SELECT line.id
+                  FROM account_move_line line
+                 WHERE %(line_index_where)s
+                   AND %(line_name_tokens)s && %(tokens)s::text[]
+                 UNION
+                SELECT line.id
+                  FROM account_move move
+                  JOIN account_move_line line ON line.move_id = move.id
+                 WHERE %(move_name_tokens)s && %(tokens)s::text[]
+                    OR %(move_ref_tokens)s && %(tokens)s::text[]
+            )
+            """,
+            line_index_where=SQL(INVOICE_MATCHING_AML_INDEX_WHERE),
+            line_name_tokens=SQL(INVOICE_MATCHING_TOKENS_EXPRESSION.format(column='line.name')),
+            move_name_tokens=SQL(INVOICE_MATCHING_TOKENS_EXPRESSION.format(column='move.name')),
+            move_ref_tokens=SQL(INVOICE_MATCHING_TOKENS_EXPRESSION.format(column='move.ref')),
+            tokens=list(tokens),
+        )
+
+    def _get_invoice_matching_aml_tokens_query(self, numerical=True, exact=True):
+        """ Splits the journal items of aml_cte into (id, date, date_maturity, numerical, token) rows, to be matched with the numerical and/or exact
+        tokens of the statement lines (see _get_invoice_matching_st_line_tokens).
+        """
+        sub_queries = []
+        if numerical:
+            for table_alias, field in (
+                ('account_move_line', 'name'),
+                ('account_move_line__move_id', 'name'),
+                ('account_move_line__move_id', 'ref'),
+            ):
+                sub_queries.append(SQL(r'''
+                    SELECT
+                        account_move_line_id as id,
+                        account_move_line_date as date,
+                        account_move_line_date_maturity as date_maturity,
+                        TRUE AS numerical,
+                        UNNEST(
+                            REGEXP_SPLIT_TO_ARRAY(
+                                SUBSTRING(
+                                    REGEXP_REPLACE(%(field)s, '[^0-9\s]', '', 'g'),
+                                    '\S(?:.*\S)*'
+                                ),
+                                '\s+'
+                            )
+                        ) AS token
+                    FROM aml_cte
+                    WHERE %(field)s IS NOT NULL
+                ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
+        if exact:
+            for table_alias, field in (
+                ('account_move_line', 'name'),
+                ('account_move_line__move_id', 'name'),
+                ('account_move_line__move_id', 'ref'),
+            ):
+                sub_queries.append(SQL('''
+                    SELECT
+                        account_move_line_id as id,
+                        account_move_line_date as date,
+                        account_move_line_date_maturity as date_maturity,
+                        FALSE AS numerical,
+                        %(field)s AS token
+                    FROM aml_cte
+                    WHERE %(field)s != ''
+                ''', field=SQL("%s_%s", SQL(table_alias), SQL(field))))
+        return SQL(" UNION ALL ").join(sub_queries)
+
+    def _get_invoice_matching_batch_candidates(self, st_lines):
+        """ Matches the tokens of all st_lines with the journal items at once, for each 'invoice_matching' model of self, as
+        _get_invoice_matching_amls_candidates does for a single statement line.
+
+        The journal items are only restricted to the open ones of the companies of the models here: the rest of the domain of each
+        statement line (partner, amount sign, currency, ...) is applied to its candidates when it is matched.
+
+        At most INVOICE_MATCHING_BATCH_CANDIDATES_LIMIT candidates are fetched per statement line: the statement lines with more are
+        left out, as keeping only the first ones could drop the candidates their domain keeps.
+
+        :return: A dict {model_id: {st_line_id: candidate_ids}} covering the statement lines of the company of each model, with the
+                 candidates ranked as by _get_invoice_matching_amls_candidates. The matching reads it from the
+                 'invoice_matching_batch_candidates' key of the cursor cache.
+        """
+        self.env['account.move'].flush_model()
+        self.env['account.move.line'].flush_model()
+
+        batch_candidates = {}
+        for rec_model in self.filtered(lambda m: m.rule_type == 'invoice_matching'):
+            company_st_lines = st_lines.filtered(lambda line: line.company_id == rec_model.company_id)
+            batch_candidates[rec_model.id] = candidates_per_st_line = {st_line.id: [] for st_line in company_st_lines}
+
+            # As for a single statement line, the numerical (resp. exact) tokens of the journal items are only considered if the
+            # statement line has numerical (resp. exact) tokens.
+            st_line_tokens = []
+            for st_line in company_st_lines:
+                numerical_tokens, exact_tokens, _text_tokens = rec_model._get_invoice_matching_st_line_tokens(st_line)
+                st_line_tokens += [
+                    (st_line.id, token, bool(numerical_tokens), bool(exact_tokens))
+                    for token in set(numerical_tokens + exact_tokens)
+                ]
+            if not st_line_tokens:
+                continue
+
+            query = self.env['account.move.line']._where_calc([
+                ('display_type', 'not in', ('line_section', 'line_note')),
+                ('company_id', 'child_of', rec_model.company_id.root_id.id),
+                ('parent_state', '=', 'posted'),
+                ('reconciled', '=', False),
+            ])
+            query.add_where(self._get_invoice_matching_tokens_condition([token for _st_line_id, token, _numerical, _exact in st_line_tokens]))
+            direction = SQL(' DESC') if rec_model.matching_order == 'new_first' else SQL(' ASC')
+            rows = self.env.execute_query(SQL(
+                """
+                    WITH aml_cte AS (%(aml_cte)s),
+                    st_line_token(st_line_id, token, numerical, exact) AS (
+                        SELECT UNNEST(%(st_line_ids)s::int[]), UNNEST(%(tokens)s::text[]), UNNEST(%(numerical)s::bool[]), UNNEST(%(exact)s::bool[])
+                    ),
+                    ranked_candidate AS (
+                        SELECT st_line_token.st_line_id,
+                               sub.id,
+                               ROW_NUMBER() OVER (PARTITION BY st_line_token.st_line_id ORDER BY COUNT(*) DESC, %(order_by)s) AS rank
+                          FROM (%(aml_tokens)s) AS sub
+                          JOIN st_line_token
+                            ON st_line_token.token = sub.token
+                           AND CASE WHEN sub.numerical THEN st_line_token.numerical ELSE st_line_token.exact END
+                      GROUP BY st_line_token.st_line_id, sub.date_maturity, sub.date, sub.id
+                    )
+                    SELECT st_line_id, id
+                      FROM ranked_candidate
+                     WHERE rank <= %(limit)s
+                  ORDER BY st_line_id, rank
+                """,
+                aml_cte=self._get_invoice_matching_aml_cte_query(query.from_clause, query.where_clause),
+                st_line_ids=[st_line_id for st_line_id, _token, _numerical, _exact in st_line_tokens],
+                tokens=[token for _st_line_id, token, _numerical, _exact in st_line_tokens],
+                numerical=[numerical for _st_line_id, _token, numerical, _exact in st_line_tokens],
+                exact=[exact for _st_line_id, _token, _numerical, exact in st_line_tokens],
+                aml_tokens=self._get_invoice_matching_aml_tokens_query(),
+                order_by=SQL(", ").join(SQL("sub.%s%s", SQL(field), direction) for field in ('date_maturity', 'date', 'id')),
+                # One more than the limit, to know which statement lines have too many candidates
+                limit=INVOICE_MATCHING_BATCH_CANDIDATES_LIMIT + 1,
+            ))
+            for st_line_id, aml_id in rows:
+                candidates_per_st_line[st_line_id].append(aml_id)
+            for st_line_id, candidate_ids in list(candidates_per_st_line.items()):
+                if len(candidate_ids) > INVOICE_MATCHING_BATCH_CANDIDATES_LIMIT:
+                    del candidates_per_st_line[st_line_id]
+
+        return batch_candidates
+
     def _get_invoice_matching_rules_map(self):
         """ Get a mapping <priority_order, rule> that could be overridden in others modules.
 
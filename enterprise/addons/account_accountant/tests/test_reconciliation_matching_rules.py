@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from freezegun import freeze_time
 from contextlib import closing
+from unittest.mock import patch
 
 from odoo.addons.account.tests.common import AccountTestInvoicingCommon
 from odoo.tests import Form, tagged
@@ -1298,3 +1299,66 @@ class TestReconciliationMatchingRules(AccountTestInvoicingCommon):
                     'model': self.rule_1,
                 },
             })
+
+    @freeze_time('2020-01-01')
+    def test_invoice_matching_batch_candidates(self):
+        """ The candidates searched for a whole batch of statement lines must be the ones found line by line. """
+        self.rule_1.match_text_location_label = False
+        st_lines = self.env['account.bank.statement.line'].search([('company_id', '=', self.company.id)])
+        batch_candidates = self.rule_1._get_invoice_matching_batch_candidates(st_lines)
+        self.assertEqual(set(batch_candidates[self.rule_1.id]), set(st_lines.ids))
+
+        for st_line in st_lines:
+            partner = st_line._retrieve_partner()
+            with self.subTest(st_line=st_line.payment_ref):
+                self.env.cr.cache['invoice_matching_batch_candidates'] = batch_candidates
+                batch_matching = self.rule_1._apply_rules(st_line, partner)
+                self.env.cr.cache.pop('invoice_matching_batch_candidates')
+                self.assertDictEqual(batch_matching, self.rule_1._apply_rules(st_line, partner))
+
+    @freeze_time('2020-01-01')
+    def test_invoice_matching_batch_candidates_limit(self):
+        """ The statement lines matching too many journal items are left out of the batch, to be matched with their whole domain. """
+        self.rule_1.match_text_location_label = False
+        invoice_lines = self.env['account.move.line']
+        for _i in range(3):
+            invoice_lines += self._create_invoice_line(100, self.partner_1, 'out_invoice', ref='BATCH-LIMIT 424242')
+        st_line = self._create_st_line(amount=100, payment_ref='424242', partner_id=None)
+
+        with patch('odoo.addons.account_accountant.models.account_reconcile_model.INVOICE_MATCHING_BATCH_CANDIDATES_LIMIT', 3):
+            batch_candidates = self.rule_1._get_invoice_matching_batch_candidates(st_line)
+        self.assertEqual(set(batch_candidates[self.rule_1.id][st_line.id]), set(invoice_lines.ids))
+
+        with patch('odoo.addons.account_accountant.models.account_reconcile_model.INVOICE_MATCHING_BATCH_CANDIDATES_LIMIT', 2):
+            batch_candidates = self.rule_1._get_invoice_matching_batch_candidates(st_line)
+        self.assertNotIn(st_line.id, batch_candidates[self.rule_1.id])
+
+    def test_invoice_matching_tokens_condition(self):
+        """ The journal items are pre-selected on the indexed tokens of their label, number and reference. """
+        self.env.cr.execute("SELECT indexname FROM pg_indexes WHERE indexname LIKE '%%_invoice_matching_%%_token_keys_idx'")
+        self.assertEqual(
+            {row[0] for row in self.env.cr.fetchall()},
+            {
+                'account_move_invoice_matching_name_token_keys_idx',
+                'account_move_invoice_matching_ref_token_keys_idx',
+                'account_move_line_invoice_matching_name_token_keys_idx',
+            },
+        )
+
+        # Values too long to be index keys as a whole are indexed truncated
+        long_ref = 'RF99 7777 ' + 'X' * 5000
+        long_ref_line = self._create_invoice_line(100, self.partner_1, 'out_invoice', ref=long_ref)
+
+        self.env['account.move.line'].flush_model()
+        for tokens, expected_line in (
+            (['3456'], self.invoice_line_6),  # numerical token of the reference
+            (['RF12 3456'], self.invoice_line_6),  # whole reference
+            ([self.invoice_line_3.move_id.name], self.invoice_line_3),  # whole number
+            (['RF12'], self.env['account.move.line']),
+            (['7777'], long_ref_line),
+            ([long_ref], long_ref_line),
+        ):
+            query = self.env['account.move.line']._where_calc([('id', 'in', (self.invoice_line_3 + self.invoice_line_6 + long_ref_line).ids)])
+            query.add_where(self.rule_1._get_invoice_matching_tokens_condition(tokens))
+            with self.subTest(tokens=tokens):
+                self.assertEqual(self.env['account.move.line'].browse(query), expected_line)
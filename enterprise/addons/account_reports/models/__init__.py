@@ -5,6 +5,8 @@ from . import res_partner
 from . import res_company
 from . import account
 from . import account_report
+from . import account_report_balance_snapshot
+from . import account_report_totals_cache
 from . import account_analytic_report
 from . import bank_reconciliation_report
 from . import account_general_ledger
@@ -9,3 +9,18 @@ class AccountAccount(models.Model):
 
     exclude_provision_currency_ids = fields.Many2many('res.currency', relation='account_account_exclude_res_currency_provision', help="Whether or not we have to make provisions for the selected foreign currencies.")
     budget_item_ids = fields.One2many(comodel_name='account.report.budget.item', inverse_name='account_id')  # To use it in the domain when adding accounts from the report
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        accounts = super().create(vals_list)
+        self.env['account.report.data.version']._bump(accounts.company_ids.ids)
+        return accounts
+
+    def write(self, vals):
+        # Codes, types and tags of the accounts are used by the report engines to select journal items
+        self.env['account.report.data.version']._bump(self.company_ids.ids)
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump(self.company_ids.ids)
+        return super().unlink()
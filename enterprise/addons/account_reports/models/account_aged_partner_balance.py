@@ -185,7 +185,24 @@ class AgedPartnerBalanceCustomHandler(models.AbstractModel):
         tail_query = report._get_engine_query_tail(offset, limit)
         query = SQL(
             """
-            WITH period_table(date_start, date_stop, period_index) AS (%(period_table)s)
+            WITH period_table(date_start, date_stop, period_index) AS (%(period_table)s),
+
+            -- The lines possibly still open at date_to: those of the report not fully reconciled yet (as maintained by the
+            -- reconciliation on account_move_line.reconciled, see account_move_line_aged_open_items_idx), and those reconciled
+            -- after date_to.
+            open_items AS (
+                SELECT open_aml.id
+                  FROM account_move_line open_aml
+                  JOIN account_account open_account ON open_account.id = open_aml.account_id
+                 WHERE open_aml.reconciled IS NOT TRUE
+                   AND open_aml.company_id IN %(company_ids)s
+                   AND open_aml.date <= %(date_to)s
+                   AND open_account.account_type = %(internal_type)s
+                UNION
+                SELECT part.debit_move_id FROM account_partial_reconcile part WHERE part.max_date > %(date_to)s
+                UNION
+                SELECT part.credit_move_id FROM account_partial_reconcile part WHERE part.max_date > %(date_to)s
+            )
 
             SELECT
                 %(select_from_groupby)s
@@ -243,6 +260,7 @@ class AgedPartnerBalanceCustomHandler(models.AbstractModel):
                 )
 
             WHERE %(search_condition)s
+                AND %(open_items_condition)s
 
             GROUP BY %(groupby_clause)s
 
@@ -263,7 +281,10 @@ class AgedPartnerBalanceCustomHandler(models.AbstractModel):
             table_references=query.from_clause,
             currency_table_join=report._currency_table_aml_join(options),
             date_to=date_to,
+            company_ids=tuple(report.get_report_company_ids(options)),
             search_condition=query.where_clause,
+            open_items_condition=self._get_aged_open_items_condition(options, query),
+            internal_type=internal_type,
             groupby_clause=groupby_clause,
             having_debit=report._currency_table_apply_rate(SQL("CASE WHEN account_move_line.balance > 0  THEN account_move_line.balance else 0 END - COALESCE(part_debit.amount, 0)")),
             having_credit=report._currency_table_apply_rate(SQL("CASE WHEN account_move_line.balance < 0  THEN -account_move_line.balance else 0 END - COALESCE(part_credit.amount, 0)")),
@@ -289,6 +310,18 @@ class AgedPartnerBalanceCustomHandler(models.AbstractModel):
 
             return rslt
 
+    def _get_aged_open_items_condition(self, options, query):
+        """ Lines fully reconciled at date_to have no residual amount to age: only the open_items of the query need to be read.
+        When account_move_line is shadowed with other amounts (cash basis, analytic, budget), its reconciled flag doesn't
+        match them anymore, so all the lines are read.
+        """
+        if (
+            any(options.get(key) for key in ('compute_budget', 'analytic_accounts', 'analytic_groupby_option', 'report_cash_basis'))
+            or query._tables.get('account_move_line') != SQL.identifier('account_move_line')
+        ):
+            return SQL("TRUE")
+        return SQL("account_move_line.id IN (SELECT id FROM open_items)")
+
     def open_journal_items(self, options, params):
         params['view_ref'] = 'account.view_move_line_tree_grouped_partner'
         options_for_audit = {**options, 'date': {**options['date'], 'date_from': None}}
@@ -81,6 +81,10 @@ class AccountFollowupCustomHandler(models.AbstractModel):
 
         return lines, next_progress, treated_results_count, has_more
 
+    def _custom_xlsx_stream_expand_functions(self, report, options):
+        # The move lines are split into status lines by _get_partner_aml_report_lines, which needs all of them at once
+        return {}
+
     def _get_unfolded_partner_status_lines(self, report, options, partner_line_id):
         _dummy1, _dummy2, partner_id = report._parse_line_id(partner_line_id)[-1]
         due_line_id, overdue_line_id = None, None
@@ -375,11 +375,7 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                 has_more = True
                 break
 
-            # For asset_receivable the name will already contains the ref with the _compute_name
-            if aml_result['ref'] and aml_result['account_type'] != 'asset_receivable':
-                aml_result['communication'] = f"{aml_result['ref']} - {aml_result['name']}"
-            else:
-                aml_result['communication'] = aml_result['name']
+            aml_result['communication'] = self._get_aml_communication(aml_result)
 
             # The same aml can return multiple results when using account_report_cash_basis module, if the receivable/payable
             # is reconciled with multiple payments. In this case, the date shown for the move lines actually corresponds to the
@@ -404,6 +400,12 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
 
         return rslt, has_more
 
+    def _get_aml_communication(self, aml_result):
+        # For asset_receivable the name will already contains the ref with the _compute_name
+        if aml_result['ref'] and aml_result['account_type'] != 'asset_receivable':
+            return f"{aml_result['ref']} - {aml_result['name']}"
+        return aml_result['name']
+
     def _get_query_amls(self, report, options, expanded_account_ids, offset=0, limit=None) -> SQL:
         """ Construct a query retrieving the account.move.lines when expanding a report line with or without the load
         more.
@@ -690,14 +692,51 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
     def caret_option_audit_tax(self, options, params):
         return self.env['account.generic.tax.report.handler'].caret_option_audit_tax(options, params)
 
-    def _report_expand_unfoldable_line_general_ledger(self, line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=None):
-        def init_load_more_progress(line_dict):
-            return {
-                column['column_group_key']: line_col.get('no_format', 0)
-                for column, line_col in  zip(options['columns'], line_dict['columns'])
-                if column['expression_label'] == 'balance'
-            }
+    def _init_load_more_progress(self, options, line_dict):
+        return {
+            column['column_group_key']: line_col.get('no_format', 0)
+            for column, line_col in zip(options['columns'], line_dict['columns'])
+            if column['expression_label'] == 'balance'
+        }
 
+    def _custom_xlsx_stream_expand_functions(self, report, options):
+        # The move lines of the different column groups are merged by _get_aml_values, which needs all of them at once
+        if len(options['column_groups']) > 1:
+            return {}
+        return {'_report_expand_unfoldable_line_general_ledger': self._stream_unfoldable_line_general_ledger}
+
+    def _stream_unfoldable_line_general_ledger(self, report, options, line_dict):
+        """ Same lines as _report_expand_unfoldable_line_general_ledger without load more, with the move lines fetched by batches. """
+        account_id = report._get_res_id_from_line_id(line_dict['id'], 'account.account')
+        column_group_key = next(iter(options['column_groups']))
+
+        progress = {column_group_key: 0}
+        account, init_balance_by_col_group = self._get_initial_balance_values(report, [account_id], options)[account_id]
+        initial_balance_line = report._get_partner_and_general_ledger_initial_balance_line(options, line_dict['id'], init_balance_by_col_group, account.currency_id)
+        if initial_balance_line:
+            yield initial_balance_line
+            progress = self._init_load_more_progress(options, initial_balance_line)
+
+        # Rows of the same move line at the same date are consecutive, given the ordering of the query ; see _get_aml_values
+        pending_aml_result = None
+        for aml_result in report._stream_query_results(self._get_query_amls(report, options, [account_id])):
+            if pending_aml_result and (pending_aml_result['id'], pending_aml_result['date']) == (aml_result['id'], aml_result['date']):
+                for field in ('debit', 'credit', 'balance', 'amount_currency'):
+                    pending_aml_result[field] += aml_result[field]
+                continue
+
+            if pending_aml_result:
+                new_line = self._get_aml_line(report, line_dict['id'], options, {column_group_key: pending_aml_result}, progress)
+                progress = self._init_load_more_progress(options, new_line)
+                yield new_line
+
+            aml_result['communication'] = self._get_aml_communication(aml_result)
+            pending_aml_result = aml_result
+
+        if pending_aml_result:
+            yield self._get_aml_line(report, line_dict['id'], options, {column_group_key: pending_aml_result}, progress)
+
+    def _report_expand_unfoldable_line_general_ledger(self, line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=None):
         report = self.env.ref('account_reports.general_ledger_report')
         model, model_id = report._get_model_info_from_id(line_dict_id)
 
@@ -719,7 +758,7 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
                 lines.append(initial_balance_line)
 
                 # For the first expansion of the line, the initial balance line gives the progress
-                progress = init_load_more_progress(initial_balance_line)
+                progress = self._init_load_more_progress(options, initial_balance_line)
 
         # Get move lines
         limit_to_load = report.load_more_limit + 1 if report.load_more_limit and options['export_mode'] != 'print' else None
@@ -734,7 +773,7 @@ class GeneralLedgerCustomHandler(models.AbstractModel):
         for aml_result in aml_results.values():
             new_line = self._get_aml_line(report, line_dict_id, options, aml_result, next_progress)
             lines.append(new_line)
-            next_progress = init_load_more_progress(new_line)
+            next_progress = self._init_load_more_progress(options, new_line)
 
         return {
             'lines': lines,
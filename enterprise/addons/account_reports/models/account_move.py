@@ -11,6 +11,14 @@ from odoo.addons.web.controllers.utils import clean_action
 from dateutil.relativedelta import relativedelta
 from markupsafe import Markup
 
+# Fields of account.move that are either written on its lines or that they are computed from.
+BALANCE_SNAPSHOT_MOVE_FIELDS = {
+    'state', 'date', 'journal_id', 'company_id', 'currency_id', 'line_ids', 'invoice_line_ids',
+}
+# Fields of account.move whose changes invalidate the cached report totals (see account.report.data.version): the ones its lines
+# follow, and the ones report domains commonly filter journal items on through move_id.
+REPORT_DATA_MOVE_FIELDS = BALANCE_SNAPSHOT_MOVE_FIELDS | {'partner_id', 'fiscal_position_id', 'move_type'}
+
 
 class AccountMove(models.Model):
     _inherit = "account.move"
@@ -29,6 +37,25 @@ class AccountMove(models.Model):
 
         return super()._post(soft)
 
+    def write(self, vals):
+        # Posting or resetting an entry changes its lines through stored related fields, which don't go through their write()
+        if vals.keys() & REPORT_DATA_MOVE_FIELDS:
+            self.env['account.report.data.version']._bump(self.company_id.ids)
+        # Keep account.report.balance.snapshot in sync: posting, resetting to draft or cancelling an entry, as well as changing
+        # a posted entry in a way its lines follow (date, journal, ...), moves its lines in or out of the snapshot.
+        if (
+            self.env.context.get('account_report_skip_balance_snapshot')
+            or not (vals.keys() & BALANCE_SNAPSHOT_MOVE_FIELDS)
+            or not (vals.get('state') == 'posted' or any(move.state == 'posted' for move in self))
+        ):
+            return super().write(vals)
+
+        snapshot = self.env['account.report.balance.snapshot']
+        snapshot._apply_move_lines(self.line_ids, -1)
+        res = super(AccountMove, self.with_context(account_report_skip_balance_snapshot=True)).write(vals)
+        snapshot._apply_move_lines(self.line_ids, 1)
+        return res
+
     def action_post(self):
         # In the case of a TaxClosingNonPostedDependingMovesError, which can occur when dealing with branches or tax
         # units during the closing process, the parent company may have non-posted closing entries from other companies.
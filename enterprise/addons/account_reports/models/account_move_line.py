@@ -5,6 +5,8 @@ from odoo import api, models, fields, _
 
 from odoo.exceptions import UserError
 from odoo.tools import SQL
+from odoo.tools.sql import create_index
+from odoo.addons.account_reports.models.account_report_balance_snapshot import BALANCE_SNAPSHOT_AML_FIELDS
 
 class AccountMoveLine(models.Model):
     _name = "account.move.line"
@@ -12,11 +14,55 @@ class AccountMoveLine(models.Model):
 
     exclude_bank_lines = fields.Boolean(compute='_compute_exclude_bank_lines', store=True)
 
+    def init(self):
+        super().init()
+        # Open items of the aged partner balance: the lines not fully reconciled yet, by account, partner and due date.
+        # The reconciliation keeps them up to date, through the stored reconciled flag.
+        create_index(
+            self.env.cr,
+            'account_move_line_aged_open_items_idx',
+            self._table,
+            ['account_id', 'partner_id', 'date_maturity'],
+            where='reconciled IS NOT TRUE',
+        )
+        # Lines reconciled after the date of an aged partner balance are still open at that date.
+        create_index(self.env.cr, 'account_partial_reconcile_max_date_idx', 'account_partial_reconcile', ['max_date'])
+
     @api.depends('journal_id')
     def _compute_exclude_bank_lines(self):
         for move_line in self:
             move_line.exclude_bank_lines = move_line.account_id != move_line.journal_id.default_account_id
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env['account.report.data.version']._bump(lines.company_id.ids)
+        if not self.env.context.get('account_report_skip_balance_snapshot') and any(line.parent_state == 'posted' for line in lines):
+            self.env['account.report.balance.snapshot']._apply_move_lines(lines, 1)
+        return lines
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        # Changing a posted line moves its amounts between buckets of account.report.balance.snapshot
+        if (
+            self.env.context.get('account_report_skip_balance_snapshot')
+            or not (vals.keys() & set(BALANCE_SNAPSHOT_AML_FIELDS))
+            or not any(line.parent_state == 'posted' for line in self)
+        ):
+            return super().write(vals)
+
+        snapshot = self.env['account.report.balance.snapshot']
+        snapshot._apply_move_lines(self, -1)
+        res = super(AccountMoveLine, self.with_context(account_report_skip_balance_snapshot=True)).write(vals)
+        snapshot._apply_move_lines(self, 1)
+        return res
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        if not self.env.context.get('account_report_skip_balance_snapshot') and any(line.parent_state == 'posted' for line in self):
+            self.env['account.report.balance.snapshot']._apply_move_lines(self, -1)
+        return super().unlink()
+
     @api.constrains('tax_ids', 'tax_tag_ids')
     def _check_taxes_on_closing_entries(self):
         for aml in self:
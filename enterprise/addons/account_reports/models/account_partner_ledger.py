@@ -480,6 +480,29 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
             'progress': next_progress
         }
 
+    def _custom_xlsx_stream_expand_functions(self, report, options):
+        return {'_report_expand_unfoldable_line_partner_ledger': self._stream_unfoldable_line_partner_ledger}
+
+    def _stream_unfoldable_line_partner_ledger(self, report, options, line_dict):
+        """ Same lines as _report_expand_unfoldable_line_partner_ledger without load more, with the move lines fetched by batches. """
+        parsed_line_id = report._parse_line_id(line_dict['id'])
+        record_id = parsed_line_id[-1][2]
+        level_shift = 2 * sum(1 for markup, dummy1, dummy2 in parsed_line_id if isinstance(markup, dict) and 'groupby_prefix_group' in markup)
+
+        progress = {column_group_key: 0 for column_group_key in options['column_groups']}
+        if not options.get('hide_initial_balance'):
+            init_balance_by_col_group = self._get_initial_balance_values([record_id], options)[record_id]
+            initial_balance_line = report._get_partner_and_general_ledger_initial_balance_line(options, line_dict['id'], init_balance_by_col_group, level_shift=level_shift)
+            if initial_balance_line:
+                yield initial_balance_line
+                progress = self._init_load_more_progress(options, initial_balance_line)
+
+        for aml_result in report._stream_query_results(self._get_query_aml_values(options, [record_id])):
+            for dummy, partner_aml_result in self._dispatch_aml_result(aml_result, [record_id]):
+                new_line = self._get_report_line_move_line(options, partner_aml_result, line_dict['id'], progress, level_shift=level_shift)
+                progress = self._init_load_more_progress(options, new_line)
+                yield new_line
+
     def _init_load_more_progress(self, options, line_dict):
         return {
             column['column_group_key']: line_col.get('no_format', 0)
@@ -523,7 +546,33 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
 
     def _get_aml_values(self, options, partner_ids, offset=0, limit=None):
         rslt = {partner_id: [] for partner_id in partner_ids}
+        self._cr.execute(self._get_query_aml_values(options, partner_ids, offset=offset, limit=limit))
+        for aml_result in self._cr.dictfetchall():
+            for partner_id, partner_aml_result in self._dispatch_aml_result(aml_result, partner_ids):
+                rslt[partner_id].append(partner_aml_result)
+        return rslt
 
+    def _dispatch_aml_result(self, aml_result, partner_ids):
+        """ Yields (partner_id, aml_result) for each partner of partner_ids under which a result of _get_query_aml_values is shown. """
+        if aml_result['key'] == 'indirectly_linked_aml':
+
+            # Append the line to the partner found through the reconciliation.
+            if aml_result['partner_id'] in partner_ids:
+                yield aml_result['partner_id'], aml_result
+
+            # Balance it with an additional line in the Unknown Partner section but having reversed amounts.
+            if None in partner_ids:
+                yield None, {
+                    **aml_result,
+                    'debit': aml_result['credit'],
+                    'credit': aml_result['debit'],
+                    'amount': aml_result['credit'] - aml_result['debit'],
+                    'balance': -aml_result['balance'],
+                }
+        else:
+            yield aml_result['partner_id'], aml_result
+
+    def _get_query_aml_values(self, options, partner_ids, offset=0, limit=None) -> SQL:
         partner_ids_wo_none = [x for x in partner_ids if x]
         directly_linked_aml_partner_clauses = []
         indirectly_linked_aml_partner_clause = SQL('aml_with_partner.partner_id IS NOT NULL')
@@ -674,27 +723,7 @@ class PartnerLedgerCustomHandler(models.AbstractModel):
         if limit:
             query = SQL('%s LIMIT %s ', query, limit)
 
-        self._cr.execute(query)
-        for aml_result in self._cr.dictfetchall():
-            if aml_result['key'] == 'indirectly_linked_aml':
-
-                # Append the line to the partner found through the reconciliation.
-                if aml_result['partner_id'] in rslt:
-                    rslt[aml_result['partner_id']].append(aml_result)
-
-                # Balance it with an additional line in the Unknown Partner section but having reversed amounts.
-                if None in rslt:
-                    rslt[None].append({
-                        **aml_result,
-                        'debit': aml_result['credit'],
-                        'credit': aml_result['debit'],
-                        'amount': aml_result['credit'] - aml_result['debit'],
-                        'balance': -aml_result['balance'],
-                    })
-            else:
-                rslt[aml_result['partner_id']].append(aml_result)
-
-        return rslt
+        return query
 
     ####################################################
     # COLUMNS/LINES
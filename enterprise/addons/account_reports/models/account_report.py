@@ -3,15 +3,21 @@
 
 import ast
 import base64
+import contextvars
 import datetime
 import io
 import json
 import logging
 import re
+import threading
+import time
+import uuid
 from ast import literal_eval
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from functools import cmp_to_key
-from itertools import groupby
+from itertools import chain, groupby
 
 import markupsafe
 from dateutil.relativedelta import relativedelta
@@ -21,7 +27,7 @@ from odoo import models, fields, api, _, osv
 from odoo.addons.web.controllers.utils import clean_action
 from odoo.exceptions import RedirectWarning, UserError, ValidationError
 from odoo.service.model import get_public_method
-from odoo.tools import date_utils, get_lang, float_is_zero, float_repr, SQL, parse_version, Query
+from odoo.tools import date_utils, get_lang, float_is_zero, float_repr, SQL, parse_version, Query, str2bool
 from odoo.tools.float_utils import float_round, float_compare
 from odoo.tools.misc import file_path, format_date, formatLang, split_every, xlsxwriter
 from odoo.tools.safe_eval import expr_eval, safe_eval
@@ -42,12 +48,76 @@ ACCOUNT_CODES_ENGINE_TAG_ID_PREFIX_REGEX = re.compile(r"tag\(((?P<id>\d+)|(?P<re
 # Performance optimisation: those engines always will receive None as their next_groupby, allowing more efficient batching.
 NO_NEXT_GROUPBY_ENGINES = {'tax_tags', 'account_codes'}
 
+# Groupby values the account_codes engine can answer from account.report.balance.snapshot (its bucket dimensions).
+BALANCE_SNAPSHOT_GROUPBY = {'account_id', 'company_id', 'currency_id', 'journal_id'}
+
 NUMBER_FIGURE_TYPES = ('float', 'integer', 'monetary', 'percentage')
 
 LINE_ID_HIERARCHY_DELIMITER = '|'
 
 CURRENCIES_USING_LAKH = {'AFN', 'BDT', 'INR', 'MMK', 'NPR', 'PKR', 'LKR'}
 
+# Profiler of the report being rendered, when its 'profiling' option is enabled (see get_report_information)
+REPORT_PROFILER = contextvars.ContextVar('account_report_profiler', default=None)
+
+
+class AccountReportProfiler:
+    """ Records the wall time and the SQL queries of the steps of a report rendering (formula engines, column groups,
+    custom handler hooks, line expansions, ...), as a tree of steps nested like the calls. The steps with the same name and
+    details under the same parent step are merged, counting their calls.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self._current_steps = self.steps
+
+        # The SQL queries are counted by the cursors on the current thread, when it has these attributes (see sql_db)
+        thread = threading.current_thread()
+        thread.query_count = getattr(thread, 'query_count', 0)
+        thread.query_time = getattr(thread, 'query_time', 0.0)
+
+    @contextmanager
+    def step(self, name, **details):
+        parent_steps = self._current_steps
+        step = next((step for step in parent_steps if step['name'] == name and step['details'] == details), None)
+        if not step:
+            step = {'name': name, 'details': details, 'calls': 0, 'time': 0.0, 'query_count': 0, 'query_time': 0.0, 'steps': []}
+            parent_steps.append(step)
+        step['calls'] += 1
+        self._current_steps = step['steps']
+
+        thread = threading.current_thread()
+        start_time = time.perf_counter()
+        start_query_count = thread.query_count
+        start_query_time = thread.query_time
+        try:
+            yield step
+        finally:
+            step['time'] += time.perf_counter() - start_time
+            step['query_count'] += thread.query_count - start_query_count
+            step['query_time'] += thread.query_time - start_query_time
+            self._current_steps = parent_steps
+
+    def format(self):
+        """ Formats the tree of steps as text, one step per line, to log it. """
+        def format_steps(steps, indent):
+            for step in steps:
+                details = ", ".join(f"{key}={value}" for key, value in step['details'].items())
+                rows = f", {step['rows']} rows" if 'rows' in step else ""
+                yield (
+                    f"{'  ' * indent}{step['name']}{f' ({details})' if details else ''}: {step['time']:.3f}s, {step['calls']} call(s), "
+                    f"{step['query_count']} queries in {step['query_time']:.3f}s{rows}"
+                )
+                yield from format_steps(step['steps'], indent + 1)
+
+        return "\n".join(format_steps(self.steps, 0))
+
+
+def profile_report_step(name, **details):
+    """ Context manager recording a step of the report rendering in its profiler, if the report is being profiled. """
+    profiler = REPORT_PROFILER.get()
+    return profiler.step(name, **details) if profiler else nullcontext()
+
 
 class AccountReportAnnotation(models.Model):
     _name = 'account.report.annotation'
@@ -168,15 +238,17 @@ class AccountReport(models.Model):
             send_and_print_vals = report.send_and_print_values
             report_partner_ids = send_and_print_vals.get('report_options', {}).get('partner_ids', [])
             need_retrigger = processed_count + len(report_partner_ids) > job_count
-            for _id in report_partner_ids[:job_count - processed_count]:
+            # The statements of all the partners processed by this run are generated together
+            batch_partner_ids = report_partner_ids[:job_count - processed_count]
+            if batch_partner_ids:
                 options = {
                     **send_and_print_vals['report_options'],
-                    'partner_ids': [_id],
+                    'partner_ids': batch_partner_ids,
                 }
                 company = self.env['res.company'].browse(options['companies'][0]['id'])
                 self.env['account.report.send']._process_send_and_print(report=report.with_company(company), options=options)
-                processed_count += 1
-                report_partner_ids.remove(_id)
+                processed_count += len(batch_partner_ids)
+                report_partner_ids = report_partner_ids[len(batch_partner_ids):]
             if report_partner_ids:
                 send_and_print_vals['report_options']['partner_ids'] = report_partner_ids
                 report.send_and_print_values = send_and_print_vals
@@ -1399,9 +1471,15 @@ class AccountReport(models.Model):
         return SQL("(%(value)s) * COALESCE(account_currency_table.rate, 1)", value=value)
 
     @api.model
-    def _currency_table_aml_join(self, options, aml_alias=SQL('account_move_line')) -> SQL:
+    def _currency_table_aml_join(self, options, aml_alias=SQL('account_move_line'), period_key=None) -> SQL:
         """ Returns the JOIN condition to the currency table in a query needing to use it to convert aml balances from one currency to another.
+
+        :param period_key: The currency table period to use (an SQL expression can be given when it depends on each line) ; defaults to the
+                           one of the dates of the options.
         """
+        if period_key is None:
+            period_key = options['date']['currency_table_period_key']
+
         if options['currency_table']['type'] == 'cta':
             return SQL(
                 """
@@ -1425,7 +1503,7 @@ class AccountReport(models.Model):
                 income_prefix='income%',
                 expense_prefix='expense%',
                 currency_table=self._get_currency_table(options),
-                period_key=options['date']['currency_table_period_key'],
+                period_key=period_key,
             )
 
         return SQL(
@@ -1436,7 +1514,7 @@ class AccountReport(models.Model):
             """,
             aml_table=aml_alias,
             currency_table=self._get_currency_table(options),
-            period_key=options['date']['currency_table_period_key'],
+            period_key=period_key,
         )
 
     @api.model
@@ -1930,6 +2008,14 @@ class AccountReport(models.Model):
         options['loading_call_number'] = previous_options.get('loading_call_number') or 0
         return options
 
+    ####################################################
+    # OPTIONS: PROFILING
+    ####################################################
+    def _init_options_profiling(self, options, previous_options):
+        """ Opt-in profiling of the rendering (see get_report_information), only available in debug mode. """
+        if previous_options.get('profiling') and self.env.user.has_group('base.group_no_one'):
+            options['profiling'] = True
+
     ####################################################
     # OPTIONS: READONLY QUERY
     ####################################################
@@ -2113,97 +2199,74 @@ class AccountReport(models.Model):
         query = self.env['account.move.line']._where_calc(domain)
 
         if options.get('compute_budget'):
-            self._create_report_budget_temp_table(options)
-            query._tables['account_move_line'] = SQL.identifier('account_report_budget_temp_aml')
-            query.add_where(SQL(
-                "%s AND budget_id = %s",
-                query.where_clause,
-                options['compute_budget'],
-            ))
+            query._tables['account_move_line'] = self._get_report_budget_aml_table(options)
 
         # Wrap the query with 'company_id IN (...)' to avoid bypassing company access rights.
         self.env['account.move.line']._apply_ir_rules(query)
 
         return query
 
-    def _create_report_budget_temp_table(self, options):
-        self._cr.execute("SELECT 1 FROM information_schema.tables WHERE table_name='account_report_budget_temp_aml'")
-        if self._cr.fetchone():
-            return
-
-        stored_aml_fields, fields_to_insert = self.env['account.move.line']._prepare_aml_shadowing_for_report({
-            'id': SQL.identifier("id"),
-            'balance': SQL.identifier('amount'),
-            'company_id': self.env.company.id,
-            'parent_state': 'posted',
-            'date': SQL.identifier('date'),
-            'account_id': SQL.identifier("account_id"),
-            'debit': SQL("CASE WHEN (amount > 0) THEN amount else 0 END"),
-            'credit': SQL("CASE WHEN (amount < 0) THEN -amount else 0 END"),
-        })
+    def _get_report_budget_aml_table(self, options):
+        """ Get a subquery shadowing the account_move_line table with the items of the budget to compute (options['compute_budget']),
+        so that the report engines can be evaluated on them like on journal items.
 
-        self._cr.execute(SQL(
+        The budget items already hold the budget amounts per account and month, and are kept up to date when the budget is edited:
+        they are read directly, without copying them to a temporary table for each report rendering.
+        """
+        self.env['account.report.budget.item'].flush_model(['budget_id', 'account_id', 'amount', 'date'])
+        budget_items_query = SQL(
             """
-                -- Create a temporary table, dropping not null constraints because we're not filling those columns
-                CREATE TEMPORARY TABLE IF NOT EXISTS account_report_budget_temp_aml () inherits (account_move_line) ON COMMIT DROP;
-                ALTER TABLE account_report_budget_temp_aml NO INHERIT account_move_line;
-                ALTER TABLE account_report_budget_temp_aml ALTER COLUMN move_id DROP NOT NULL;
-                ALTER TABLE account_report_budget_temp_aml ALTER COLUMN currency_id DROP NOT NULL;
-                ALTER TABLE account_report_budget_temp_aml ALTER COLUMN journal_id DROP NOT NULL;
-                ALTER TABLE account_report_budget_temp_aml ALTER COLUMN display_type DROP NOT NULL;
-                ALTER TABLE account_report_budget_temp_aml ADD budget_id INTEGER NOT NULL;
-
-                INSERT INTO account_report_budget_temp_aml (%(stored_aml_fields)s, budget_id)
-                SELECT %(fields_to_insert)s, budget_id
-                FROM account_report_budget_item
-                WHERE budget_id IN %(available_budget_ids)s;
-
-                -- Create a supporting index to avoid seq.scans
-                CREATE INDEX IF NOT EXISTS account_report_budget_temp_aml__composite_idx ON account_report_budget_temp_aml (account_id, journal_id, date, company_id);
-                -- Update statistics for correct planning
-                ANALYZE account_report_budget_temp_aml
+                SELECT id, amount, date, account_id
+                  FROM account_report_budget_item
+                 WHERE budget_id = %s
             """,
-            stored_aml_fields=stored_aml_fields,
-            fields_to_insert=fields_to_insert,
-            available_budget_ids=tuple(budget_option['id'] for budget_option in options['budgets']),
-        ))
+            options['compute_budget'],
+        )
 
         if options.get('show_all_accounts'):
-            stored_aml_fields, fields_to_insert = self.env['account.move.line']._prepare_aml_shadowing_for_report({
-                # Using nextval will consume a sequence number, we decide to do it to avoid comparing apples and oranges
-                'id': SQL("(SELECT nextval('account_report_budget_item_id_seq'))"),
-                'balance': SQL("0"),
-                'company_id': self.env.company.id,
-                'parent_state': 'posted',
-                'date': SQL("%s", options['date']['date_from']),
-                'account_id': SQL.identifier("accounts", "id"),
-                'debit': SQL("0"),
-                'credit': SQL("0"),
-            })
+            # Also give a line with a zero amount to all the income and expense accounts, so that they are all displayed.
+            # Their ids can't collide with the ones of the budget items.
             accounts_subquery = self.env['account.account']._where_calc([
                 ('company_ids', 'in', self.get_report_company_ids(options)),
                 ('internal_group', 'in', ['income', 'expense']),
             ])
-            self._cr.execute(SQL(
+            budget_items_query = SQL(
                 """
-                -- Insert dynamic combinations of account_id and budget_id into the temporary table
-                INSERT INTO account_report_budget_temp_aml (%(stored_aml_fields)s, budget_id)
-                     SELECT %(fields_to_insert)s, budgets.id AS budget_id
-                       FROM (%(accounts_subquery)s) AS accounts
-                 CROSS JOIN (
-                                SELECT id
-                                  FROM account_report_budget
-                                 WHERE id IN %(available_budget_ids)s
-                            ) AS budgets
+                    %(budget_items_query)s
+                    UNION ALL
+                    SELECT -accounts.id, 0, %(date_from)s::date, accounts.id
+                      FROM (%(accounts_subquery)s) AS accounts
                 """,
-                stored_aml_fields=stored_aml_fields,
-                fields_to_insert=fields_to_insert,
+                budget_items_query=budget_items_query,
+                date_from=options['date']['date_from'],
                 accounts_subquery=accounts_subquery.select(),
-                available_budget_ids=tuple(budget_option['id'] for budget_option in options['budgets']),
-                income='income%',
-                expense='expense%',
-                company_ids=tuple(),
-            ))
+            )
+
+        stored_aml_fields, fields_to_select = self.env['account.move.line']._prepare_aml_shadowing_for_report({
+            'id': SQL.identifier('budget_item', 'id'),
+            'balance': SQL.identifier('budget_item', 'amount'),
+            'company_id': self.env.company.id,
+            'parent_state': 'posted',
+            'date': SQL.identifier('budget_item', 'date'),
+            'account_id': SQL.identifier('budget_item', 'account_id'),
+            'debit': SQL("CASE WHEN (budget_item.amount > 0) THEN budget_item.amount else 0 END"),
+            'credit': SQL("CASE WHEN (budget_item.amount < 0) THEN -budget_item.amount else 0 END"),
+        })
+
+        return SQL(
+            """
+                (
+                    SELECT *
+                      FROM (
+                          SELECT %(fields_to_select)s
+                            FROM (%(budget_items_query)s) AS budget_item(id, amount, date, account_id)
+                      ) AS budget_aml(%(stored_aml_fields)s)
+                )
+            """,
+            fields_to_select=fields_to_select,
+            budget_items_query=budget_items_query,
+            stored_aml_fields=stored_aml_fields,
+        )
 
     ####################################################
     # LINE IDS MANAGEMENT HELPERS
@@ -2660,12 +2723,14 @@ class AccountReport(models.Model):
         lines = self._fully_unfold_lines_if_needed(lines, options)
 
         if self.custom_handler_model_id:
-            lines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, lines)
+            with profile_report_step('_custom_line_postprocessor'):
+                lines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, lines)
 
         if warnings is not None:
             custom_handler_name = self.custom_handler_model_name or self.root_report_id.custom_handler_model_name
             if custom_handler_name:
-                self.env[custom_handler_name]._customize_warnings(self, options, all_column_groups_expression_totals, warnings)
+                with profile_report_step('_customize_warnings'):
+                    self.env[custom_handler_name]._customize_warnings(self, options, all_column_groups_expression_totals, warnings)
 
         # Format values in columns of lines that will be displayed
         self._format_column_values(options, lines)
@@ -2771,7 +2836,8 @@ class AccountReport(models.Model):
                 if line_need_expansion(line_dict):
                     lines_to_expand_by_function.setdefault(line_dict['expand_function'], []).append(line_dict)
 
-            custom_unfold_all_batch_data = self.env[self.custom_handler_model_name]._custom_unfold_all_batch_data_generator(self, options, lines_to_expand_by_function)
+            with profile_report_step('_custom_unfold_all_batch_data_generator'):
+                custom_unfold_all_batch_data = self.env[self.custom_handler_model_name]._custom_unfold_all_batch_data_generator(self, options, lines_to_expand_by_function)
 
         i = 0
         while i < len(lines):
@@ -3021,7 +3087,8 @@ class AccountReport(models.Model):
 
     def _get_dynamic_lines(self, options, all_column_groups_expression_totals, warnings=None):
         if self.custom_handler_model_id:
-            rslt = self.env[self.custom_handler_model_name]._dynamic_lines_generator(self, options, all_column_groups_expression_totals, warnings=warnings)
+            with profile_report_step('_dynamic_lines_generator'):
+                rslt = self.env[self.custom_handler_model_name]._dynamic_lines_generator(self, options, all_column_groups_expression_totals, warnings=warnings)
             self._apply_integer_rounding_to_dynamic_lines(options, (line for _sequence, line in rslt))
             return rslt
         return []
@@ -3108,6 +3175,19 @@ class AccountReport(models.Model):
         if groupby_to_expand and any(not expression.report_line_id._get_groupby(options) for expression in expressions):
             raise UserError(_("Trying to expand groupby results on lines without a groupby value."))
 
+        # Reuse the totals computed by a previous call with the same options, as long as the report data didn't change in-between
+        cache_key = None
+        if not forced_all_column_groups_expression_totals and not col_groups_restrict:
+            cache_key = self._get_expression_totals_cache_key(expressions, options, groupby_to_expand, offset, limit, include_default_vals)
+        if cache_key:
+            with profile_report_step('_get_cached_expression_totals'):
+                cached_totals = self._get_cached_expression_totals(cache_key, warnings=warnings)
+            if cached_totals is not None:
+                return cached_totals
+            computation_warnings = {}
+        else:
+            computation_warnings = warnings
+
         # Group formulas for batching (when possible)
         grouped_formulas = {}
         if expressions and not include_default_vals:
@@ -3122,30 +3202,86 @@ class AccountReport(models.Model):
                 forced_date_scope = self._standardize_date_scope_for_date_range(expression.date_scope)
                 add_expressions_to_groups(expanded_cross, grouped_formulas, force_date_scope=forced_date_scope)
 
+        options_per_group = self._split_options_per_column_group(options)
+
+        # When the column groups only differ by their dates (comparison periods), evaluate the account_codes batches of all of them at once
+        precomputed_formula_results_per_group = {}
+        options_per_group_to_compute = {
+            group_key: group_options
+            for group_key, group_options in options_per_group.items()
+            if not col_groups_restrict or group_key in col_groups_restrict
+        }
+        if self._can_compute_column_groups_in_single_pass(options_per_group_to_compute, offset=offset, limit=limit):
+            for (date_scope, current_groupby, next_groupby), formulas_dict in grouped_formulas.get('account_codes', {}).items():
+                # The single pass reads all the journal items of the periods: leave the batches that can read their closed months from
+                # the balance snapshot to the column groups, which only aggregate the journal items of the months still open.
+                if self._uses_balance_snapshot_for_column_groups(options_per_group_to_compute, date_scope, current_groupby):
+                    continue
+                with profile_report_step('_compute_formula_batch_with_engine_account_codes_for_column_groups', date_scope=date_scope, groupby=current_groupby):
+                    formula_results_per_group = self._compute_formula_batch_with_engine_account_codes_for_column_groups(
+                        options_per_group_to_compute, date_scope, formulas_dict, current_groupby, next_groupby,
+                    )
+                for group_key, formula_results in formula_results_per_group.items():
+                    precomputed_formula_results_per_group.setdefault(group_key, {})[('account_codes', date_scope, current_groupby, next_groupby)] = formula_results
+
         # Treat each formula batch for each column group
         all_column_groups_expression_totals = {}
-        for group_key, group_options in self._split_options_per_column_group(options).items():
+        for group_key, group_options in options_per_group.items():
             if forced_all_column_groups_expression_totals:
                 forced_column_group_totals = forced_all_column_groups_expression_totals.get(group_key, None)
             else:
                 forced_column_group_totals = None
 
             if not col_groups_restrict or group_key in col_groups_restrict:
-                current_group_expression_totals = self._compute_expression_totals_for_single_column_group(
-                    group_options,
-                    grouped_formulas,
-                    forced_column_group_expression_totals=forced_column_group_totals,
-                    offset=offset,
-                    limit=limit,
-                    warnings=warnings,
-                )
+                with profile_report_step('_compute_expression_totals_for_single_column_group', column_group=group_key):
+                    current_group_expression_totals = self._compute_expression_totals_for_single_column_group(
+                        group_options,
+                        grouped_formulas,
+                        forced_column_group_expression_totals=forced_column_group_totals,
+                        offset=offset,
+                        limit=limit,
+                        warnings=computation_warnings,
+                        precomputed_formula_results=precomputed_formula_results_per_group.get(group_key),
+                    )
             else:
                 current_group_expression_totals = forced_column_group_totals
 
             all_column_groups_expression_totals[group_key] = current_group_expression_totals
 
+        if cache_key:
+            self._set_cached_expression_totals(cache_key, all_column_groups_expression_totals, warnings=computation_warnings)
+            if warnings is not None:
+                warnings.update(computation_warnings)
+
         return all_column_groups_expression_totals
 
+    def _can_compute_column_groups_in_single_pass(self, options_per_group, offset=0, limit=None):
+        """ Whether the batches of the given column groups can be evaluated together, with one query joining a table of their periods
+        (see _compute_formula_batch_with_engine_account_codes_for_column_groups), instead of one query per column group.
+        This is the case when the column groups only differ by their dates, like the periods of a comparison.
+        """
+        if len(options_per_group) < 2 or offset or limit is not None:
+            return False
+
+        if not str2bool(self.env['ir.config_parameter'].sudo().get_param('account_reports.single_pass_column_groups', 'True')):
+            return False
+
+        ignored_keys = {'date', 'owner_column_group'}
+        options_without_dates = [
+            {key: value for key, value in group_options.items() if key not in ignored_keys}
+            for group_options in options_per_group.values()
+        ]
+        return all(group_options == options_without_dates[0] for group_options in options_without_dates[1:])
+
+    def _uses_balance_snapshot_for_column_groups(self, options_per_group, date_scope, current_groupby):
+        """ Whether the account_codes batch of any of the given column groups would read part of its period from the balance snapshot
+        (see _get_balance_snapshot_window) when evaluated on its own.
+        """
+        return any(
+            self._get_balance_snapshot_window(group_options, date_scope, self._get_report_query(group_options, date_scope), current_groupby)
+            for group_options in options_per_group.values()
+        )
+
     def _standardize_date_scope_for_date_range(self, date_scope):
         """ Depending on the fact the report accepts date ranges or not, different date scopes might mean the same thing.
         This function is used so that, in those cases, only one of these date_scopes' values is used, to avoid useless creation
@@ -3182,7 +3318,7 @@ class AccountReport(models.Model):
             'owner_column_group': group_key,
         }
 
-    def _compute_expression_totals_for_single_column_group(self, column_group_options, grouped_formulas, forced_column_group_expression_totals=None, offset=0, limit=None, warnings=None):
+    def _compute_expression_totals_for_single_column_group(self, column_group_options, grouped_formulas, forced_column_group_expression_totals=None, offset=0, limit=None, warnings=None, precomputed_formula_results=None):
         """ Evaluates expressions for a single column group.
 
             :param column_group_options: The options dict obtained from _split_options_per_column_group() for the column group to evaluate.
@@ -3203,6 +3339,10 @@ class AccountReport(models.Model):
             :param limit: The SQL limit to apply when computing these expressions' result. Used if self.load_more_limit is set, to handle
                           the load more feature.
 
+            :param precomputed_formula_results: The results of the batches already evaluated for this column group, together with other ones,
+                                                as a dict((engine, date_scope, current_groupby, next_groupby), formula_results) ; formula_results
+                                                being in the same format as _compute_formula_batch's result.
+
             :return: A dict(expression, {'value': value, 'has_sublines': has_sublines}), where:
                      - expression is one of the account.report.expressions that got evaluated
 
@@ -3298,8 +3438,12 @@ class AccountReport(models.Model):
         ]
         for engine in batchable_engines:
             for (date_scope, current_groupby, next_groupby), formulas_dict in grouped_formulas.get(engine, {}).items():
-                formula_results = self._compute_formula_batch(column_group_options, engine, date_scope, formulas_dict, current_groupby, next_groupby,
-                                                              offset=offset, limit=limit, warnings=warnings)
+                batch_key = (engine, date_scope, current_groupby, next_groupby)
+                if precomputed_formula_results and batch_key in precomputed_formula_results:
+                    formula_results = precomputed_formula_results[batch_key]
+                else:
+                    formula_results = self._compute_formula_batch(column_group_options, engine, date_scope, formulas_dict, current_groupby, next_groupby,
+                                                                  offset=offset, limit=limit, warnings=warnings)
                 inject_formula_results(
                     formula_results,
                     column_group_expression_totals,
@@ -3648,10 +3792,17 @@ class AccountReport(models.Model):
             (e.g. 'sum', 'sum_if_pos', ...)
         """
         engine_function_name = f'_compute_formula_batch_with_engine_{formula_engine}'
-        return getattr(self, engine_function_name)(
-            column_group_options, date_scope, formulas_dict, current_groupby, next_groupby,
-            offset=offset, limit=limit, warnings=warnings,
-        )
+        with profile_report_step(engine_function_name, date_scope=date_scope, groupby=current_groupby) as profiling_step:
+            formula_results = getattr(self, engine_function_name)(
+                column_group_options, date_scope, formulas_dict, current_groupby, next_groupby,
+                offset=offset, limit=limit, warnings=warnings,
+            )
+            if profiling_step is not None:
+                profiling_step['rows'] = profiling_step.get('rows', 0) + sum(
+                    len(results) if isinstance(results, list) else 1
+                    for results in formula_results.values()
+                )
+        return formula_results
 
     def _compute_formula_batch_with_engine_tax_tags(self, options, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None, warnings=None):
         """ Report engine.
@@ -3883,7 +4034,96 @@ class AccountReport(models.Model):
         Example 2: '123D\C' will return the balance of accounts starting with '123D' if it's negative, 0 otherwise.
         """
         self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
+        prefix_details_by_formula, accounts_prefix_map = self._get_account_codes_engine_prefixes(options, formulas_dict)
+
+        # Run main query
+        query = self._get_report_query(options, date_scope)
 
+        # Whole closed months of the period are read from the balance snapshot; journal items are only aggregated for the rest.
+        snapshot_window = self._get_balance_snapshot_window(options, date_scope, query, current_groupby, offset, limit)
+        if snapshot_window:
+            query.add_where(self._get_balance_snapshot_aml_exclusion(snapshot_window))
+
+        current_groupby_aml_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
+        tail_query = self._get_engine_query_tail(offset, limit)
+        if current_groupby_aml_sql and tail_query:
+            tail_query_additional_groupby_where_sql = SQL(
+                """
+                AND %(current_groupby_aml_sql)s IN (
+                    SELECT DISTINCT %(current_groupby_aml_sql)s
+                    FROM account_move_line
+                    WHERE %(search_condition)s
+                    ORDER BY %(current_groupby_aml_sql)s
+                    %(tail_query)s
+                )
+                """,
+                current_groupby_aml_sql=current_groupby_aml_sql,
+                search_condition=query.where_clause,
+                tail_query=tail_query,
+            )
+        else:
+            tail_query_additional_groupby_where_sql = SQL()
+
+        extra_groupby_sql =  SQL(", %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
+        extra_select_sql = SQL(", %s AS grouping_key", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
+
+        query = SQL(
+            """
+            SELECT
+                account_move_line.account_id AS account_id,
+                SUM(%(balance_select)s) AS sum,
+                COUNT(account_move_line.id) AS aml_count
+                %(extra_select_sql)s
+            FROM %(table_references)s
+            %(currency_table_join)s
+            WHERE %(search_condition)s
+            %(tail_query_additional_groupby_where_sql)s
+            GROUP BY account_move_line.account_id%(extra_groupby_sql)s
+            %(order_by_sql)s
+            %(tail_query)s
+            """,
+            extra_select_sql=extra_select_sql,
+            table_references=query.from_clause,
+            balance_select=self._currency_table_apply_rate(SQL("account_move_line.balance")),
+            currency_table_join=self._currency_table_aml_join(options),
+            search_condition=query.where_clause,
+            extra_groupby_sql=extra_groupby_sql,
+            tail_query_additional_groupby_where_sql=tail_query_additional_groupby_where_sql,
+            order_by_sql=SQL('ORDER BY %s', current_groupby_aml_sql) if current_groupby_aml_sql and not snapshot_window else SQL(),
+            tail_query=tail_query if not tail_query_additional_groupby_where_sql else SQL(),
+        )
+        if snapshot_window:
+            query = SQL(
+                """
+                SELECT
+                    balances.account_id,
+                    SUM(balances.sum) AS sum,
+                    SUM(balances.aml_count) AS aml_count
+                    %(extra_select_sql)s
+                FROM (
+                    %(aml_query)s
+                    UNION ALL
+                    %(snapshot_query)s
+                ) balances
+                GROUP BY balances.account_id%(extra_groupby_sql)s
+                %(order_by_sql)s
+                """,
+                extra_select_sql=SQL(", balances.grouping_key") if current_groupby else SQL(),
+                aml_query=query,
+                snapshot_query=self._get_balance_snapshot_query(options, snapshot_window, current_groupby),
+                extra_groupby_sql=SQL(", balances.grouping_key") if current_groupby else SQL(),
+                order_by_sql=SQL("ORDER BY balances.grouping_key") if current_groupby else SQL(),
+            )
+        self._cr.execute(query)
+        return self._get_account_codes_engine_formula_results(formulas_dict, current_groupby, prefix_details_by_formula, accounts_prefix_map, self._cr.dictfetchall())
+
+    def _get_account_codes_engine_prefixes(self, options, formulas_dict):
+        """ Parses the formulas of a batch of the account_codes engine, and matches the accounts of the report's companies with their prefixes.
+
+        :return: (prefix_details_by_formula, accounts_prefix_map), where:
+                 - prefix_details_by_formula is in the form {formula: [(multiplicator, prefix_key, balance_character)]}
+                 - accounts_prefix_map is in the form {account_id: [prefix_key]}
+        """
         # Gather the account code prefixes to compute the total from
         prefix_details_by_formula = {}  # in the form {formula: [(1, prefix1), (-1, prefix2)]}
         prefixes_to_compute = set()
@@ -3952,64 +4192,17 @@ class AccountReport(models.Model):
         for prefix, account_id in self.env.execute_query(SQL(' UNION ALL ').join(all_prefixes_queries)):
             accounts_prefix_map[account_id].append(tuple(prefix))
 
-        # Run main query
-        query = self._get_report_query(options, date_scope)
-
-        current_groupby_aml_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
-        tail_query = self._get_engine_query_tail(offset, limit)
-        if current_groupby_aml_sql and tail_query:
-            tail_query_additional_groupby_where_sql = SQL(
-                """
-                AND %(current_groupby_aml_sql)s IN (
-                    SELECT DISTINCT %(current_groupby_aml_sql)s
-                    FROM account_move_line
-                    WHERE %(search_condition)s
-                    ORDER BY %(current_groupby_aml_sql)s
-                    %(tail_query)s
-                )
-                """,
-                current_groupby_aml_sql=current_groupby_aml_sql,
-                search_condition=query.where_clause,
-                tail_query=tail_query,
-            )
-        else:
-            tail_query_additional_groupby_where_sql = SQL()
-
-        extra_groupby_sql =  SQL(", %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
-        extra_select_sql = SQL(", %s AS grouping_key", current_groupby_aml_sql) if current_groupby_aml_sql else SQL()
-
-        query = SQL(
-            """
-            SELECT
-                account_move_line.account_id AS account_id,
-                SUM(%(balance_select)s) AS sum,
-                COUNT(account_move_line.id) AS aml_count
-                %(extra_select_sql)s
-            FROM %(table_references)s
-            %(currency_table_join)s
-            WHERE %(search_condition)s
-            %(tail_query_additional_groupby_where_sql)s
-            GROUP BY account_move_line.account_id%(extra_groupby_sql)s
-            %(order_by_sql)s
-            %(tail_query)s
-            """,
-            extra_select_sql=extra_select_sql,
-            table_references=query.from_clause,
-            balance_select=self._currency_table_apply_rate(SQL("account_move_line.balance")),
-            currency_table_join=self._currency_table_aml_join(options),
-            search_condition=query.where_clause,
-            extra_groupby_sql=extra_groupby_sql,
-            tail_query_additional_groupby_where_sql=tail_query_additional_groupby_where_sql,
-            order_by_sql=SQL('ORDER BY %s', current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
-            tail_query=tail_query if not tail_query_additional_groupby_where_sql else SQL(),
-        )
-        self._cr.execute(query)
+        return prefix_details_by_formula, accounts_prefix_map
 
+    def _get_account_codes_engine_formula_results(self, formulas_dict, current_groupby, prefix_details_by_formula, accounts_prefix_map, query_results):
+        """ Builds the result of a batch of the account_codes engine (in the format of _compute_formula_batch's result) from the rows of its
+        query, each giving the sum and the number of journal items of an account (and grouping key, if current_groupby is set).
+        """
         # Parse result
         rslt = {}
 
         res_by_prefix_account_id = {}
-        for query_res in self._cr.dictfetchall():
+        for query_res in query_results:
             # Done this way so that we can run similar code for groupby and non-groupby
             grouping_key = query_res['grouping_key'] if current_groupby else None
             account_id = query_res['account_id']
@@ -4053,6 +4246,80 @@ class AccountReport(models.Model):
 
         return rslt
 
+    def _compute_formula_batch_with_engine_account_codes_for_column_groups(self, options_per_group, date_scope, formulas_dict, current_groupby, next_groupby):
+        """ Evaluates a batch of account_codes formulas for several column groups at once, with a single query.
+
+        The column groups must only differ by their dates (see _can_compute_column_groups_in_single_pass). The report query is built without
+        any date condition, and joined with a table of the date bounds of each column group, the same way the aged partner balance handles
+        its periods ; the rows of each column group are then parsed as in _compute_formula_batch_with_engine_account_codes.
+
+        :param options_per_group: The options of the column groups to evaluate, as obtained from _split_options_per_column_group.
+
+        :return: A dict(column_group_key, formula_results), where formula_results is in the same format as _compute_formula_batch's result.
+        """
+        self._check_groupby_fields((next_groupby.split(',') if next_groupby else []) + ([current_groupby] if current_groupby else []))
+        options = next(iter(options_per_group.values()))
+        prefix_details_by_formula, accounts_prefix_map = self._get_account_codes_engine_prefixes(options, formulas_dict)
+
+        # Build period table
+        periods = []
+        for group_key, group_options in options_per_group.items():
+            date_from, date_to = self._get_date_bounds_info(group_options, date_scope)
+            periods.append((
+                group_key,
+                fields.Date.to_date(date_from) if date_from else None,
+                fields.Date.to_date(date_to),
+                group_options['date']['currency_table_period_key'],
+            ))
+        period_table_format = ('(VALUES %s)' % ','.join("(%s, %s::date, %s::date, %s)" for period in periods))
+        period_table = SQL(period_table_format, *chain.from_iterable(periods))
+
+        # Build query, only reading the journal items of the union of the periods
+        query = self._get_report_query(options, None)
+        query.add_where(SQL("account_move_line.date <= %s", max(period[2] for period in periods)))
+        if all(period[1] for period in periods):
+            query.add_where(SQL("account_move_line.date >= %s", min(period[1] for period in periods)))
+
+        current_groupby_aml_sql = self.env['account.move.line']._field_to_sql('account_move_line', current_groupby, query) if current_groupby else None
+        query = SQL(
+            """
+            WITH period_table(column_group_key, date_from, date_to, currency_table_period_key) AS (%(period_table)s)
+
+            SELECT
+                period_table.column_group_key,
+                account_move_line.account_id AS account_id,
+                SUM(%(balance_select)s) AS sum,
+                COUNT(account_move_line.id) AS aml_count
+                %(extra_select_sql)s
+            FROM %(table_references)s
+            JOIN period_table ON
+                (period_table.date_from IS NULL OR account_move_line.date >= period_table.date_from)
+                AND account_move_line.date <= period_table.date_to
+            %(currency_table_join)s
+            WHERE %(search_condition)s
+            GROUP BY period_table.column_group_key, account_move_line.account_id%(extra_groupby_sql)s
+            %(order_by_sql)s
+            """,
+            period_table=period_table,
+            balance_select=self._currency_table_apply_rate(SQL("account_move_line.balance")),
+            extra_select_sql=SQL(", %s AS grouping_key", current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+            table_references=query.from_clause,
+            currency_table_join=self._currency_table_aml_join(options, period_key=SQL("period_table.currency_table_period_key")),
+            search_condition=query.where_clause,
+            extra_groupby_sql=SQL(", %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+            order_by_sql=SQL("ORDER BY %s", current_groupby_aml_sql) if current_groupby_aml_sql else SQL(),
+        )
+
+        self._cr.execute(query)
+        query_results_per_group = {group_key: [] for group_key in options_per_group}
+        for query_res in self._cr.dictfetchall():
+            query_results_per_group[query_res['column_group_key']].append(query_res)
+
+        return {
+            group_key: self._get_account_codes_engine_formula_results(formulas_dict, current_groupby, prefix_details_by_formula, accounts_prefix_map, query_results)
+            for group_key, query_results in query_results_per_group.items()
+        }
+
     def _compute_formula_batch_with_engine_external(self, options, date_scope, formulas_dict, current_groupby, next_groupby, offset=0, limit=None, warnings=None):
         """ Report engine.
 
@@ -4196,6 +4463,119 @@ class AccountReport(models.Model):
 
         return query_tail
 
+    def _get_balance_snapshot_window(self, options, date_scope, query, current_groupby=None, offset=0, limit=None):
+        """ Tells whether an engine query on journal items can read part of its period from account.report.balance.snapshot.
+
+        This is only the case when everything the query filters on is a dimension of the snapshot (company, journal, posted
+        state and dates), with a currency conversion rate that doesn't depend on the date of each line. Any other option
+        (analytic, unreconciled, fiscal position, custom filters, budgets, horizontal groups, ...) falls back on the journal items.
+
+        :return: None if the snapshot can't be used, else a dict with:
+                 - date_from / date_to: the [date_from, date_to[ range of whole months read from the snapshot (date_from is None
+                   when the period has no start); it never includes the current month, which is always aggregated from journal items.
+                 - company_ids, journal_ids: the ids to filter the snapshot on (None for no filter).
+        """
+        if (
+            offset
+            or limit
+            or (current_groupby and current_groupby not in BALANCE_SNAPSHOT_GROUPBY)
+            or options['currency_table']['type'] == 'cta'
+            or any(options.get(key) for key in ('compute_budget', 'analytic_accounts', 'analytic_groupby_option', 'report_cash_basis'))
+            # Shadowed table (analytic, budget, cash basis) or extra joins from access rules
+            or query._tables != {'account_move_line': SQL.identifier('account_move_line')}
+            or query._joins
+            or not self.env['account.report.balance.snapshot']._is_enabled()
+        ):
+            return None
+
+        # The access rules on journal items must only restrict companies, which the snapshot is filtered on as well.
+        for leaf in self.env['ir.rule']._compute_domain('account.move.line', 'read'):
+            if not isinstance(leaf, str) and leaf[0] != 'company_id':
+                return None
+
+        filters = {'company_id': None, 'journal_id': None}
+        date_bounds = {}
+        for leaf in self._get_options_domain(options, date_scope):
+            if isinstance(leaf, str):
+                return None  # Not a plain conjunction of conditions
+            field_name, operator, value = leaf
+            if field_name in filters and filters[field_name] is None and operator == 'in' \
+                    and all(isinstance(record_id, int) for record_id in value):
+                filters[field_name] = list(value)
+            elif field_name == 'date' and operator in ('<=', '>=') and operator not in date_bounds:
+                date_bounds[operator] = fields.Date.to_date(value)
+            elif (field_name, operator, value) == ('parent_state', '=', 'posted') \
+                    or (field_name == 'display_type' and operator == 'not in' and set(value) == {'line_section', 'line_note'}):
+                continue
+            else:
+                return None
+
+        date_from, date_to = date_bounds.get('>='), date_bounds.get('<=')
+        if not date_to:
+            return None
+        day_after = date_to + relativedelta(days=1)
+        snapshot_to = min(
+            day_after if day_after.day == 1 else date_utils.start_of(date_to, 'month'),
+            date_utils.start_of(fields.Date.context_today(self), 'month'),
+        )
+        snapshot_from = None
+        if date_from:
+            snapshot_from = date_from if date_from.day == 1 else date_utils.start_of(date_from, 'month') + relativedelta(months=1)
+            if snapshot_from >= snapshot_to:
+                return None
+
+        return {
+            'date_from': snapshot_from,
+            'date_to': snapshot_to,
+            'company_ids': filters['company_id'],
+            'journal_ids': filters['journal_id'],
+        }
+
+    def _get_balance_snapshot_aml_exclusion(self, snapshot_window) -> SQL:
+        """ Condition to add to the journal items query so that it skips the months read from the snapshot. """
+        if snapshot_window['date_from']:
+            return SQL(
+                "NOT (account_move_line.date >= %s AND account_move_line.date < %s)",
+                snapshot_window['date_from'],
+                snapshot_window['date_to'],
+            )
+        return SQL("account_move_line.date >= %s", snapshot_window['date_to'])
+
+    def _get_balance_snapshot_query(self, options, snapshot_window, current_groupby) -> SQL:
+        """ Query returning the same columns as the account_codes engine's journal items query (account_id, sum, aml_count and
+        grouping_key if grouped by current_groupby), computed from the snapshot for the months of snapshot_window.
+        """
+        conditions = [SQL("account_report_balance_snapshot.month < %s", snapshot_window['date_to'])]
+        if snapshot_window['date_from']:
+            conditions.append(SQL("account_report_balance_snapshot.month >= %s", snapshot_window['date_from']))
+        for field_name, ids_key in (('company_id', 'company_ids'), ('journal_id', 'journal_ids')):
+            if snapshot_window[ids_key] is not None:
+                conditions.append(SQL(
+                    "%s = ANY(%s)",
+                    SQL.identifier('account_report_balance_snapshot', field_name),
+                    snapshot_window[ids_key],
+                ))
+
+        groupby_sql = SQL.identifier('account_report_balance_snapshot', current_groupby) if current_groupby else None
+        return SQL(
+            """
+            SELECT
+                account_report_balance_snapshot.account_id AS account_id,
+                SUM(%(balance_select)s) AS sum,
+                SUM(account_report_balance_snapshot.line_count) AS aml_count
+                %(extra_select_sql)s
+            FROM account_report_balance_snapshot
+            %(currency_table_join)s
+            WHERE %(conditions)s
+            GROUP BY account_report_balance_snapshot.account_id%(extra_groupby_sql)s
+            """,
+            balance_select=self._currency_table_apply_rate(SQL("account_report_balance_snapshot.balance")),
+            extra_select_sql=SQL(", %s AS grouping_key", groupby_sql) if groupby_sql else SQL(),
+            currency_table_join=self._currency_table_aml_join(options, aml_alias=SQL('account_report_balance_snapshot')),
+            conditions=SQL(" AND ").join(conditions),
+            extra_groupby_sql=SQL(", %s", groupby_sql) if groupby_sql else SQL(),
+        )
+
     def _generate_carryover_external_values(self, options):
         """ Generates the account.report.external.value objects corresponding to this report's carryover under the provided options.
 
@@ -5196,7 +5576,27 @@ class AccountReport(models.Model):
     def get_report_information(self, options):
         """
         return a dictionary of information that will be consumed by the AccountReport component.
+
+        When the 'profiling' option is enabled, the timings of the steps of the rendering are added to it under the 'profiling' key,
+        and logged (see AccountReportProfiler).
         """
+        self.ensure_one()
+        if not options.get('profiling'):
+            return self._get_report_information(options)
+
+        profiler = AccountReportProfiler()
+        profiler_token = REPORT_PROFILER.set(profiler)
+        try:
+            with profiler.step('get_report_information', report=self.name):
+                report_information = self._get_report_information(options)
+        finally:
+            REPORT_PROFILER.reset(profiler_token)
+
+        report_information['profiling'] = profiler.steps
+        _logger.info("Profiling of the report %s (id %s):\n%s", self.name, self.id, profiler.format())
+        return report_information
+
+    def _get_report_information(self, options):
         self.ensure_one()
         self.env.flush_all()
 
@@ -5355,7 +5755,8 @@ class AccountReport(models.Model):
         lines = self._fully_unfold_lines_if_needed(lines, options)
 
         if self.custom_handler_model_id:
-            lines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, lines)
+            with profile_report_step('_custom_line_postprocessor'):
+                lines = self.env[self.custom_handler_model_name]._custom_line_postprocessor(self, options, lines)
 
         self._format_column_values(options, lines)
         return lines
@@ -5375,7 +5776,8 @@ class AccountReport(models.Model):
             progress = {column_group_key: 0 for column_group_key in options['column_groups']}
 
         expand_function = self._get_custom_report_function(expand_function_name, 'expand_unfoldable_line')
-        expansion_result = expand_function(line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=unfold_all_batch_data)
+        with profile_report_step(expand_function_name, groupby=groupby):
+            expansion_result = expand_function(line_dict_id, groupby, options, progress, offset, unfold_all_batch_data=unfold_all_batch_data)
 
         rslt = expansion_result['lines']
 
@@ -5495,7 +5897,8 @@ class AccountReport(models.Model):
             limit_to_load = None
             offset = 0
 
-        rslt_lines = line._expand_groupby(line_dict_id, groupby, options, offset=offset, limit=limit_to_load, load_one_more=bool(limit_to_load), unfold_all_batch_data=unfold_all_batch_data)
+        with profile_report_step('_expand_groupby', groupby=groupby):
+            rslt_lines = line._expand_groupby(line_dict_id, groupby, options, offset=offset, limit=limit_to_load, load_one_more=bool(limit_to_load), unfold_all_batch_data=unfold_all_batch_data)
         lines_to_load = rslt_lines[:self.load_more_limit] if limit_to_load else rslt_lines
 
         if not limit_to_load and options['export_mode'] is None:
@@ -5753,6 +6156,48 @@ class AccountReport(models.Model):
 
     def export_to_pdf(self, options):
         self.ensure_one()
+        return self.env['account.report']._export_to_pdf_batch([(self, options)])[0]
+
+    @api.model
+    def _export_to_pdf_batch(self, reports_options):
+        """ Exports several reports to pdf at once, returning the same dict as export_to_pdf for each of them.
+
+        :param reports_options: A list of (report, options) tuples.
+
+        The html of all the exports is rendered first, then wkhtmltopdf is run for all of them together
+        (see _run_wkhtmltopdf_batch), so that the pdf files are generated concurrently.
+        """
+        exports = [report._get_pdf_export_wkhtmltopdf_jobs(options) for report, options in reports_options]
+        pdf_contents = iter(self._run_wkhtmltopdf_batch([job for _file_name, jobs in exports for job in jobs]))
+
+        results = []
+        action_report = self.env['ir.actions.report']
+        for file_name, jobs in exports:
+            files_stream = [io.BytesIO(next(pdf_contents)) for _job in jobs]
+            if len(files_stream) > 1:
+                result_stream = action_report._merge_pdfs(files_stream)
+                result = result_stream.getvalue()
+                # Close the different stream
+                result_stream.close()
+                for file_stream in files_stream:
+                    file_stream.close()
+            else:
+                result = files_stream[0].read()
+
+            results.append({
+                'file_name': file_name,
+                'file_content': result,
+                'file_type': 'pdf',
+            })
+        return results
+
+    def _get_pdf_export_wkhtmltopdf_jobs(self, options):
+        """ Renders the html of the pdf export of this report.
+
+        :return: A tuple (file_name, jobs), jobs being the keyword arguments of each _run_wkhtmltopdf call needed by the export (one per
+                 page orientation), whose results are to be merged in that order.
+        """
+        self.ensure_one()
 
         base_url = self.env['ir.config_parameter'].sudo().get_param('report.url') or self.env['ir.config_parameter'].sudo().get_param('web.base.url')
         rcontext = {
@@ -5779,8 +6224,7 @@ class AccountReport(models.Model):
         footer = self.env['ir.actions.report']._render_template("account_reports.internal_layout", values=rcontext)
         footer = self.env['ir.actions.report']._render_template("web.minimal_layout", values=dict(rcontext, subst=True, body=markupsafe.Markup(footer.decode())))
 
-        action_report = self.env['ir.actions.report']
-        files_stream = []
+        jobs = []
         for is_landscape, reports_with_options in grouped_reports_by_format:
             bodies = []
 
@@ -5791,34 +6235,40 @@ class AccountReport(models.Model):
                     additional_context={'base_url': base_url}
                 ))
 
-            files_stream.append(
-                io.BytesIO(action_report._run_wkhtmltopdf(
-                    bodies,
-                    footer=footer.decode(),
-                    landscape=is_landscape or self._context.get('force_landscape_printing'),
-                    specific_paperformat_args={
-                        'data-report-margin-top': 10,
-                        'data-report-header-spacing': 10,
-                        'data-report-margin-bottom': 15,
-                    }
-                )
-            ))
+            jobs.append({
+                'bodies': bodies,
+                'footer': footer.decode(),
+                'landscape': is_landscape or self._context.get('force_landscape_printing'),
+                'specific_paperformat_args': {
+                    'data-report-margin-top': 10,
+                    'data-report-header-spacing': 10,
+                    'data-report-margin-bottom': 15,
+                },
+            })
 
-        if len(files_stream) > 1:
-            result_stream = action_report._merge_pdfs(files_stream)
-            result = result_stream.getvalue()
-            # Close the different stream
-            result_stream.close()
-            for file_stream in files_stream:
-                file_stream.close()
-        else:
-            result = files_stream[0].read()
+        return self.get_default_report_filename(options, 'pdf'), jobs
 
-        return {
-            'file_name': self.get_default_report_filename(options, 'pdf'),
-            'file_content': result,
-            'file_type': 'pdf',
-        }
+    @api.model
+    def _run_wkhtmltopdf_batch(self, jobs):
+        """ Calls _run_wkhtmltopdf for each of jobs (dicts of its keyword arguments), and returns the pdf contents in the same order.
+
+        Up to account_reports.pdf_export_workers wkhtmltopdf processes are run at once. Each of them is waited for by a thread
+        using its own cursor, as _run_wkhtmltopdf still reads a few records (paperformat, ...) before starting the process.
+        """
+        workers = int(self.env['ir.config_parameter'].sudo().get_param('account_reports.pdf_export_workers', 4))
+        if workers <= 1 or len(jobs) <= 1 or self.env.registry.in_test_mode():
+            return [self.env['ir.actions.report']._run_wkhtmltopdf(**job) for job in jobs]
+
+        registry, uid, context = self.env.registry, self.env.uid, self.env.context
+
+        def run_job(job):
+            with registry.cursor() as cr:
+                return api.Environment(cr, uid, context)['ir.actions.report']._run_wkhtmltopdf(**job)
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            # Each job gets a copy of the current context variables (http request, ...), as if it was run in this thread
+            futures = [executor.submit(contextvars.copy_context().run, run_job, job) for job in jobs]
+            return [future.result() for future in futures]
 
     def _get_pdf_export_html(self, options, lines, additional_context=None, template=None):
         report_info = self.get_report_information(options)
@@ -5891,6 +6341,63 @@ class AccountReport(models.Model):
                 rslt.append(line)
         return rslt
 
+    def _get_xlsx_lines_stream(self, options):
+        """ Returns the lines to export for these options as (folded_lines, lines), lines being a generator, or None if they can't be streamed.
+
+        This is the case for fully unfolded reports whose custom handler knows how to generate the sublines of all their unfoldable lines
+        by batches (see _custom_xlsx_stream_expand_functions): folded_lines are the lines of the report with everything folded (including
+        the totals below the unfoldable lines), and lines yields them together with their sublines, in the same order as _get_lines would,
+        without ever holding all of them.
+        """
+        self.ensure_one()
+        if (
+            not self.custom_handler_model_id
+            or not options.get('unfold_all')
+            or options.get('order_column')
+            or any(label.startswith('_currency_') for label in self.line_ids.expression_ids.mapped('label'))
+        ):
+            return None
+
+        stream_expand_functions = self.env[self.custom_handler_model_name]._custom_xlsx_stream_expand_functions(self, options)
+        if not stream_expand_functions:
+            return None
+
+        print_mode_self = self.with_context(no_format=True)
+        # Not filtered with _filter_out_folded_children: nothing being unfolded, the only children of the folded lines are their totals
+        folded_lines = print_mode_self._get_lines({**options, 'unfold_all': False, 'unfolded_lines': []})
+        if any(line.get('unfoldable') and line.get('expand_function') not in stream_expand_functions for line in folded_lines):
+            return None
+
+        return folded_lines, print_mode_self._generate_xlsx_lines_stream(options, folded_lines, stream_expand_functions)
+
+    def _generate_xlsx_lines_stream(self, options, folded_lines, stream_expand_functions):
+        # The totals below sections of the unfoldable lines are already part of folded_lines, right after them: the sublines are
+        # inserted in between.
+        for line in folded_lines:
+            if not line.get('unfoldable'):
+                yield line
+                continue
+
+            yield {**line, 'unfolded': True}
+            for subline in stream_expand_functions[line['expand_function']](self, options, line):
+                self._apply_integer_rounding_to_dynamic_lines(options, [subline])
+                yield subline
+
+    def _stream_query_results(self, query, batch_size=5000):
+        """ Yields the rows of query as dicts, fetched by batches from a server-side cursor, so that at most batch_size of them are
+        held in memory at once, whatever the total number of rows.
+        """
+        cursor_name = SQL.identifier(f'account_report_stream_{uuid.uuid4().hex}')
+        self._cr.execute(SQL("DECLARE %s NO SCROLL CURSOR FOR %s", cursor_name, query))
+        while True:
+            self._cr.execute(SQL("FETCH %s FROM %s", SQL(str(int(batch_size))), cursor_name))
+            rows = self._cr.dictfetchall()
+            if not rows:
+                break
+            yield from rows
+        # If the generator is not exhausted, the cursor is closed at the end of the transaction
+        self._cr.execute(SQL("CLOSE %s", cursor_name))
+
     def export_to_xlsx(self, options, response=None):
         def add_worksheet_unique_name(workbook, sheet_name):
             existing_names = set(workbook.sheetnames.keys())
@@ -5906,23 +6413,30 @@ class AccountReport(models.Model):
             return workbook.add_worksheet(new_sheet_name)
 
         self.ensure_one()
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {
-            'in_memory': True,
-            'strings_to_formulas': False,
-        })
-
         print_options = self.get_options(previous_options={**options, 'export_mode': 'print'})
         if print_options['sections']:
             reports_to_print = self.env['account.report'].browse([section['id'] for section in print_options['sections']])
         else:
             reports_to_print = self
 
-        reports_options = []
-        for report in reports_to_print:
-            report_options = report.get_options(previous_options={**print_options, 'selected_section_id': report.id})
-            reports_options.append(report_options)
-            report._inject_report_into_xlsx_sheet(report_options, workbook, add_worksheet_unique_name(workbook, report.name))
+        reports_options = [
+            report.get_options(previous_options={**print_options, 'selected_section_id': report.id})
+            for report in reports_to_print
+        ]
+
+        # When the lines of a report exported alone can be streamed, they are written one by one in constant_memory mode (each row being
+        # flushed to a temporary file as soon as the next one starts), so that the export's memory doesn't grow with its number of lines.
+        lines_stream = reports_to_print._get_xlsx_lines_stream(reports_options[0]) if len(reports_to_print) == 1 else None
+
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {
+            'in_memory': not lines_stream,
+            'constant_memory': bool(lines_stream),
+            'strings_to_formulas': False,
+        })
+
+        for report, report_options in zip(reports_to_print, reports_options):
+            report._inject_report_into_xlsx_sheet(report_options, workbook, add_worksheet_unique_name(workbook, report.name), lines_stream=lines_stream)
 
         self._add_options_xlsx_sheet(workbook, reports_options)
 
@@ -5982,7 +6496,12 @@ class AccountReport(models.Model):
             if width > col_width:
                 sheet.set_column(col, col, min(width + 4, 75))  # We need to add a little extra padding to ensure our columns are not clipping the text
 
-    def _inject_report_into_xlsx_sheet(self, options, workbook, sheet):
+    def _inject_report_into_xlsx_sheet(self, options, workbook, sheet, lines_stream=None):
+        """ Writes the lines of the report in sheet.
+
+        :param lines_stream: The result of _get_xlsx_lines_stream for these options, if the lines are to be streamed instead of being all
+                             generated by _get_lines beforehand. The rows are then written strictly in order, as required by constant_memory mode.
+        """
 
         # We start by gathering the bold, italic and regular fonts to use later.
         fonts = {}
@@ -6060,14 +6579,17 @@ class AccountReport(models.Model):
                 return level_formats.get('default_indent', level_formats.get(content_type.removesuffix('_indent'), level_formats['default']))
             return level_formats.get(content_type, level_formats['default'])
 
-        print_mode_self = self.with_context(no_format=True)
-        lines = self._filter_out_folded_children(print_mode_self._get_lines(options))
+        if lines_stream:
+            folded_lines, lines = lines_stream
+        else:
+            print_mode_self = self.with_context(no_format=True)
+            folded_lines = lines = self._filter_out_folded_children(print_mode_self._get_lines(options))
         annotations = self.get_annotations(options)
 
         # For reports with lines generated for accounts, the account name and codes are shown in a single column.
         # To help user post-process the report if they need, we should in such a case split the account name and code in two columns.
         account_lines_split_names = {}
-        for line in lines:
+        for line in folded_lines:
             line_model = self._get_model_info_from_id(line['id'])[0]
             if line_model == 'account.account':
                 # Reuse the _split_code_name to split the name and code in two values.
@@ -6082,7 +6604,8 @@ class AccountReport(models.Model):
             sheet.set_column(0, 0, 50)
 
         if not options.get('no_xlsx_currency_code_columns'):
-            self._add_xlsx_currency_codes_columns(options, lines)
+            # Reports with currency code columns are never streamed (see _get_xlsx_lines_stream)
+            self._add_xlsx_currency_codes_columns(options, folded_lines)
 
         original_x_offset = 1 if len(account_lines_split_names) > 0 else 0
 
@@ -6142,7 +6665,11 @@ class AccountReport(models.Model):
             lines = self.sort_lines(lines, options)
 
         # Disable bold styling for the max level.
-        max_level = max(line.get('level', -1) for line in lines) if lines else -1
+        # Streamed lines are only known once written: the sublines of their unfoldable lines are supposed to be the deepest ones.
+        if lines_stream:
+            max_level = -1 if any(line.get('unfoldable') for line in folded_lines) else max((line.get('level', -1) for line in folded_lines), default=-1)
+        else:
+            max_level = max(line.get('level', -1) for line in lines) if lines else -1
         if max_level in {0, 1, 2}:
             # Total lines are supposed to be a level above, so we don't touch them.
             for wb_format in (s for s in workbook_formats[max_level] if 'total' not in s):
@@ -6175,9 +6702,9 @@ class AccountReport(models.Model):
                 cell_format = get_format('default_indent', level)
 
             x_offset = original_x_offset + 1
-            if lines[y]['id'] in account_lines_split_names:
+            if line['id'] in account_lines_split_names:
                 # Write the Account Code and Name columns.
-                code, name = account_lines_split_names[lines[y]['id']]
+                code, name = account_lines_split_names[line['id']]
                 # Don't indent the account code and don't format is as a monetary value either.
                 write_cell(sheet, 0, y + y_offset, code, account_code_cell_format)
                 write_cell(sheet, 1, y + y_offset, name, cell_format)
@@ -7110,7 +7637,8 @@ class AccountReportLine(models.Model):
             }
 
             if self.report_id.custom_handler_model_id:
-                self.env[self.report_id.custom_handler_model_name]._custom_groupby_line_completer(self.report_id, options, group_line_dict)
+                with profile_report_step('_custom_groupby_line_completer'):
+                    self.env[self.report_id.custom_handler_model_name]._custom_groupby_line_completer(self.report_id, options, group_line_dict)
 
             # Growth comparison column.
             if options.get('column_percent_comparison') == 'growth':
@@ -7374,6 +7902,14 @@ class AccountReportCustomHandler(models.AbstractModel):
         """
         return None
 
+    def _custom_xlsx_stream_expand_functions(self, report, options):
+        """ To be overridden by reports whose fully unfolded xlsx export can contain too many lines to be generated at once by _get_lines.
+        Returns a dict {expand_function_name: function(report, options, line_dict)}, where each function is a generator of the same sublines
+        as the expand function would return for line_dict (without load more), reading them from the database by batches.
+        When all the unfoldable lines of the report have one, the xlsx export streams its lines (see account.report's _get_xlsx_lines_stream).
+        """
+        return {}
+
     def _get_custom_display_config(self):
         """ To be overridden in order to change the templates used by Javascript to render this report (keeping the same
         OWL components), and/or replace some of the default OWL components by custom-made ones.
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+from odoo.tools import SQL, str2bool
+from odoo.tools.sql import create_unique_index
+
+# Fields of account.move.line whose change moves a posted line from one snapshot bucket to another, or changes its amounts.
+BALANCE_SNAPSHOT_AML_FIELDS = (
+    'company_id', 'account_id', 'journal_id', 'currency_id', 'date',
+    'balance', 'debit', 'credit', 'amount_currency', 'display_type', 'parent_state',
+)
+
+# Columns of a bucket, in the order of its unique index: rows are always upserted in that order (see _upsert_buckets).
+BALANCE_SNAPSHOT_BUCKET_KEY = SQL("company_id, month, COALESCE(account_id, 0), journal_id, currency_id")
+
+
+class AccountReportBalanceSnapshot(models.Model):
+    """ Posted account.move.line totals, aggregated per (company, account, journal, currency, month).
+
+    The table is maintained incrementally: each time posted lines appear, change or disappear (posting, resetting to draft,
+    cancelling, editing or deleting a posted entry), their contribution is subtracted from / added to their bucket by
+    _apply_move_lines. Report engines use it to read the balances of whole closed months instead of aggregating every
+    journal item of the period; see account.report's _get_balance_snapshot_window.
+
+    Partners are deliberately not a dimension: merging two partners rewrites their foreign keys in raw SQL, which would
+    collide on the buckets. Merging accounts does the same, so account.merge.wizard rebuilds the snapshot of the companies
+    involved instead.
+    """
+    _name = 'account.report.balance.snapshot'
+    _description = "Accounting Report Balance Snapshot"
+    _log_access = False
+
+    company_id = fields.Many2one(comodel_name='res.company', required=True, readonly=True, ondelete='cascade')
+    account_id = fields.Many2one(comodel_name='account.account', readonly=True, ondelete='cascade')
+    journal_id = fields.Many2one(comodel_name='account.journal', readonly=True, ondelete='cascade')
+    currency_id = fields.Many2one(comodel_name='res.currency', readonly=True)
+    company_currency_id = fields.Many2one(related='company_id.currency_id')
+    month = fields.Date(required=True, readonly=True, help="First day of the month the aggregated journal items are dated in.")
+    balance = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    debit = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    credit = fields.Monetary(currency_field='company_currency_id', readonly=True)
+    amount_currency = fields.Monetary(currency_field='currency_id', readonly=True)
+    line_count = fields.Integer(readonly=True)
+
+    def init(self):
+        super().init()
+        # Also the lookup index of the report engines: they filter on company and month range, and group by account.
+        create_unique_index(
+            self.env.cr,
+            'account_report_balance_snapshot_bucket_uniq',
+            self._table,
+            ['company_id', 'month', 'COALESCE(account_id, 0)', 'journal_id', 'currency_id'],
+        )
+        self.env.cr.execute(SQL("SELECT 1 FROM %s LIMIT 1", SQL.identifier(self._table)))
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.model
+    def _is_enabled(self):
+        """ Reading from the snapshot can be switched off (the table is maintained in any case), for example to compare results. """
+        return str2bool(self.env['ir.config_parameter'].sudo().get_param('account_reports.use_balance_snapshot', 'True'))
+
+    @api.model
+    def _get_aml_bucket_select(self, sign=1):
+        return SQL(
+            """
+            SELECT
+                aml.company_id,
+                aml.account_id,
+                aml.journal_id,
+                aml.currency_id,
+                DATE_TRUNC('month', aml.date)::date,
+                %(sign)s * SUM(aml.balance),
+                %(sign)s * SUM(aml.debit),
+                %(sign)s * SUM(aml.credit),
+                %(sign)s * SUM(aml.amount_currency),
+                %(sign)s * COUNT(*)
+            FROM account_move_line aml
+            """,
+            sign=sign,
+        )
+
+    @api.model
+    def _get_aml_bucket_condition(self):
+        # Same lines as the ones matched by account.report's _get_options_domain, for posted entries only.
+        return SQL(
+            "aml.parent_state = 'posted' AND (aml.display_type IS NULL OR aml.display_type NOT IN ('line_section', 'line_note'))"
+        )
+
+    @api.model
+    def _rebuild(self, companies=None):
+        """ Recompute the snapshot of the given companies (all of them by default) from scratch. """
+        self.env['account.move.line'].flush_model(BALANCE_SNAPSHOT_AML_FIELDS)
+        if companies:
+            delete_condition = SQL("company_id IN %s", tuple(companies.ids))
+            aml_company_condition = SQL("aml.company_id IN %s", tuple(companies.ids))
+        else:
+            delete_condition = aml_company_condition = SQL("TRUE")
+        self.env.cr.execute(SQL(
+            """
+            DELETE FROM account_report_balance_snapshot WHERE %(delete_condition)s;
+
+            INSERT INTO account_report_balance_snapshot
+                (company_id, account_id, journal_id, currency_id, month, balance, debit, credit, amount_currency, line_count)
+            %(bucket_select)s
+            WHERE %(bucket_condition)s AND %(aml_company_condition)s
+            GROUP BY 1, 2, 3, 4, 5
+            """,
+            delete_condition=delete_condition,
+            aml_company_condition=aml_company_condition,
+            bucket_select=self._get_aml_bucket_select(),
+            bucket_condition=self._get_aml_bucket_condition(),
+        ))
+
+    @api.model
+    def _apply_move_lines(self, lines, sign):
+        """ Add (sign=1) or subtract (sign=-1) the contribution of the posted lines among the given ones, as currently stored in
+        database, to their buckets.
+        Callers subtract the lines before changing them, and add them back once the change is flushed.
+        """
+        if not lines:
+            return
+        self.env['account.move.line'].flush_model(BALANCE_SNAPSHOT_AML_FIELDS)
+        self._upsert_buckets(SQL(
+            """
+            %(bucket_select)s
+            WHERE %(bucket_condition)s AND aml.id IN %(line_ids)s
+            GROUP BY 1, 2, 3, 4, 5
+            """,
+            bucket_select=self._get_aml_bucket_select(sign),
+            bucket_condition=self._get_aml_bucket_condition(),
+            line_ids=tuple(lines.ids),
+        ))
+
+    @api.model
+    def _upsert_buckets(self, bucket_rows):
+        """ Add the rows of the bucket_rows query (with the columns of _get_aml_bucket_select) to their buckets.
+
+        Concurrent transactions posting entries lock the bucket rows they touch. They always lock them in the order of the
+        bucket key, so that two postings sharing buckets wait for each other instead of deadlocking.
+        """
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO account_report_balance_snapshot
+                (company_id, account_id, journal_id, currency_id, month, balance, debit, credit, amount_currency, line_count)
+            SELECT *
+              FROM (%(bucket_rows)s) AS bucket(company_id, account_id, journal_id, currency_id, month, balance, debit, credit, amount_currency, line_count)
+          ORDER BY %(bucket_key)s
+            ON CONFLICT (company_id, month, COALESCE(account_id, 0), journal_id, currency_id)
+            DO UPDATE SET
+                balance = account_report_balance_snapshot.balance + EXCLUDED.balance,
+                debit = account_report_balance_snapshot.debit + EXCLUDED.debit,
+                credit = account_report_balance_snapshot.credit + EXCLUDED.credit,
+                amount_currency = account_report_balance_snapshot.amount_currency + EXCLUDED.amount_currency,
+                line_count = account_report_balance_snapshot.line_count + EXCLUDED.line_count
+            RETURNING id, line_count
+            """,
+            bucket_rows=bucket_rows,
+            bucket_key=BALANCE_SNAPSHOT_BUCKET_KEY,
+        ))
+        emptied_ids = tuple(snapshot_id for snapshot_id, line_count in self.env.cr.fetchall() if line_count == 0)
+        if emptied_ids:
+            self.env.cr.execute(SQL("DELETE FROM account_report_balance_snapshot WHERE id IN %s", emptied_ids))
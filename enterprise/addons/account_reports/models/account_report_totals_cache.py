@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from ast import literal_eval
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.lru import LRU
+from odoo.addons.account_reports.models.account_move import REPORT_DATA_MOVE_FIELDS
+
+# Expression totals already computed by this server process, in their json-friendly form (expression ids instead of records).
+# {cache_key: (timestamp, json_friendly_column_group_totals, warnings)} ; see account.report's _get_expression_totals_cache_key.
+EXPRESSION_TOTALS_CACHE = LRU(256)
+EXPRESSION_TOTALS_CACHE_LOCK = threading.Lock()
+
+# Options only used to render the lines, that never change the totals of the expressions.
+EXPRESSION_TOTALS_CACHE_IGNORED_OPTIONS = {
+    'unfolded_lines', 'unfold_all', 'hide_0_lines', 'order_column', 'loading_call_number', 'readonly_query', 'export_mode',
+    'hierarchy', 'display_hierarchy_filter',
+}
+
+# Fields report domains can go through from journal items, whose changes bump account.report.data.version (None for all the fields
+# of the model). Totals depending on any other field (partners, products, journals, ...) are never cached.
+EXPRESSION_TOTALS_CACHE_VERSIONED_FIELDS = {
+    'account.move.line': None,
+    'account.move': REPORT_DATA_MOVE_FIELDS,
+    'account.account': None,
+    'account.account.tag': None,
+    'account.fiscal.position': None,
+}
+
+
+class AccountReportDataVersion(models.Model):
+    """ Version counter of the data account reports are computed from, per company (company_id = NULL for changes impacting all
+    companies, such as a report definition or a currency rate).
+
+    Each transaction changing journal items (or other report data) adds a row of weight 1 for each company it impacts, so that the
+    version of a set of companies is the sum of the weights of their rows. Rows are only ever added or merged together (keeping
+    the sum), never updated in place: concurrent transactions don't lock each other, and the version read by a transaction always
+    matches the data it can see.
+    """
+    _name = 'account.report.data.version'
+    _description = "Accounting Report Data Version"
+    _log_access = False
+
+    company_id = fields.Many2one(comodel_name='res.company', index=True, ondelete='cascade')
+    weight = fields.Integer(required=True, default=1)
+
+    @api.model
+    def _get_transaction_bumped_companies(self):
+        # Cleared at each commit/rollback, together with the rest of the precommit data
+        return self.env.cr.precommit.data.setdefault('account_report_data_version.bumped', set())
+
+    @api.model
+    def _bump(self, company_ids=None):
+        """ Invalidate the cached report totals of the given companies (all of them if None). Only one row is added per company for
+        all the changes done in the same transaction.
+        """
+        bumped = self._get_transaction_bumped_companies()
+        to_bump = {None} if company_ids is None else set(company_ids)
+        to_bump -= bumped
+        if not to_bump:
+            return
+        self.env.cr.execute(SQL(
+            "INSERT INTO account_report_data_version (company_id, weight) SELECT UNNEST(%s::int[]), 1",
+            list(to_bump),
+        ))
+        bumped |= to_bump
+
+    @api.model
+    def _get_version(self, company_ids):
+        """ Return the current data version of the given companies, or None if the transaction changed report data itself: its
+        uncommitted changes could be rolled back, and the version it sees could then be reached by another transaction with
+        different data.
+        """
+        if self._get_transaction_bumped_companies():
+            return None
+        self.env.cr.execute(SQL(
+            """
+            SELECT COALESCE(SUM(weight), 0)
+              FROM account_report_data_version
+             WHERE company_id IS NULL OR company_id = ANY(%s)
+            """,
+            list(company_ids),
+        ))
+        return self.env.cr.fetchone()[0]
+
+    @api.autovacuum
+    def _gc_merge_versions(self):
+        """ Merge the rows of each company into a single one with the same total weight, so that versions stay cheap to read. """
+        self.env.cr.execute("""
+            WITH merged AS (
+                DELETE FROM account_report_data_version
+                  RETURNING company_id, weight
+            )
+            INSERT INTO account_report_data_version (company_id, weight)
+                 SELECT company_id, SUM(weight)
+                   FROM merged
+               GROUP BY company_id
+        """)
+
+
+class AccountReport(models.Model):
+    _inherit = 'account.report'
+
+    def _get_expression_totals_cache_key(self, expressions, options, groupby_to_expand, offset, limit, include_default_vals):
+        """ Key under which the result of _compute_expression_totals_for_each_column_group for these parameters is cached, or None if
+        it can't be cached.
+
+        The key contains a hash of the options, the version of the report data for the companies of the report (see
+        account.report.data.version) and everything else the result depends on (user access rules, current company).
+        Custom engines, analytic columns, budgets and domains going through fields that are not versioned (such as the ones of
+        the partners) read data whose changes don't bump the version, so they are never cached.
+        """
+        self.ensure_one()
+        ttl = int(self.env['ir.config_parameter'].sudo().get_param('account_reports.expression_totals_cache_ttl', 300))
+        all_expressions = expressions._expand_aggregations()
+        if ttl <= 0 or 'custom' in all_expressions.mapped('engine'):
+            return None
+
+        all_options = [options, *(column_group['forced_options'] for column_group in options['column_groups'].values())]
+        if any(
+            group_options.get(key)
+            for group_options in all_options
+            for key in ('analytic_groupby_option', 'compute_budget', 'budget_percentage', 'report_cash_basis')
+        ):
+            return None
+
+        domains = [
+            *(literal_eval(expression.formula) for expression in all_expressions if expression.engine == 'domain'),
+            *(
+                self._get_options_domain(self._get_column_group_options(options, column_group_key), None)
+                for column_group_key in options['column_groups']
+            ),
+        ]
+        if not all(self._is_domain_versioned(domain) for domain in domains):
+            return None
+
+        try:
+            options_hash = hashlib.sha256(json.dumps(
+                {key: value for key, value in options.items() if key not in EXPRESSION_TOTALS_CACHE_IGNORED_OPTIONS},
+                sort_keys=True,
+                default=str,
+            ).encode()).hexdigest()
+        except TypeError:
+            return None
+
+        data_version = self.env['account.report.data.version']._get_version(self.get_report_company_ids(options))
+        if data_version is None:
+            return None
+
+        return (
+            self.env.cr.dbname,
+            self.id,
+            tuple(sorted(expressions.ids)),
+            groupby_to_expand,
+            offset,
+            limit,
+            include_default_vals,
+            options_hash,
+            data_version,
+            self.env.su or str(self.env['ir.rule']._compute_domain('account.move.line', 'read')),
+            self.env.company.id,
+        )
+
+    @api.model
+    def _is_domain_versioned(self, domain):
+        """ Whether all the fields the given domain on journal items goes through are in EXPRESSION_TOTALS_CACHE_VERSIONED_FIELDS. """
+        for leaf in domain:
+            if isinstance(leaf, str):
+                continue
+            if not isinstance(leaf, (list, tuple)) or len(leaf) != 3 or not isinstance(leaf[0], str) or leaf[1] in ('any', 'not any'):
+                return False
+            model_name = 'account.move.line'
+            for field_name in leaf[0].split('.'):
+                if model_name not in EXPRESSION_TOTALS_CACHE_VERSIONED_FIELDS:
+                    return False
+                versioned_fields = EXPRESSION_TOTALS_CACHE_VERSIONED_FIELDS[model_name]
+                field = self.env[model_name]._fields.get(field_name)
+                if not field or (versioned_fields is not None and field_name not in versioned_fields):
+                    return False
+                model_name = field.comodel_name
+        return True
+
+    def _get_cached_expression_totals(self, cache_key, warnings=None):
+        ttl = int(self.env['ir.config_parameter'].sudo().get_param('account_reports.expression_totals_cache_ttl', 300))
+        with EXPRESSION_TOTALS_CACHE_LOCK:
+            cached = EXPRESSION_TOTALS_CACHE.get(cache_key)
+        if not cached or time.monotonic() - cached[0] > ttl:
+            return None
+
+        _timestamp, json_friendly_column_group_totals, cached_warnings = copy.deepcopy(cached)
+        if warnings is not None:
+            warnings.update(cached_warnings)
+        return self._convert_json_friendly_column_group_totals(json_friendly_column_group_totals)
+
+    def _set_cached_expression_totals(self, cache_key, all_column_groups_expression_totals, warnings=None):
+        value = (
+            time.monotonic(),
+            copy.deepcopy(self._get_json_friendly_column_group_totals(all_column_groups_expression_totals)),
+            copy.deepcopy(warnings or {}),
+        )
+        with EXPRESSION_TOTALS_CACHE_LOCK:
+            EXPRESSION_TOTALS_CACHE[cache_key] = value
+
+
+class AccountReportExternalValue(models.Model):
+    _inherit = 'account.report.external.value'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['account.report.data.version']._bump(records.company_id.ids)
+        return records
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        res = super().write(vals)
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        return res
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        return super().unlink()
+
+
+class AccountReportLine(models.Model):
+    _inherit = 'account.report.line'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['account.report.data.version']._bump()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump()
+        return super().unlink()
+
+
+class AccountReportExpression(models.Model):
+    _inherit = 'account.report.expression'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['account.report.data.version']._bump()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump()
+        return super().unlink()
+
+
+class AccountPartialReconcile(models.Model):
+    _inherit = 'account.partial.reconcile'
+
+    # The residual amounts of the reconciled journal items are recomputed without going through their write()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env['account.report.data.version']._bump(partials.company_id.ids)
+        return partials
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        return super().unlink()
+
+
+class ResCurrencyRate(models.Model):
+    _inherit = 'res.currency.rate'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['account.report.data.version']._bump()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump()
+        return super().unlink()
+
+
+class AccountAccountTag(models.Model):
+    _inherit = 'account.account.tag'
+
+    # Tags are shared by all companies; the tax_tags engine finds them by name, and domains filter journal items on them
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env['account.report.data.version']._bump()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump()
+        return super().unlink()
+
+
+class AccountFiscalPosition(models.Model):
+    _inherit = 'account.fiscal.position'
+
+    # The fiscal position filter of the reports selects journal items through the foreign VAT and country of the fiscal positions
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        fiscal_positions = super().create(vals_list)
+        self.env['account.report.data.version']._bump(fiscal_positions.company_id.ids)
+        return fiscal_positions
+
+    def write(self, vals):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump(self.company_id.ids)
+        return super().unlink()
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    # Totals depending on the fields of the partners are never cached, but merging partners moves journal items from a partner to
+    # another in SQL, before deleting the merged ones.
+
+    def unlink(self):
+        self.env['account.report.data.version']._bump()
+        return super().unlink()
@@ -3,6 +3,7 @@ from itertools import zip_longest
 from odoo import api, Command, fields, models, _
 from odoo.exceptions import ValidationError
 from odoo.tools import date_utils, float_is_zero, float_round
+from odoo.tools.sql import create_index
 
 
 class AccountReportBudget(models.Model):
@@ -109,3 +110,8 @@ class AccountReportBudgetItem(models.Model):
     account_id = fields.Many2one(string="Account", comodel_name='account.account', required=True)
     amount = fields.Float(string="Amount", default=0)
     date = fields.Date(required=True)
+
+    def init(self):
+        super().init()
+        # The reports read the items of one budget at a time, by account and date (see _get_report_budget_aml_table).
+        create_index(self.env.cr, 'account_report_budget_item_budget_account_date_idx', self._table, ['budget_id', 'account_id', 'date'])
@@ -59,32 +59,47 @@ class ResPartner(models.Model):
 
     def _get_partner_account_report_attachment(self, report, options=None):
         self.ensure_one()
-        if self.lang:
-            # Print the followup in the customer's language
-            report = report.with_context(lang=self.lang)
+        return self._get_partners_account_report_attachments(report, options)[self]
 
-        if not options:
-            options = report.get_options({
-                'forced_companies': self.env.company.search([('id', 'child_of', self.env.context.get('allowed_company_ids', self.env.company.id))]).ids,
-                'partner_ids': self.ids,
-                'unfold_all': True,
-                'unreconciled': True,
-                # The following two options are Deprecated, will be removed in master
-                'hide_account': True,
-                'hide_debit_credit': True,
-                'all_entries': False,
-            })
-        attachment_file = report.export_to_pdf(options)
-        return self.env['ir.attachment'].create([
+    def _get_partners_account_report_attachments(self, report, options=None):
+        """ Exports report to pdf for each partner of self, with options restricted to that partner, and returns
+        {partner: attachment}. The pdf files of all the partners are generated together (see account.report's _export_to_pdf_batch).
+        """
+        reports_options = []
+        for partner in self:
+            partner_report = report
+            if partner.lang:
+                # Print the followup in the customer's language
+                partner_report = report.with_context(lang=partner.lang)
+
+            if options:
+                partner_options = {**options, 'partner_ids': partner.ids}
+            else:
+                partner_options = partner_report.get_options({
+                    'forced_companies': self.env.company.search([('id', 'child_of', self.env.context.get('allowed_company_ids', self.env.company.id))]).ids,
+                    'partner_ids': partner.ids,
+                    'unfold_all': True,
+                    'unreconciled': True,
+                    # The following two options are Deprecated, will be removed in master
+                    'hide_account': True,
+                    'hide_debit_credit': True,
+                    'all_entries': False,
+                })
+            reports_options.append((partner_report, partner_options))
+
+        attachment_files = self.env['account.report']._export_to_pdf_batch(reports_options)
+        attachments = self.env['ir.attachment'].create([
             {
-                'name': f"{self.name} - {attachment_file['file_name']}",
+                'name': f"{partner.name} - {attachment_file['file_name']}",
                 'res_model': self._name,
-                'res_id': self.id,
+                'res_id': partner.id,
                 'type': 'binary',
                 'raw': attachment_file['file_content'],
                 'mimetype': 'application/pdf',
-            },
+            }
+            for partner, attachment_file in zip(self, attachment_files)
         ])
+        return dict(zip(self, attachments))
 
     def set_commercial_partner_main(self):
         self.ensure_one()
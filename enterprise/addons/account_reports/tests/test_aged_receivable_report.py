@@ -352,6 +352,23 @@ class TestAgedReceivableReport(TestAccountReportsCommon):
             options,
         )
 
+    def test_aged_receivable_fully_reconciled_after_date(self):
+        """ Lines fully reconciled after the date of the report are still open at that date. """
+        partner = self.env['res.partner'].create({'name': 'reconciled_partner'})
+        invoice = self.init_invoice('out_invoice', partner=partner, invoice_date='2023-03-01', amounts=[100.0], post=True)
+        self.env['account.payment.register'].with_context(active_model='account.move', active_ids=invoice.ids).create({
+            'payment_date': '2023-04-15',
+        })._create_payments()
+        self.assertTrue(invoice.line_ids.filtered(lambda line: line.account_id.account_type == 'asset_receivable').reconciled)
+
+        def get_partner_total(date_to):
+            options = self._generate_options(self.report, date_to, date_to)
+            partner_line = next((line for line in self.report._get_lines(options) if line['name'] == partner.name), None)
+            return partner_line and partner_line['columns'][-1]['no_format']
+
+        self.assertEqual(get_partner_total('2023-03-31'), 100.0)
+        self.assertIsNone(get_partner_total('2023-04-30'))
+
     def test_aged_receivable_sort_lines_by_date(self):
         """ Test the sort_lines function using date as sort key. """
         options = self._generate_options(self.report, fields.Date.from_string('2017-02-01'), fields.Date.from_string('2017-02-01'))
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 # pylint: disable=bad-whitespace
+import threading
+import time
+from unittest.mock import patch
+
 from .common import TestAccountReportsCommon
 
-from odoo import fields, Command
+from odoo import api, fields, Command, SUPERUSER_ID
+from odoo.sql_db import db_connect
 from odoo.tests import tagged
+from odoo.tools import SQL
 
 
 @tagged('post_install', '-at_install')
@@ -247,3 +253,192 @@ class TestBalanceSheetReport(TestAccountReportsCommon):
             ],
             options,
         )
+
+    def _get_balance_snapshot_values(self, company=None):
+        self.env.cr.execute("""
+            SELECT company_id, account_id, journal_id, currency_id, month, balance, debit, credit, amount_currency, line_count
+              FROM account_report_balance_snapshot
+             WHERE company_id = %s
+          ORDER BY 1, 2, 3, 4, 5
+        """, [(company or self.env.company).id])
+        return self.env.cr.fetchall()
+
+    def _assert_balance_snapshot_up_to_date(self):
+        """ The incrementally maintained snapshot must always match one rebuilt from scratch. """
+        incremental_values = self._get_balance_snapshot_values()
+        self.env['account.report.balance.snapshot']._rebuild(self.env.company)
+        self.assertEqual(incremental_values, self._get_balance_snapshot_values())
+
+    def _get_balance_sheet_receivables(self, date_to):
+        options = self._generate_options(self.report, '2020-01-01', date_to)
+        receivables_line = next(line for line in self.report._get_lines(options) if line['name'] == 'Receivables')
+        return receivables_line['columns'][0]['no_format']
+
+    def test_balance_snapshot_follows_entries(self):
+        invoices = self.env['account.move']
+        for invoice_date, amount in (('2020-01-10', 100.0), ('2020-01-31', 250.0), ('2020-02-15', 400.0)):
+            invoices += self.init_invoice('out_invoice', partner=self.partner_a, invoice_date=invoice_date, amounts=[amount], post=True)
+        self._assert_balance_snapshot_up_to_date()
+        options = self._generate_options(self.report, '2020-01-01', '2020-02-29')
+        window = self.report._get_balance_snapshot_window(options, 'from_beginning', self.report._get_report_query(options, 'from_beginning'))
+        self.assertEqual((window['date_from'], str(window['date_to'])), (None, '2020-03-01'), "Up to February is read from the snapshot.")
+        self.assertEqual(self._get_balance_sheet_receivables('2020-02-29'), sum(invoices.mapped('amount_total')))
+
+        invoices[0].button_draft()
+        self._assert_balance_snapshot_up_to_date()
+        invoices[0].write({'invoice_date': '2020-03-05', 'date': '2020-03-05'})
+        invoices[0].action_post()
+        self._assert_balance_snapshot_up_to_date()
+        invoices[1].button_draft()
+        invoices[1].button_cancel()
+        self._assert_balance_snapshot_up_to_date()
+        self.assertEqual(self._get_balance_sheet_receivables('2020-02-29'), invoices[2].amount_total)
+
+        misc_move = self.env['account.move'].create({
+            'move_type': 'entry',
+            'date': '2020-02-20',
+            'line_ids': [
+                Command.create({'account_id': self.company_data['default_account_receivable'].id, 'debit': 50.0}),
+                Command.create({'account_id': self.company_data['default_account_revenue'].id, 'credit': 50.0}),
+            ],
+        })
+        misc_move.action_post()
+        self._assert_balance_snapshot_up_to_date()
+        self.assertEqual(self._get_balance_sheet_receivables('2020-02-29'), invoices[2].amount_total + 50.0)
+
+        misc_move.button_draft()
+        misc_move.unlink()
+        self._assert_balance_snapshot_up_to_date()
+
+    def test_balance_snapshot_window(self):
+        report = self.env.ref('account_reports.profit_and_loss')
+        options = self._generate_options(report, '2020-01-15', '2020-04-30')
+        window = report._get_balance_snapshot_window(options, 'strict_range', report._get_report_query(options, 'strict_range'))
+        self.assertEqual(
+            (str(window['date_from']), str(window['date_to'])),
+            ('2020-02-01', '2020-05-01'),
+            "Only the whole months of the period are read from the snapshot.",
+        )
+
+        options['partner_ids'] = [self.partner_a.id]
+        query = report._get_report_query(options, 'strict_range')
+        self.assertIsNone(report._get_balance_snapshot_window(options, 'strict_range', query), "The snapshot has no partner dimension.")
+
+        del options['partner_ids']
+        options['unreconciled'] = True
+        query = report._get_report_query(options, 'strict_range')
+        self.assertIsNone(report._get_balance_snapshot_window(options, 'strict_range', query), "Filters the snapshot doesn't know about disable it.")
+
+    def test_balance_snapshot_partner_merge(self):
+        """ Merging partners rewrites the journal items in SQL: the snapshot, which has no partner, must not lose them. """
+        partner_c = self.env['res.partner'].create({'name': 'partner_c'})
+        invoices = (
+            self.init_invoice('out_invoice', partner=self.partner_a, invoice_date='2020-01-15', amounts=[1000.0], post=True)
+            + self.init_invoice('out_invoice', partner=partner_c, invoice_date='2020-01-20', amounts=[500.0], post=True)
+        )
+        self.env['base.partner.merge.automatic.wizard']._merge((self.partner_a + partner_c).ids, self.partner_a, extra_checks=False)
+
+        self.assertEqual(invoices.line_ids.partner_id, self.partner_a)
+        self._assert_balance_snapshot_up_to_date()
+        self.assertEqual(self._get_balance_sheet_receivables('2020-02-29'), sum(invoices.mapped('amount_total')))
+
+    def test_balance_snapshot_account_merge(self):
+        """ Merging accounts sharing a bucket must give the remaining account the balance of both. """
+        accounts = self.env['account.account'].create([
+            {'code': code, 'name': code, 'account_type': 'asset_current'}
+            for code in ('121041', '121042')
+        ])
+        self.env['account.move'].create({
+            'move_type': 'entry',
+            'date': '2020-01-10',
+            'journal_id': self.company_data['default_journal_misc'].id,
+            'line_ids': [
+                Command.create({'account_id': accounts[0].id, 'debit': 100.0}),
+                Command.create({'account_id': accounts[1].id, 'debit': 50.0}),
+                Command.create({'account_id': self.company_data['default_account_revenue'].id, 'credit': 150.0}),
+            ],
+        }).action_post()
+
+        self.env['account.merge.wizard'].with_context(active_model='account.account', active_ids=accounts.ids).create({}).action_merge()
+
+        remaining_account = accounts.exists()
+        self.assertEqual(len(remaining_account), 1)
+        self._assert_balance_snapshot_up_to_date()
+        self.assertEqual(
+            sum(
+                self.env['account.report.balance.snapshot'].search([('account_id', '=', remaining_account.id)]).mapped('balance')
+            ),
+            150.0,
+        )
+
+    def test_balance_snapshot_concurrent_postings(self):
+        """ Two transactions posting into the same buckets, in opposite orders, must wait for each other, not deadlock. """
+        company_id = self.env.ref('base.main_company').id
+        months = ('1900-01-01', '1900-02-01', '1900-03-01')
+
+        def bucket_rows(months):
+            return SQL(", ").join(
+                SQL("(%s, NULL::int, NULL::int, NULL::int, %s::date, 1.0, 1.0, 0.0, 0.0, 1)", company_id, month)
+                for month in months
+            )
+
+        def upsert(months, errors):
+            try:
+                with db_connect(self.env.cr.dbname).cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    env['account.report.balance.snapshot']._upsert_buckets(SQL("VALUES %s", bucket_rows(months)))
+                    time.sleep(0.5)  # hold the bucket locks while the other transaction tries to take them
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        def cleanup():
+            with db_connect(self.env.cr.dbname).cursor() as cr:
+                cr.execute("DELETE FROM account_report_balance_snapshot WHERE month < '1901-01-01'")
+
+        self.addCleanup(cleanup)
+        upsert(months, [])  # the buckets exist: both transactions will update (and lock) the same rows
+
+        errors = []
+        threads = [
+            threading.Thread(target=upsert, args=(months, errors)),
+            threading.Thread(target=upsert, args=(months[::-1], errors)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertFalse(errors)
+        with db_connect(self.env.cr.dbname).cursor() as cr:
+            cr.execute("SELECT month::text, line_count FROM account_report_balance_snapshot WHERE month < '1901-01-01' ORDER BY month")
+            self.assertEqual(cr.fetchall(), [(month, 3) for month in months])
+
+    def test_balance_snapshot_from_beginning_comparison(self):
+        """ The periods of a comparison are evaluated together in a single pass over the journal items, except when they can read their
+        closed months from the snapshot: each period then only aggregates the journal items of its open months.
+        """
+        invoices = self.env['account.move']
+        for invoice_date, amount in (('2019-11-20', 50.0), ('2020-01-10', 100.0), ('2020-02-29', 250.0), ('2020-03-01', 400.0), ('2020-06-15', 800.0)):
+            invoices += self.init_invoice('out_invoice', partner=self.partner_a, invoice_date=invoice_date, amounts=[amount], post=True)
+        options = self._generate_options(self.report, '2020-06-01', '2020-06-30')
+        options = self._update_comparison_filter(options, self.report, 'previous_period', 6)
+        expected_receivables = [
+            sum(invoices.filtered(lambda invoice: invoice.date <= fields.Date.to_date(period_end)).mapped('amount_total'))
+            for period_end in ('2020-06-30', '2020-05-31', '2020-04-30', '2020-03-31', '2020-02-29', '2020-01-31', '2019-12-31')
+        ]
+
+        def get_receivables():
+            report_class = self.env.registry[self.report._name]
+            single_pass = report_class._compute_formula_batch_with_engine_account_codes_for_column_groups
+            with patch.object(report_class, '_compute_formula_batch_with_engine_account_codes_for_column_groups', autospec=True, side_effect=single_pass) as patched:
+                receivables_line = next(line for line in self.report._get_lines(options) if line['name'] == 'Receivables')
+            return [column['no_format'] for column in receivables_line['columns']], patched.call_count
+
+        receivables, single_pass_count = get_receivables()
+        self.assertEqual(receivables, expected_receivables)
+        self.assertEqual(single_pass_count, 0, "All the periods end with closed months, read from the snapshot.")
+
+        self.env['ir.config_parameter'].set_param('account_reports.use_balance_snapshot', False)
+        receivables, single_pass_count = get_receivables()
+        self.assertEqual(receivables, expected_receivables)
+        self.assertTrue(single_pass_count, "Without the snapshot, all the periods are read in a single pass.")
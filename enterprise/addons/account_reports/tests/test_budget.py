@@ -661,3 +661,49 @@ class TestBudgetReport(TestAccountReportsCommon):
                 {'level': 3, 'name': '400000 Product Sales'},
             ]
         )
+
+    def test_report_budget_edited_in_same_transaction(self):
+        """ The budget columns read the budget items directly: editing them is reflected in the next
+        rendering, without creating any table for it.
+        """
+        options = self._generate_options(
+            self.report,
+            '2020-01-01',
+            '2020-12-31',
+            default_options={'budgets': [{'id': self.budget_1.id, 'selected': True}]},
+        )
+        self.assertLinesValues(
+            self.report._get_lines(options),
+            [   0,                                   1,        2],
+            [
+                ('line_domain',                      0,     1110),
+                (self.account_1.display_name,        0,     1000),
+                (self.account_3.display_name,        0,      100),
+                (self.account_4.display_name,        0,       10),
+                ('line_account_codes',               0,     1110),
+                (self.account_1.display_name,        0,     1000),
+                (self.account_3.display_name,        0,      100),
+                (self.account_4.display_name,        0,       10),
+            ],
+            options,
+        )
+
+        self.budget_1.item_ids.filtered(lambda item: item.account_id == self.account_1).amount = 2000
+        self.assertLinesValues(
+            self.report._get_lines(options),
+            [   0,                                   1,        2],
+            [
+                ('line_domain',                      0,     2110),
+                (self.account_1.display_name,        0,     2000),
+                (self.account_3.display_name,        0,      100),
+                (self.account_4.display_name,        0,       10),
+                ('line_account_codes',               0,     2110),
+                (self.account_1.display_name,        0,     2000),
+                (self.account_3.display_name,        0,      100),
+                (self.account_4.display_name,        0,       10),
+            ],
+            options,
+        )
+
+        self.env.cr.execute("SELECT 1 FROM information_schema.tables WHERE table_name = 'account_report_budget_temp_aml'")
+        self.assertFalse(self.env.cr.fetchone())
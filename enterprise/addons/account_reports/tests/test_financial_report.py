@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=C0326
 
+from unittest.mock import patch
+
 from .common import TestAccountReportsCommon
 
 from odoo import fields, Command
@@ -917,3 +919,126 @@ class TestFinancialReport(TestAccountReportsCommon):
 
         self.assertEqual(line_id_1, [('markup1', 'account.account', 5), ('markup2', 'res.partner', 8), ('markup3', None, None)])
         self.assertEqual(line_id_2, [('', 'account.report', 14), ({"groupby_prefix_group": "~"}, 'account.report', 21)])
+
+    def _simulate_commit(self):
+        # Tests never commit: forget about the report data changed by the test transaction, as a commit would
+        self.env.flush_all()
+        self.env.cr.precommit.data.pop('account_report_data_version.bumped', None)
+
+    def _get_lines_counting_computations(self, report, options):
+        report_class = self.env.registry[report._name]
+        compute_single_column_group = report_class._compute_expression_totals_for_single_column_group
+        with patch.object(report_class, '_compute_expression_totals_for_single_column_group', autospec=True, side_effect=compute_single_column_group) as patched:
+            lines = report._get_lines(options)
+        return [(line['name'], [column.get('no_format') for column in line['columns']]) for line in lines], patched.call_count
+
+    def _create_domain_report(self, domain, **report_vals):
+        return self.env['account.report'].create({
+            'name': "Domain report",
+            'filter_date_range': True,
+            **report_vals,
+            'column_ids': [Command.create({'name': "Balance", 'expression_label': 'balance'})],
+            'line_ids': [
+                Command.create({
+                    'name': "Domain line",
+                    'expression_ids': [
+                        Command.create({'label': 'balance', 'engine': 'domain', 'formula': domain, 'subformula': 'sum'}),
+                    ],
+                }),
+            ],
+        })
+
+    def test_expression_totals_cache_reused_until_data_changes(self):
+        report = self.env.ref('account_reports.profit_and_loss')
+        invoice = self.init_invoice('out_invoice', partner=self.partner_a, invoice_date='2020-01-10', amounts=[100.0], post=True)
+        options = self._generate_options(report, '2020-01-01', '2020-12-31')
+        self._simulate_commit()
+
+        lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count)
+
+        cached_lines, call_count = self._get_lines_counting_computations(report, {**options, 'loading_call_number': 2})
+        self.assertEqual(call_count, 0, "Options only impacting the rendering of the lines don't prevent reusing the totals.")
+        self.assertEqual(cached_lines, lines)
+
+        _lines, call_count = self._get_lines_counting_computations(report, self._generate_options(report, '2020-01-01', '2020-06-30'))
+        self.assertTrue(call_count, "Other options need other totals.")
+
+        invoice.narration = "Not part of any report"
+        self._simulate_commit()
+        _lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertEqual(call_count, 0, "Fields of the entries the reports don't use don't invalidate the totals.")
+
+        self.init_invoice('out_invoice', partner=self.partner_a, invoice_date='2020-02-10', amounts=[250.0], post=True)
+        new_lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count, "Totals are never reused by a transaction that changed report data.")
+        self.assertNotEqual(new_lines, lines)
+
+        self._simulate_commit()
+        committed_lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count, "Totals computed before the new invoice was posted are outdated.")
+        self.assertEqual(committed_lines, new_lines)
+
+    def test_expression_totals_cache_invalidated_by_tags(self):
+        tag = self.env['account.account.tag'].create({'name': "Cached tag", 'applicability': 'accounts'})
+        self.company_data['default_account_revenue'].tag_ids = [Command.link(tag.id)]
+        self.init_invoice('out_invoice', partner=self.partner_a, invoice_date='2020-01-10', amounts=[100.0], post=True)
+        report = self._create_domain_report("[('account_id.tag_ids.name', '=', 'Cached tag')]")
+        options = self._generate_options(report, '2020-01-01', '2020-12-31')
+        self._simulate_commit()
+
+        lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count)
+        self.assertEqual(lines[0][1], [-100.0])
+        _lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertEqual(call_count, 0)
+
+        tag.name = "Renamed tag"
+        self._simulate_commit()
+        lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count, "Renaming a tag invalidates the totals of the domains using it.")
+        self.assertEqual(lines[0][1], [0.0])
+
+    def test_expression_totals_cache_partner_fields(self):
+        self.init_invoice('out_invoice', partner=self.partner_a, invoice_date='2020-01-10', amounts=[100.0], post=True)
+        report = self._create_domain_report(
+            "[('partner_id.name', '=', 'partner_a'), ('account_id.account_type', '=', 'income')]"
+        )
+        options = self._generate_options(report, '2020-01-01', '2020-12-31')
+        self._simulate_commit()
+
+        lines, _call_count = self._get_lines_counting_computations(report, options)
+        self.assertEqual(lines[0][1], [-100.0])
+
+        self.partner_a.name = "partner_a renamed"
+        self._simulate_commit()
+        lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count, "Partners are not versioned: totals depending on their fields are never cached.")
+        self.assertEqual(lines[0][1], [0.0])
+
+        partner_category = self.env['res.partner.category'].create({'name': "Cached category"})
+        self.partner_a.category_id = [Command.link(partner_category.id)]
+        report = self._create_domain_report("[('account_id.account_type', '=', 'income')]", filter_partner=True)
+        options = self._generate_options(report, '2020-01-01', '2020-12-31', {'partner_categories': partner_category.ids})
+        self._simulate_commit()
+
+        lines, _call_count = self._get_lines_counting_computations(report, options)
+        self.assertEqual(lines[0][1], [-100.0])
+
+        self.partner_a.category_id = [Command.unlink(partner_category.id)]
+        self._simulate_commit()
+        lines, call_count = self._get_lines_counting_computations(report, options)
+        self.assertTrue(call_count, "Neither are the totals filtered on partner categories.")
+        self.assertEqual(lines[0][1], [0.0])
+
+    def test_column_groups_single_pass_only_differing_by_dates(self):
+        report = self.env.ref('account_reports.profit_and_loss')
+        options = self._generate_options(report, '2020-01-01', '2020-12-31')
+        options = self._update_comparison_filter(options, report, 'previous_period', 1)
+        options_per_group = report._split_options_per_column_group(options)
+        self.assertTrue(report._can_compute_column_groups_in_single_pass(options_per_group))
+
+        first_group_key = next(iter(options_per_group))
+        options_per_group[first_group_key] = {**options_per_group[first_group_key], 'forced_domain': [('partner_id', '=', self.partner_a.id)]}
+        self.assertFalse(report._can_compute_column_groups_in_single_pass(options_per_group))
+        self.assertFalse(report._can_compute_column_groups_in_single_pass(report._split_options_per_column_group(options), limit=80))
@@ -8,6 +8,7 @@ from odoo.tests import tagged
 from freezegun import freeze_time
 
 import json
+from unittest.mock import patch
 
 @tagged('post_install', '-at_install')
 class TestGeneralLedgerReport(TestAccountReportsCommon, odoo.tests.HttpCase):
@@ -684,3 +685,62 @@ class TestGeneralLedgerReport(TestAccountReportsCommon, odoo.tests.HttpCase):
             ],
             options
         )
+
+    def _get_xlsx_streamed_lines(self, options, batch_size):
+        report_class = self.env.registry[self.report._name]
+        stream_query_results = report_class._stream_query_results
+        with patch.object(
+            report_class, '_stream_query_results', autospec=True,
+            side_effect=lambda report, query, **kwargs: stream_query_results(report, query, batch_size=batch_size),
+        ) as patched:
+            _folded_lines, lines = self.report._get_xlsx_lines_stream(options)
+            lines = list(lines)
+        return lines, patched.call_count
+
+    def test_general_ledger_xlsx_streamed_lines(self):
+        """ The move lines of the unfolded accounts are fetched by batches, the running balance carrying over from one to the next. """
+        self.env.companies = self.env.company
+        self.report.load_more_limit = 2
+        options = self._generate_options(self.report, '2017-01-01', '2017-12-31', default_options={'unfold_all': True})
+
+        lines, streamed_queries_count = self._get_xlsx_streamed_lines(options, batch_size=2)
+        self.assertEqual(streamed_queries_count, 3, "One query per unfoldable account.")
+        self.assertLinesValues(
+            lines,
+            #   Name                                    Debit           Credit          Balance
+            [   0,                                      4,              5,              6],
+            [
+                ('121000 Account Receivable',           1000.0,         0.0,            1000.0),
+                ('INV/2017/00001',                      1000.0,         0.0,            1000.0),
+                ('Total 121000 Account Receivable',     1000.0,         0.0,            1000.0),
+                ('211000 Account Payable',              100.0,          0.0,            100.0),
+                ('400000 Product Sales',                20000.0,        0.0,            20000.0),
+                ('INV/2017/00001',                      2000.0,         0.0,            2000.0),
+                ('INV/2017/00001',                      3000.0,         0.0,            5000.0),
+                ('INV/2017/00001',                      4000.0,         0.0,            9000.0),
+                ('INV/2017/00001',                      5000.0,         0.0,            14000.0),
+                ('INV/2017/00001',                      6000.0,         0.0,            20000.0),
+                ('Total 400000 Product Sales',          20000.0,        0.0,            20000.0),
+                ('600000 Expenses',                     0.0,            21000.0,        -21000.0),
+                ('INV/2017/00001',                      0.0,            6000.0,         -6000.0),
+                ('INV/2017/00001',                      0.0,            7000.0,         -13000.0),
+                ('INV/2017/00001',                      0.0,            8000.0,         -21000.0),
+                ('Total 600000 Expenses',               0.0,            21000.0,        -21000.0),
+                ('999999 Undistributed Profits/Losses', 200.0,          300.0,          -100.0),
+                ('Total',                               21300.0,        21300.0,        0.0),
+            ],
+            options,
+        )
+
+    def test_general_ledger_xlsx_not_streamed(self):
+        options = self._generate_options(self.report, '2017-01-01', '2017-12-31')
+        self.assertIsNone(self.report._get_xlsx_lines_stream(options), "Folded lines are exported as displayed.")
+
+        options = self._generate_options(self.report, '2017-01-01', '2017-12-31', default_options={'unfold_all': True})
+        self.assertIsNone(self.report._get_xlsx_lines_stream({**options, 'order_column': {'expression_label': 'balance', 'direction': 'ASC'}}))
+        options = self._update_comparison_filter(options, self.report, 'previous_period', 1)
+        self.assertIsNone(self.report._get_xlsx_lines_stream(options), "The move lines of several periods are merged together.")
+
+        balance_sheet = self.env.ref('account_reports.balance_sheet')
+        options = self._generate_options(balance_sheet, '2017-01-01', '2017-12-31', default_options={'unfold_all': True})
+        self.assertIsNone(balance_sheet._get_xlsx_lines_stream(options), "Reports without a streaming custom handler are never streamed.")
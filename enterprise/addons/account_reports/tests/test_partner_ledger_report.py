@@ -5,6 +5,7 @@ from odoo import Command, fields
 from odoo.tests import tagged
 
 import json
+from unittest.mock import patch
 
 
 @tagged('post_install', '-at_install')
@@ -660,3 +661,38 @@ class TestPartnerLedgerReport(TestAccountReportsCommon):
             ],
             options,
         )
+
+    def test_partner_ledger_xlsx_streamed_lines(self):
+        """ The move lines of the unfolded partners are fetched by batches, after their initial balance. """
+        self.report.load_more_limit = 2
+        options = self._generate_options(self.report, '2017-01-01', '2017-12-31', default_options={
+            'unfold_all': True,
+            'partner_ids': self.partner_a.ids,
+        })
+
+        report_class = self.env.registry[self.report._name]
+        stream_query_results = report_class._stream_query_results
+        with patch.object(
+            report_class, '_stream_query_results', autospec=True,
+            side_effect=lambda report, query, **kwargs: stream_query_results(report, query, batch_size=2),
+        ):
+            _folded_lines, lines = self.report._get_xlsx_lines_stream(options)
+            lines = list(lines)
+
+        self.assertLinesValues(
+            lines,
+            #   Name                                    Debit           Credit          Balance
+            [   0,                                      6,              7,              9],
+            [
+                ('partner_a',                           20133.33,       0.0,            20133.33),
+                ('Initial Balance',                     133.33,         0.0,            133.33),
+                ('MISC/2017/01/0001 2017_1_2',          2000.0,         0.0,            2133.33),
+                ('MISC/2017/01/0001 2017_1_3',          3000.0,         0.0,            5133.33),
+                ('MISC/2017/01/0001 2017_1_4',          4000.0,         0.0,            9133.33),
+                ('MISC/2017/01/0001 2017_1_5',          5000.0,         0.0,            14133.33),
+                ('MISC/2017/01/0001 2017_1_6',          6000.0,         0.0,            20133.33),
+                ('Total partner_a',                     20133.33,       0.0,            20133.33),
+                ('Total',                               20133.33,       0.0,            20133.33),
+            ],
+            options,
+        )
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+import threading
+import time
+from unittest.mock import patch
+
+from .common import TestAccountReportsCommon
+
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPdfExportBatch(TestAccountReportsCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner_c = cls.env['res.partner'].create({'name': 'partner_c'})
+        cls.partners = cls.partner_a + cls.partner_b + cls.partner_c
+        for partner in cls.partners:
+            cls.init_invoice('out_invoice', partner=partner, invoice_date='2020-01-10', amounts=[100.0], post=True)
+        cls.report = cls.env.ref('account_reports.partner_ledger_report')
+
+    def _patch_run_wkhtmltopdf(self):
+        # Return the html of the bodies instead of running wkhtmltopdf
+        return patch.object(
+            self.env.registry['ir.actions.report'],
+            '_run_wkhtmltopdf',
+            autospec=True,
+            side_effect=lambda _self, bodies, **kwargs: ''.join(bodies).encode(),
+        )
+
+    def test_partner_statements_generated_together(self):
+        options = self._generate_options(self.report, '2020-01-01', '2020-12-31')
+        with self._patch_run_wkhtmltopdf() as patched:
+            attachments = self.partners._get_partners_account_report_attachments(self.report, options)
+
+        self.assertEqual(patched.call_count, 3)
+        for partner in self.partners:
+            content = attachments[partner].raw.decode()
+            self.assertEqual(attachments[partner].res_id, partner.id)
+            for other_partner in self.partners:
+                self.assertEqual(other_partner.name in content, other_partner == partner)
+
+    def test_cron_send_by_batch(self):
+        self.report.send_and_print_values = {
+            'mail_template_id': False,
+            'checkbox_download': False,
+            'checkbox_send_mail': False,
+            'report_options': {**self._generate_options(self.report, '2020-01-01', '2020-12-31'), 'partner_ids': self.partners.ids},
+        }
+
+        report_class = self.env.registry['account.report']
+        export_to_pdf_batch = report_class._export_to_pdf_batch
+        with self._patch_run_wkhtmltopdf(), \
+             patch.object(report_class, '_export_to_pdf_batch', autospec=True, side_effect=export_to_pdf_batch) as patched:
+            self.env['account.report']._cron_account_report_send(job_count=2)
+
+        self.assertEqual(patched.call_count, 1, "All the partners processed by a cron run are exported together.")
+        self.assertEqual(len(patched.call_args.args[1]), 2)
+        self.assertEqual(self.report.send_and_print_values['report_options']['partner_ids'], self.partner_c.ids)
+
+    def test_send_and_print_by_chunks(self):
+        """ The statements are rendered, attached and posted by chunks, each partner only receiving its own statement. """
+        self.env['ir.config_parameter'].set_param('account_reports.pdf_export_batch_size', 2)
+        self.partner_a.email = 'partner_a@example.com'
+        self.partner_b.email = 'partner_b@example.com'
+        self.partner_c.email = 'partner_c@example.com'
+        self.report.send_and_print_values = {
+            'mail_template_id': self.env.ref('account_reports.email_template_customer_statement').id,
+            'checkbox_download': False,
+            'checkbox_send_mail': True,
+            'report_options': {**self._generate_options(self.report, '2020-01-01', '2020-12-31'), 'partner_ids': self.partners.ids},
+        }
+
+        report_class = self.env.registry['account.report']
+        export_to_pdf_batch = report_class._export_to_pdf_batch
+        with self._patch_run_wkhtmltopdf(), \
+             patch.object(report_class, '_export_to_pdf_batch', autospec=True, side_effect=export_to_pdf_batch) as patched:
+            self.env['account.report']._cron_account_report_send(job_count=100)
+
+        self.assertEqual([len(call.args[1]) for call in patched.call_args_list], [2, 1])
+        self.assertFalse(self.report.send_and_print_values)
+        for partner in self.partners:
+            message = self.env['mail.message'].search([('model', '=', 'res.partner'), ('res_id', '=', partner.id)], order='id desc', limit=1)
+            self.assertEqual(message.partner_ids, partner)
+            content = message.attachment_ids.raw.decode()
+            for other_partner in self.partners:
+                self.assertEqual(other_partner.name in content, other_partner == partner)
+
+    def test_run_wkhtmltopdf_batch_thread_pool(self):
+        """ Outside of tests, the wkhtmltopdf jobs run in a pool of account_reports.pdf_export_workers threads, results keeping their order. """
+        self.env['ir.config_parameter'].set_param('account_reports.pdf_export_workers', 2)
+        running_lock = threading.Lock()
+        running = {'now': 0, 'max': 0, 'threads': set()}
+
+        def run_wkhtmltopdf(_self, bodies, **kwargs):
+            with running_lock:
+                running['now'] += 1
+                running['max'] = max(running['max'], running['now'])
+                running['threads'].add(threading.get_ident())
+            time.sleep(0.1)
+            with running_lock:
+                running['now'] -= 1
+            return ''.join(bodies).encode()
+
+        jobs = [{'bodies': [f'job {i}'], 'landscape': False} for i in range(5)]
+        with patch.object(type(self.env.registry), 'in_test_mode', return_value=False), \
+             patch.object(self.env.registry['ir.actions.report'], '_run_wkhtmltopdf', autospec=True, side_effect=run_wkhtmltopdf):
+            results = self.env['account.report']._run_wkhtmltopdf_batch(jobs)
+
+        self.assertEqual(results, [f'job {i}'.encode() for i in range(5)])
+        self.assertEqual(running['max'], 2, "The jobs run concurrently, without exceeding the number of workers.")
+        self.assertNotIn(threading.get_ident(), running['threads'])
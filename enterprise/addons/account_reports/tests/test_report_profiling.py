@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+from .common import TestAccountReportsCommon
+
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestReportProfiling(TestAccountReportsCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.init_invoice('out_invoice', partner=cls.partner_a, invoice_date='2020-01-10', amounts=[100.0], post=True)
+        cls.env.user.groups_id += cls.env.ref('base.group_no_one')
+
+    def _get_all_steps(self, steps):
+        for step in steps:
+            yield step
+            yield from self._get_all_steps(step['steps'])
+
+    def test_profiled_report_information(self):
+        report = self.env.ref('account_reports.general_ledger_report')
+        options = self._generate_options(report, '2020-01-01', '2020-12-31', default_options={'profiling': True, 'unfold_all': True})
+        self.assertTrue(options['profiling'])
+
+        with self.assertLogs('odoo.addons.account_reports.models.account_report', level='INFO') as logs:
+            report_information = report.get_report_information(options)
+
+        [root_step] = report_information['profiling']
+        self.assertEqual(root_step['name'], 'get_report_information')
+        self.assertEqual(root_step['calls'], 1)
+        self.assertTrue(root_step['query_count'])
+        self.assertTrue({
+            '_dynamic_lines_generator',
+            '_custom_unfold_all_batch_data_generator',
+            '_report_expand_unfoldable_line_general_ledger',
+        } <= {step['name'] for step in self._get_all_steps(root_step['steps'])})
+        self.assertIn("get_report_information (report=General Ledger)", logs.output[0])
+
+        self.assertEqual(report.get_report_information({**options, 'profiling': False}).keys(), report_information.keys() - {'profiling'})
+
+    def test_profiled_engines(self):
+        report = self.env.ref('account_reports.profit_and_loss')
+        options = self._generate_options(report, '2020-01-01', '2020-12-31', default_options={'profiling': True})
+        options['unfolded_lines'] = [self._get_basic_line_dict_id_from_report_line_ref('account_reports.account_financial_report_revenue0')]
+        report_information = report.get_report_information(options)
+
+        engine_steps = [
+            step
+            for step in self._get_all_steps(report_information['profiling'])
+            if step['name'].startswith('_compute_formula_batch_with_engine_')
+        ]
+        self.assertTrue(engine_steps)
+        self.assertTrue(all('rows' in step for step in engine_steps))
+
+    def test_profiling_only_in_debug_mode(self):
+        self.env.user.groups_id -= self.env.ref('base.group_no_one')
+        report = self.env.ref('account_reports.general_ledger_report')
+        options = self._generate_options(report, '2020-01-01', '2020-12-31', default_options={'profiling': True})
+        self.assertNotIn('profiling', options)
+        self.assertNotIn('profiling', report.get_report_information(options))
@@ -1,6 +1,7 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
 from . import account_change_lock_date
+from . import account_merge_wizard
 from . import account_report_send
 from . import account_report_file_download_error_wizard
 from . import fiscal_year
@@ -0,0 +1,19 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+from odoo import models
+
+
+class AccountMergeWizard(models.TransientModel):
+    _inherit = 'account.merge.wizard'
+
+    def action_merge(self):
+        # Merging rewrites the account of every table referencing the merged accounts in raw SQL, which would collide on the
+        # buckets of account.report.balance.snapshot (or drop them). Take them out of the way and rebuild them afterwards.
+        snapshot = self.env['account.report.balance.snapshot'].sudo()
+        merged_snapshot = snapshot.search([('account_id', 'in', self.account_ids.ids)])
+        companies = merged_snapshot.company_id
+        merged_snapshot.unlink()
+        res = super().action_merge()
+        if companies:
+            snapshot._rebuild(companies)
+        return res
@@ -1,5 +1,6 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import split_every
 from odoo.tools.misc import get_lang
 
 
@@ -221,9 +222,11 @@ class AccountReportSend(models.TransientModel):
         }
 
     def _process_send_and_print(self, report, options, recipient_partner_ids=None, wizard=None):
-        """ Generate a report for one partner based on the options (send_and_print_values stored on the report).
-        :param options: dict of report options (should contain one partner id in options['partner_ids'])
-        :param recipient_partner_ids: list of partner ids that will receive the mail message.
+        """ Generate a report for each partner of options['partner_ids'] based on the options (send_and_print_values stored on the report).
+        The pdf files of the partners are generated together, by chunks of account_reports.pdf_export_batch_size partners: each chunk is
+        rendered, attached and posted before the next one, so that only the html and pdf files of one chunk are held in memory.
+        :param options: dict of report options
+        :param recipient_partner_ids: list of partner ids that will receive the mail message (by default, the partner itself if it has an email).
         :param wizard: account.report.send wizard if exists. Indicates if sending by cron.
         """
         wizard_vals = report.send_and_print_values if not wizard else wizard._get_wizard_values()
@@ -240,33 +243,38 @@ class AccountReportSend(models.TransientModel):
 
         partner_ids = options.get('partner_ids', [])
         partners = self.env['res.partner'].browse(partner_ids)
-        if not recipient_partner_ids:
-            recipient_partner_ids = partners.filtered('email').ids
 
         downloadable_attachments = self.env['ir.attachment']
-
-        for partner in partners:
-            options['partner_ids'] = partner.ids
-            report_attachment = partner._get_partner_account_report_attachment(report, options)
-
-            if to_email and recipient_partner_ids:
-                if wizard and wizard.mode == 'single':
-                    subject = self.mail_subject
-                    body = self.mail_body
-                else:
-                    subject = self._get_mail_field_value(partner, mail_template_id, partner.lang, 'subject')
-                    body = self._get_mail_field_value(partner, mail_template_id, partner.lang, 'body_html', options={'post_process': True})
-
-                partner.message_post(
-                    body=body,
-                    subject=subject,
-                    partner_ids=recipient_partner_ids,
-                    attachment_ids=attachments_ids + report_attachment.ids,
-                    email_add_signature=False,
-                )
-
-            if to_download:
-                downloadable_attachments += report_attachment
+        batch_size = int(self.env['ir.config_parameter'].sudo().get_param('account_reports.pdf_export_batch_size', 20))
+        for partners_batch in split_every(max(batch_size, 1), partners.ids, partners.browse):
+            report_attachments = partners_batch._get_partners_account_report_attachments(report, options)
+
+            for partner in partners_batch:
+                report_attachment = report_attachments[partner]
+                # Without explicit recipients, a statement is only ever sent to the partner it is about
+                partner_recipient_ids = recipient_partner_ids or partner.filtered('email').ids
+
+                if to_email and partner_recipient_ids:
+                    if wizard and wizard.mode == 'single':
+                        subject = self.mail_subject
+                        body = self.mail_body
+                    else:
+                        subject = self._get_mail_field_value(partner, mail_template_id, partner.lang, 'subject')
+                        body = self._get_mail_field_value(partner, mail_template_id, partner.lang, 'body_html', options={'post_process': True})
+
+                    partner.message_post(
+                        body=body,
+                        subject=subject,
+                        partner_ids=partner_recipient_ids,
+                        attachment_ids=attachments_ids + report_attachment.ids,
+                        email_add_signature=False,
+                    )
+
+                if to_download:
+                    downloadable_attachments += report_attachment
+
+            # The content of the attachments is in the filestore: don't keep it in the cache until the last chunk is done
+            self.env['ir.attachment'].union(*report_attachments.values()).invalidate_recordset(['raw', 'datas'])
 
         if downloadable_attachments:
             return self._action_download(downloadable_attachments)
@@ -4,6 +4,7 @@ import base64
 import io
 import json
 import logging
+import os
 import pathlib
 import zipfile
 from collections import defaultdict
@@ -24,6 +25,33 @@ from odoo.addons.mail.controllers.attachment import AttachmentController
 
 logger = logging.getLogger(__name__)
 
+ZIP_STREAM_CHUNK_SIZE = 1 << 16  # 64 KiB
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """
+    Unseekable file object collecting what :class:`zipfile.ZipFile`
+    writes, so that the archive can be sent while it is being written.
+    As it cannot seek back, ``zipfile`` writes the sizes and checksum
+    of each entry in a data descriptor after its content.
+    """
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop_data(self):
+        """ Get and forget what was written since the last call. """
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
 
 class ShareRoute(http.Controller):
 
@@ -146,9 +174,21 @@ class ShareRoute(http.Controller):
 
     def _make_zip(self, name, documents):
         """
-        Create a zip file in memory out of the given ``documents``,
-        recursively exploring the folders, get an HTTP response to
-        download that zip file.
+        Get an HTTP response to download a zip file made out of the
+        given ``documents``, recursively exploring the folders.
+
+        The zip file is written on-the-fly while it is sent. The files
+        of the filestore are read one chunk at a time, so that the
+        memory used doesn't depend on their size. The zip file is
+        written after the request cursor is closed: the files stored
+        in the database (``ir_attachment.location`` set to ``db``) are
+        loaded while the documents are explored, and all their content
+        is held in memory until the download ends.
+
+        The files of the filestore are checked before the response is
+        returned, so that a missing file fails the request instead of
+        truncating the zip file. Only a file removed during the
+        download still truncates it.
 
         :param str name: the name to give to the zip file
         :param odoo.models.Model documents: documents to load in the ZIP
@@ -156,7 +196,7 @@ class ShareRoute(http.Controller):
         """
         class Item(NamedTuple):
             path: str
-            content: str
+            stream: http.Stream | None  # None for folders
 
         seen_folders = set()  # because of shortcuts, we can have loops
         # many documents can have the same name
@@ -178,12 +218,15 @@ class ShareRoute(http.Controller):
             if document.type == 'folder':
                 # it is the ending slash that makes it appears as a
                 # folder inside the zip file.
-                return Item(unique(f'{folder.path}{document.name}') + '/', '')
+                return Item(unique(f'{folder.path}{document.name}') + '/', None)
             try:
                 stream = self._documents_content_stream(document.shortcut_document_id or document)
             except (ValueError, MissingError):
                 return None  # skip
-            return Item(unique(f'{folder.path}{stream.download_name}'), stream.read())
+            if stream.type == 'path':
+                # raises now rather than in the middle of the download
+                os.stat(stream.path)
+            return Item(unique(f'{folder.path}{stream.download_name}'), stream)
 
         def generate_zip_items(documents_sudo, folder):
             documents_sudo = documents_sudo.sorted(lambda d: d.id)
@@ -203,26 +246,57 @@ class ShareRoute(http.Controller):
                 for sub_document_sudo in self._get_folder_children(folder_sudo):
                     yield from generate_zip_items(sub_document_sudo, sub_folder)
 
-        # TODO: zip on-the-fly while streaming instead of loading the
-        #       entire zip in memory and sending it all at once.
-
-        stream = io.BytesIO()
-        root_folder = Item('', '')
-        try:
-            with zipfile.ZipFile(stream, 'w') as doc_zip:
-                for (path, content) in generate_zip_items(documents, root_folder):
-                    doc_zip.writestr(path, content, compress_type=zipfile.ZIP_DEFLATED)
-        except zipfile.BadZipfile:
-            logger.exception("BadZipfile exception")
+        def generate_zip_content(items):
+            buffer = ZipStreamBuffer()
+            try:
+                with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as doc_zip:
+                    for (path, stream) in items:
+                        if stream is None:
+                            doc_zip.writestr(path, '')
+                            continue
+                        # the size of the file is needed to know whether it
+                        # requires the ZIP64 extensions (compressed or not)
+                        force_zip64 = stream.size is None or stream.size > zipfile.ZIP64_LIMIT // 2
+                        with doc_zip.open(path, 'w', force_zip64=force_zip64) as zip_entry:
+                            for chunk in self._iter_stream_chunks(stream):
+                                zip_entry.write(chunk)
+                                if data := buffer.pop_data():
+                                    yield data
+                        if data := buffer.pop_data():
+                            yield data
+            except zipfile.BadZipfile:
+                logger.exception("BadZipfile exception")
+            if data := buffer.pop_data():
+                yield data
+
+        # The documents are explored and their streams are resolved right
+        # away: the zip content is generated after the request cursor is
+        # closed, it only reads the files of the filestore (the streams
+        # of the files stored in the database hold their content).
+        root_folder = Item('', None)
+        items = list(generate_zip_items(documents, root_folder))
 
-        content = stream.getvalue()
         headers = [
             ('Content-Type', 'zip'),
             ('X-Content-Type-Options', 'nosniff'),
-            ('Content-Length', len(content)),
             ('Content-Disposition', content_disposition(name))
         ]
-        return request.make_response(content, headers)
+        return request.make_response(generate_zip_content(items), headers)
+
+    @staticmethod
+    def _iter_stream_chunks(stream):
+        """
+        Read the content of ``stream`` by chunks, straight from the
+        filestore when the file is stored there.
+
+        :param odoo.http.Stream stream: the stream of a document
+        """
+        if stream.type == 'path':
+            with open(stream.path, 'rb') as file:
+                while chunk := file.read(ZIP_STREAM_CHUNK_SIZE):
+                    yield chunk
+        else:
+            yield stream.read()
 
     # Download & upload routes #####################################################################
     @http.route('/documents/pdf_split', type='http', methods=['POST'], auth="user")
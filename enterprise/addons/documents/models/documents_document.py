@@ -8,6 +8,7 @@ import re
 import uuid
 from ast import literal_eval
 from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from dateutil.relativedelta import relativedelta
@@ -27,6 +28,19 @@ from odoo.addons.mail.tools import link_preview
 
 _logger = logging.getLogger(__name__)
 
+# Above this number of images uploaded together, their thumbnails are generated in the background (see _cron_generate_thumbnails)
+THUMBNAIL_INLINE_LIMIT = 5
+THUMBNAIL_CRON_BATCH_SIZE = 100
+THUMBNAIL_WORKERS = 4
+
+
+def _make_thumbnail(raw):
+    """ Thumbnail of the image ``raw``, base64-encoded, or ``False`` if it can't be processed. """
+    try:
+        return base64.b64encode(image_process(raw, size=(200, 140), crop='center'))
+    except (UserError, TypeError):
+        return False
+
 
 def _sanitize_file_extension(extension):
     """ Remove leading and trailing spacing + Remove leading "." """
@@ -77,6 +91,7 @@ class Document(models.Model):
             ('present', 'Present'),  # Document has a thumbnail
             ('error', 'Error'),  # Error when generating the thumbnail
             ('client_generated', 'Client Generated'),  # The PDF thumbnail is generated by the user browser
+            ('pending', 'Pending'),  # The image thumbnail is being generated in the background
             ('restricted', 'Inaccessible'),  # Shortcut to no-permission source
         ], compute="_compute_thumbnail", store=True, readonly=False, recursive=True,
     )
@@ -186,6 +201,18 @@ class Document(models.Model):
                      indexname='documents_document_res_model_res_id_idx',
                      tablename=self._table,
                      expressions=['res_model', 'res_id'])
+        # parents whose permission is checked when searching on user_permission
+        create_index(self.env.cr,
+                     indexname='documents_document_folder_idx',
+                     tablename=self._table,
+                     expressions=['id'],
+                     where="type = 'folder'")
+        # queue of the thumbnails generated in the background
+        create_index(self.env.cr,
+                     indexname='documents_document_thumbnail_pending_idx',
+                     tablename=self._table,
+                     expressions=['id'],
+                     where="thumbnail_status = 'pending'")
 
     @api.depends('document_token')
     def _compute_access_token(self):
@@ -456,12 +483,14 @@ class Document(models.Model):
                 internal_domain = [('access_internal', 'in', ('view', 'edit'))]
             direct_domain = expression.OR([direct_domain, expression.AND([internal_domain, allowed_or_no_company])])
 
-        # Look one level up for links unless hidden
+        # Look one level up for links unless hidden.
+        # Only folders can be parents: searching among them only keeps the sub-query small, as the direct
+        # domain matches most documents for internal users.
         link_via_parent_domain = expression.AND([
             any_except_disabled_company,
             [('access_via_link', 'in', searched_roles)],
             [('is_access_via_link_hidden', '=', False)],
-            [('folder_id', 'any', direct_domain)],
+            [('folder_id', 'any', expression.AND([[('type', '=', 'folder')], direct_domain]))],
         ])
 
         return expression.OR([direct_domain, link_via_parent_domain])
@@ -506,6 +535,11 @@ class Document(models.Model):
     @api.depends('checksum', 'shortcut_document_id.thumbnail', 'shortcut_document_id.thumbnail_status',
                  'shortcut_document_id.user_permission')
     def _compute_thumbnail(self):
+        image_documents = self.filtered(
+            lambda d: not d.shortcut_document_id and d.mimetype and d.mimetype.startswith('image/'))
+        defer_images = len(image_documents) > THUMBNAIL_INLINE_LIMIT
+        if defer_images and (cron := self.env.ref('documents.ir_cron_generate_thumbnails', raise_if_not_found=False)):
+            cron._trigger()
         for document in self:
             if document.shortcut_document_id:
                 if document.shortcut_document_id.user_permission != 'none':
@@ -518,13 +552,13 @@ class Document(models.Model):
                 # Thumbnails of pdfs are generated by the client. To force the generation, we invalidate the thumbnail.
                 document.thumbnail = False
                 document.thumbnail_status = 'client_generated'
-            elif document.mimetype and document.mimetype.startswith('image/'):
-                try:
-                    document.thumbnail = base64.b64encode(image_process(document.raw, size=(200, 140), crop='center'))
-                    document.thumbnail_status = 'present'
-                except (UserError, TypeError):
-                    document.thumbnail = False
-                    document.thumbnail_status = 'error'
+            elif document in image_documents and defer_images:
+                # Bulk upload: don't make the upload wait for all the thumbnails
+                document.thumbnail = False
+                document.thumbnail_status = 'pending'
+            elif document in image_documents:
+                document.thumbnail = _make_thumbnail(document.raw)
+                document.thumbnail_status = 'present' if document.thumbnail else 'error'
             else:
                 document.thumbnail = False
                 document.thumbnail_status = False
@@ -2242,6 +2276,30 @@ class Document(models.Model):
             shortcuts_as_owner = shortcuts.with_user(owner).with_context(allowed_company_ids=owner.company_ids.ids)
             shortcuts_as_owner.sudo().filtered(lambda d: d.shortcut_document_id.user_permission == 'none').unlink()
 
+    @api.model
+    def _cron_generate_thumbnails(self, batch_size=THUMBNAIL_CRON_BATCH_SIZE):
+        """Generate the pending thumbnails of images uploaded in bulk (see _compute_thumbnail).
+
+        The images of a batch are processed in parallel by a pool of threads,
+        the image processing releasing the GIL. The images in the trash are
+        processed too, they can still be restored. The shortcuts follow the
+        thumbnail of their target.
+        """
+        Document = self.with_context(active_test=False)
+        domain = [('thumbnail_status', '=', 'pending'), ('shortcut_document_id', '=', False)]
+        documents = Document.search(domain, limit=batch_size)
+        raws = [document.raw for document in documents]
+        with ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS) as executor:
+            thumbnails = list(executor.map(_make_thumbnail, raws))
+        for document, thumbnail in zip(documents, thumbnails):
+            document.write({
+                'thumbnail': thumbnail,
+                'thumbnail_status': 'present' if thumbnail else 'error',
+            })
+
+        remaining = Document.search_count(domain) if len(documents) == batch_size else 0
+        self.env['ir.cron']._notify_progress(done=len(documents), remaining=remaining)
+
     @api.autovacuum
     def _gc_clear_bin(self):
         """Files are deleted automatically from the trash bin after the configured remaining days."""
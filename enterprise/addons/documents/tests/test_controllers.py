@@ -1,5 +1,7 @@
 import base64
 import json
+import os
+import pathlib
 import zipfile
 from base64 import b64decode, b64encode
 from datetime import timedelta
@@ -821,6 +823,56 @@ class TestDocumentsControllers(HttpCaseWithUserDemo):
             self.assertEqual(reszip.namelist(), ['public-file.png'])
             self.assertEqual(reszip.read('public-file.png'), self.doc_icon)
 
+    def test_doc_ctrl_zip_streamed(self):
+        # larger than a chunk
+        big_content = bytes(range(256)) * 1024
+        big_file = self.env['documents.document'].create({
+            'type': 'binary',
+            'name': "big-file.bin",
+            'access_internal': 'view',
+            'folder_id': self.internal_folder.id,
+            'raw': big_content,
+        })
+
+        self.authenticate('demo', 'demo')
+        res = self.url_open('/documents/zip?' + urlencode({
+            'zip_name': 'file.zip',
+            'file_ids': f'{big_file.id},{self.internal_file.id},{self.internal_folder.id}',
+        }))
+        res.raise_for_status()
+        self.assertNotIn('Content-Length', res.headers, "the zip file is sent while it is written")
+        with BytesIO(res.content) as resfile, zipfile.ZipFile(resfile) as reszip:
+            self.assertEqual(reszip.read('big-file.bin'), big_content)
+            self.assertEqual(reszip.read('internal-file.png'), self.doc_icon)
+            self.assertIn(f'{self.internal_folder.name}/big-file.bin', reszip.namelist())
+            self.assertTrue(all(info.flag_bits & 0x08 for info in reszip.infolist() if not info.is_dir()),
+                            "the sizes of the files are written after their content")
+
+    def test_doc_ctrl_zip_missing_file(self):
+        lost_file = self.env['documents.document'].create({
+            'type': 'binary',
+            'name': "lost-file.bin",
+            'access_internal': 'view',
+            'folder_id': self.internal_folder.id,
+            'raw': b'content of a file lost from the filestore',
+        })
+        attachment = lost_file.attachment_id
+        if not attachment.store_fname:
+            self.skipTest("the attachments are not stored in the filestore")
+        file_path = attachment._full_path(attachment.store_fname)
+        with open(file_path, 'rb') as file:
+            file_content = file.read()
+        os.remove(file_path)
+        self.addCleanup(lambda: pathlib.Path(file_path).write_bytes(file_content))
+
+        self.authenticate('demo', 'demo')
+        with mute_logger('odoo.http'):
+            res = self.url_open('/documents/zip?' + urlencode({
+                'zip_name': 'file.zip',
+                'file_ids': f'{self.internal_file.id},{lost_file.id}',
+            }))
+        self.assertEqual(res.status_code, 500, "the request fails before the zip file is sent, not in the middle of it")
+
     def test_web_ctrl_documents(self):
         public_url = f'/web/content/documents.document/{self.public_file.id}/raw'
         internal_url = f'/web/content/documents.document/{self.internal_file.id}/raw'
@@ -505,6 +505,41 @@ class TestCaseDocuments(TransactionCaseDocuments):
                 self.assertEqual(image_document.thumbnail, GIF)
                 self.assertEqual(image_document.thumbnail_status, 'present')
 
+    def test_document_thumbnail_bulk_upload(self):
+        image_documents = self.env['documents.document'].create([{
+            'name': f'Test image doc {i}.gif',
+            'mimetype': 'image/gif',
+            'datas': GIF,
+            'folder_id': self.folder_b.id,
+        } for i in range(10)])
+        self.assertEqual(set(image_documents.mapped('thumbnail_status')), {'pending'})
+        self.assertFalse(any(image_documents.mapped('thumbnail')))
+
+        self.env['documents.document']._cron_generate_thumbnails(batch_size=6)
+        self.assertEqual(image_documents.mapped('thumbnail_status').count('present'), 6)
+
+        self.env['documents.document']._cron_generate_thumbnails(batch_size=6)
+        self.assertEqual(set(image_documents.mapped('thumbnail_status')), {'present'})
+        self.assertEqual(set(image_documents.mapped('thumbnail')), {GIF})
+
+    def test_document_thumbnail_bulk_upload_trash_and_shortcuts(self):
+        image_documents = self.env['documents.document'].create([{
+            'name': f'Test image doc {i}.gif',
+            'mimetype': 'image/gif',
+            'datas': GIF,
+            'folder_id': self.folder_b.id,
+        } for i in range(10)])
+        shortcut = image_documents[0].action_create_shortcut(self.folder_a.id)
+        self.assertEqual(shortcut.thumbnail_status, 'pending')
+        image_documents[1:3].action_archive()
+        self.assertFalse(any(image_documents[1:3].mapped('active')))
+
+        self.env['documents.document']._cron_generate_thumbnails(batch_size=10)
+        self.assertEqual(set(image_documents.mapped('thumbnail_status')), {'present'},
+                         "The archived images get their thumbnail too")
+        self.assertEqual(shortcut.thumbnail_status, 'present', "The shortcut follows its target")
+        self.assertEqual(shortcut.thumbnail, GIF)
+
     def test_document_max_upload_limit(self):
         Doc = self.env['documents.document']
         ICP = self.env['ir.config_parameter']
@@ -17,7 +17,7 @@ from odoo.exceptions import AccessError, ValidationError, UserError
 from odoo.osv import expression
 from odoo.tools import get_lang, is_html_empty, OrderedSet
 from odoo.tools.translate import html_translate
-from odoo.tools.sql import create_index, make_index_name, SQL
+from odoo.tools.sql import column_exists, create_index, drop_index, make_index_name, SQL
 
 ARTICLE_PERMISSION_LEVEL = {'none': 0, 'read': 1, 'write': 2}
 
@@ -101,6 +101,12 @@ class Article(models.Model):
     is_desynchronized = fields.Boolean(
         string="Desyncronized with parents",
         help="If set, this article won't inherit access rules from its parents anymore.")
+    member_inheritance_root_id = fields.Many2one(
+        "knowledge.article", string="Members Inheritance Root Article",
+        compute="_compute_member_inheritance_root_id", compute_sudo=True,
+        store=True, recursive=True,
+        help="Furthest ancestor whose members apply to this article: the closest desynchronized "
+             "ancestor or the root article. Not set on desynchronized and root articles.")
     sequence = fields.Integer(
         string="Sequence",
         default=0,  # Set default=0 to avoid false values and messed up sequence order inside same parent
@@ -255,19 +261,37 @@ class Article(models.Model):
                     WITH knowledge_dictionary;
             """)
 
-            # 4. Add an index to speed up the @@ match operation:
-            #
-            # When searching in a large collection of articles, the search can
-            # quickly become slow as the database has to parse the body of all
-            # articles. To speed up the search, we will use an index to quickly
-            # find potential candidates matching with the given search terms.
-
-            create_index(
-                self.env.cr,
-                make_index_name(self._table, 'body'),
-                self._table,
-                ["to_tsvector('knowledge_config', body)"],
-                method='GIN')
+        # 4. Store the document of the articles and index it to speed up the @@ match operation:
+        #
+        # When searching in a large collection of articles, the search can
+        # quickly become slow as the database has to parse the body of all
+        # articles. To avoid that, the words of the title (weight A) and of the
+        # body (weight B) are stored in a generated column, kept up to date by
+        # PostgreSQL on write, and indexed to quickly find the articles matching
+        # with the given search terms. The weights rank the matches in the title
+        # above the ones in the body (see ``get_user_sorted_articles``).
+
+        if not column_exists(self.env.cr, self._table, 'search_vector'):
+            self.env.cr.execute(SQL('''
+                ALTER TABLE %s ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('knowledge_config', COALESCE(name, '')), 'A') ||
+                    setweight(to_tsvector('knowledge_config', COALESCE(body, '')), 'B')
+                ) STORED
+            ''', SQL.identifier(self._table)))
+        drop_index(self.env.cr, make_index_name(self._table, 'body'), self._table)
+        create_index(
+            self.env.cr,
+            make_index_name(self._table, 'search_vector'),
+            self._table,
+            ['search_vector'],
+            method='GIN')
+
+        # articles sharing the same members inheritance root, see ``_get_partner_member_permissions``
+        create_index(
+            self.env.cr,
+            'knowledge_article_member_inheritance_root_idx',
+            self._table,
+            ['COALESCE(member_inheritance_root_id, id)', 'parent_path'])
 
     # ------------------------------------------------------------
     # CONSTRAINTS
@@ -454,8 +478,19 @@ class Article(models.Model):
             articles.inherited_permission = ancestors[-1:].internal_permission
             articles.inherited_permission_parent_id = ancestors[-1:]
 
+    @api.depends('parent_id', 'parent_id.member_inheritance_root_id', 'is_desynchronized')
+    def _compute_member_inheritance_root_id(self):
+        """ Members are inherited from the ancestors up to the first desynchronized
+        one. Storing that boundary allows to find the members applying to an
+        article with its ``parent_path``, see ``_get_partner_member_permissions``. """
+        for article in self:
+            if article.is_desynchronized or not article.parent_id:
+                article.member_inheritance_root_id = False
+            else:
+                article.member_inheritance_root_id = article.parent_id.member_inheritance_root_id or article.parent_id
+
     @api.depends_context('uid')
-    @api.depends('internal_permission', 'article_member_ids.partner_id', 'article_member_ids.permission')
+    @api.depends('inherited_permission', 'article_member_ids.partner_id', 'article_member_ids.permission')
     def _compute_user_permission(self):
         """ Compute permission for current user. Public users never have any
         permission. Shared users have permission based only on members permission
@@ -474,7 +509,8 @@ class Article(models.Model):
 
         articles_permissions = {}
         if not self.env.user.share:
-            articles_permissions = self._get_internal_permission()
+            # sudo reason: the stored inherited permission is read to compute access
+            articles_permissions = {article.id: article.inherited_permission for article in toupdate.sudo()}
         member_permissions = self._get_partner_member_permissions(self.env.user.partner_id)
         for article in self:
             article_id = article.ids[0]
@@ -1565,27 +1601,12 @@ class Article(models.Model):
             otherwise, it returns all the hidden articles the user has access to,
             not exceeding the limit.
 
-            To reduce the query runtime, the search method limits the number of
-            candidates to consider using the `knowledge.fts_search_cut_off`
-            configuration and pre-selects relevant candidates incrementally
-            using CTE queries.
-
-            The search method pre-selects first articles matching with the title
-            and the body, then articles matching with the title only and, finally,
-            articles matching with the body only. The search method stops adding
-            new candidates when the maximum number of candidates is reached.
-
-            After that, the search method ranks the selected articles using a
-            scoring function and return the most relevant ones. With that approach,
-            the query should return relevant results in reasonable time.
-
-            - If the number of overall matches is lower than the configured cut
-              off, the query returns the top-k matches of the database.
-            - If the number of overall matches is greater than the configured cut
-              off, we consider that the search terms are too broad and we don't
-              consider all potential candidates to reduce the query runtime. As
-              we pre-select relevant matches first, the query should return
-              relevant results but not necessarily the most relevant ones.
+            The search method returns first the articles matching with the title
+            and the body, then the articles matching with the title only and,
+            finally, the articles matching with the body only. Within each group,
+            the articles are ranked on the weighted words of their title and body
+            stored in the indexed ``search_vector`` column (see ``init``), so that
+            the top-k matches of the database are returned.
 
         :param str search_query: Search terms of the user
         :param int limit: Maximal number of records to return
@@ -1613,86 +1634,65 @@ class Article(models.Model):
         # Escape special characters recognized by the 'ILIKE' keyword
         search_pattern = '%' + re.sub(r'(%|_|\\)', r'\\\1', search_query) + '%'
         ts_query = SQL("plainto_tsquery('knowledge_config', %(search_query)s)", search_query=search_query)
-        cut_off = max(self.env['ir.config_parameter'].sudo().get_param('knowledge.fts_search_cut_off', 100), limit)
+        # the search vector is generated from the stored title and body
+        self.flush_model(['name', 'body'])
 
         self.env.cr.execute(SQL('''
             WITH
-            articles_matching_with_title_and_body AS (
-                SELECT knowledge_article.id AS id,
-                       1 AS order,
-                       ts_rank_cd(to_tsvector('knowledge_config', knowledge_article.name), %(ts_query)s) AS score
-                  FROM knowledge_article
-                 WHERE knowledge_article.name ILIKE %(search_pattern)s
-                   AND to_tsvector('knowledge_config', knowledge_article.body) @@ %(ts_query)s
-                   AND %(sql_where_clause)s
-                 LIMIT %(cut_off)s
-            ),
-            articles_matching_with_title AS (
+            matching_articles AS (
                 SELECT knowledge_article.id AS id,
-                       2 AS order,
-                       1 AS score
+                       knowledge_article.name ILIKE %(search_pattern)s AS title_match,
+                       ts_filter(knowledge_article.search_vector, '{b}') @@ %(ts_query)s AS body_match,
+                       ts_rank_cd(knowledge_article.search_vector, %(ts_query)s) AS score
                   FROM knowledge_article
-                 WHERE knowledge_article.name ILIKE %(search_pattern)s
-                   AND knowledge_article.id NOT IN (
-                       SELECT id FROM articles_matching_with_title_and_body)
+                 WHERE (knowledge_article.name ILIKE %(search_pattern)s
+                        OR knowledge_article.search_vector @@ %(ts_query)s)
                    AND %(sql_where_clause)s
-                 LIMIT %(cut_off)s
-                    - (SELECT COUNT(*) FROM articles_matching_with_title_and_body)
             ),
-            articles_matching_with_body AS (
-                SELECT knowledge_article.id AS id,
-                       3 AS order,
-                       ts_rank_cd(to_tsvector('knowledge_config', knowledge_article.body), %(ts_query)s) AS score
-                  FROM knowledge_article
-                 WHERE to_tsvector('knowledge_config', knowledge_article.body) @@ %(ts_query)s
-                   AND knowledge_article.id NOT IN (
-                        SELECT id FROM articles_matching_with_title_and_body
-                        UNION ALL
-                        SELECT id FROM articles_matching_with_title)
-                   AND %(sql_where_clause)s
-                 LIMIT %(cut_off)s
-                    - (SELECT COUNT(*) FROM articles_matching_with_title_and_body)
-                    - (SELECT COUNT(*) FROM articles_matching_with_title)
-            ),
-            all_matching_articles AS (
-                SELECT * FROM articles_matching_with_title_and_body
-                UNION ALL
-                SELECT * FROM articles_matching_with_title
-                UNION ALL
-                SELECT * FROM articles_matching_with_body
+            top_matching_articles AS (
+                SELECT matching_articles.*,
+                       CASE WHEN title_match AND body_match THEN 1
+                            WHEN title_match THEN 2
+                            ELSE 3 END AS match_group,
+                       COALESCE(CAST(article_favorite.id AS BOOLEAN), FALSE) AS is_user_favorite
+                  FROM matching_articles
+             LEFT JOIN knowledge_article_favorite article_favorite
+                    ON matching_articles.id = article_favorite.article_id
+                   AND article_favorite.user_id = %(user_id)s
+                 WHERE title_match OR body_match
+              ORDER BY match_group ASC,
+                       matching_articles.score DESC,
+                       is_user_favorite DESC,
+                       matching_articles.id DESC
+                 LIMIT %(limit)s
             )
             SELECT
                 knowledge_article.id,
                 knowledge_article.icon,
                 knowledge_article.name,
-                CASE WHEN to_tsvector('knowledge_config', knowledge_article.body) @@ %(ts_query)s
+                CASE WHEN top_matching_articles.body_match
                      THEN ts_headline('knowledge_config', knowledge_article.body, %(ts_query)s,
                             'StartSel=<strong>, StopSel=</strong>, MaxWords=20, MinWords=10, MaxFragments=3')
                      ELSE NULL END AS "headline",
-                COALESCE(CAST(article_favorite.id AS BOOLEAN), FALSE) AS is_user_favorite,
+                top_matching_articles.is_user_favorite,
                 knowledge_article.root_article_id,
                 root_article.id AS root_article_id,
                 root_article.icon AS root_article_icon,
                 root_article.name AS root_article_name
-              FROM all_matching_articles
-         LEFT JOIN knowledge_article
-                ON knowledge_article.id = all_matching_articles.id
+              FROM top_matching_articles
+              JOIN knowledge_article
+                ON knowledge_article.id = top_matching_articles.id
          LEFT JOIN knowledge_article AS root_article
                 ON knowledge_article.root_article_id = root_article.id
-         LEFT JOIN knowledge_article_favorite article_favorite
-                ON knowledge_article.id = article_favorite.article_id
-               AND article_favorite.user_id = %(user_id)s
-          ORDER BY all_matching_articles.order ASC,
-                   all_matching_articles.score DESC,
-                   is_user_favorite DESC,
+          ORDER BY top_matching_articles.match_group ASC,
+                   top_matching_articles.score DESC,
+                   top_matching_articles.is_user_favorite DESC,
                    knowledge_article.id DESC
-             LIMIT %(limit)s
             ''',
             sql_where_clause=query.where_clause,
             search_pattern=search_pattern,
             ts_query=ts_query,
             user_id=self.env.user.id,
-            cut_off=cut_off,
             limit=limit
         ))
 
@@ -2342,38 +2342,23 @@ class Article(models.Model):
         self.env['knowledge.article.member'].flush_model()
 
         if self.ids:
-            where_domain = SQL("WHERE id in %s", tuple(self.ids))
+            where_domain = SQL("AND a.id IN %s", tuple(self.ids))
         else:
             where_domain = SQL()
 
+        # the permission of the partner on an article is given by its membership on
+        # the closest ancestor (or the article itself) sharing the same members
+        # inheritance root, i.e. without any desynchronized article in between
         return dict(self.env.execute_query(SQL('''
-            WITH RECURSIVE membered_articles AS (
-                -- base case: all articles the partner is member of
-                SELECT a.id,
-                       a.parent_id,
-                       a.is_desynchronized,
-                       m.permission
-                FROM knowledge_article AS a
-                     JOIN knowledge_article_member AS m ON a.id = m.article_id
-                WHERE m.partner_id = %(partner_id)s
-
-                UNION ALL
-                -- recurse into each child, that is not desync, and the partner is not a member of,
-                -- to propagate the member permission
-                SELECT a.id,
-                       a.parent_id,
-                       a.is_desynchronized,
-                       m.permission
-                FROM membered_articles AS m
-                     JOIN knowledge_article AS a ON m.id = a.parent_id
-                WHERE a.is_desynchronized IS NOT TRUE
-                  AND NOT EXISTS (SELECT 1
-                                  FROM knowledge_article_member AS mm
-                                  WHERE mm.article_id = a.id
-                                    AND mm.partner_id = %(partner_id)s))
-            SELECT id AS article_id, permission
-            FROM membered_articles
-            %(where_domain)s
+            SELECT DISTINCT ON (a.id) a.id AS article_id, m.permission
+              FROM knowledge_article_member AS m
+              JOIN knowledge_article AS source ON source.id = m.article_id
+              JOIN knowledge_article AS a
+                ON COALESCE(a.member_inheritance_root_id, a.id) = COALESCE(source.member_inheritance_root_id, source.id)
+               AND a.parent_path LIKE source.parent_path || '%%'
+             WHERE m.partner_id = %(partner_id)s
+                   %(where_domain)s
+          ORDER BY a.id, LENGTH(source.parent_path) DESC
             ''',
             partner_id=partner.id,
             where_domain=where_domain,
@@ -2413,7 +2398,7 @@ class Article(models.Model):
 
         article_ids_clause = SQL()
         if self.ids:
-            article_ids_clause = SQL('WHERE id IN %s', tuple(self.ids))
+            article_ids_clause = SQL('WHERE article.id IN %s', tuple(self.ids))
 
         alias = 'ef'
         select_fields_clause = SQL()
@@ -2459,26 +2444,16 @@ class Article(models.Model):
                 join_clauses = SQL('\n').join(joins.values())
 
         query = SQL("""
-            WITH RECURSIVE
+            WITH
                 article_hierarchy     AS (
-                    SELECT id,
-                           id AS ancestor_id,
-                           parent_id,
-                           is_desynchronized,
-                           0  AS inheritance_level
-                      FROM knowledge_article
+                    SELECT article.id,
+                           ancestor.id AS ancestor_id,
+                           LENGTH(article.parent_path) - LENGTH(ancestor.parent_path) AS inheritance_level
+                      FROM knowledge_article AS article
+                      JOIN knowledge_article AS ancestor
+                        ON COALESCE(ancestor.member_inheritance_root_id, ancestor.id) = COALESCE(article.member_inheritance_root_id, article.id)
+                       AND article.parent_path LIKE ancestor.parent_path || '%%'
                       %(article_ids_clause)s
-
-                     UNION ALL
-
-                    SELECT child.id,
-                           parent.id AS ancestor_id,
-                           parent.parent_id,
-                           parent.is_desynchronized,
-                           child.inheritance_level + 1
-                      FROM article_hierarchy AS child
-                      JOIN knowledge_article AS parent ON parent.id = child.parent_id
-                     WHERE child.is_desynchronized IS NOT TRUE
                 ),
                 article_memberships   AS (
                     SELECT h.id          AS target_article_id,
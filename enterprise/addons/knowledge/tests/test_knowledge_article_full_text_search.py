@@ -387,3 +387,22 @@ class TestKnowledgeArticleFullTextSearch(KnowledgeCommon):
             'is_user_favorite': False,
             'root_article_id': (self.workspace_article_hidden.id, '📄 HR')
         }])
+
+    @users('admin')
+    def test_get_user_sorted_articles_updated_body(self):
+        """ Check that the search method finds the articles on their current
+            title and body, and ranks them among all the matching articles. """
+        Article = self.env['knowledge.article']
+        self.assertFalse(Article.get_user_sorted_articles('marmalade sandwich', hidden_mode=True))
+
+        self.workspace_child_article_hidden.body = Markup('<p>A marmalade sandwich is on the menu</p>')
+        self.assertEqual(
+            [article['id'] for article in Article.get_user_sorted_articles('marmalade sandwich', hidden_mode=True)],
+            self.workspace_child_article_hidden.ids,
+        )
+
+        self.workspace_article_hidden.body = Markup('<p>Marmalade sandwich: a marmalade sandwich recipe</p>')
+        self.assertEqual(
+            [article['id'] for article in Article.get_user_sorted_articles('marmalade sandwich', limit=1, hidden_mode=True)],
+            self.workspace_article_hidden.ids,
+        )
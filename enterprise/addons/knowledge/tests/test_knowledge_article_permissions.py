@@ -49,6 +49,35 @@ class TestKnowledgeArticlePermissions(KnowledgeArticlePermissionsCase):
             self.assertEqual(article.internal_permission, exp_internal_permission,
                              f'Permission: wrong inherit computation for {article.name}: {article.internal_permission} instead of {exp_internal_permission}')
 
+    def test_article_permissions_member_inheritance_root(self):
+        """ Test the stored boundary of members inheritance, used to fetch the
+        members permissions of the articles without walking up their ancestors. """
+        article_desync, article_desync_child = self.article_write_desync
+        self.assertFalse(self.article_roots[0].member_inheritance_root_id)
+        self.assertEqual(self.article_write_contents[2].member_inheritance_root_id, self.article_roots[0])
+        self.assertFalse(article_desync.member_inheritance_root_id)
+        self.assertEqual(article_desync_child.member_inheritance_root_id, article_desync)
+
+        def assert_member_permissions():
+            articles = self.env['knowledge.article'].with_context(active_test=False).search([])
+            article_members = articles._get_article_member_permissions()
+            for partner in self.partner_employee + self.partner_employee_manager + self.partner_portal:
+                self.assertEqual(
+                    self.env['knowledge.article']._get_partner_member_permissions(partner),
+                    {
+                        article_id: members[partner.id]['permission']
+                        for article_id, members in article_members.items()
+                        if partner.id in members
+                    },
+                )
+
+        assert_member_permissions()
+
+        article_desync.write({'internal_permission': False, 'is_desynchronized': False})
+        self.assertEqual(article_desync.member_inheritance_root_id, self.article_roots[0])
+        self.assertEqual(article_desync_child.member_inheritance_root_id, self.article_roots[0])
+        assert_member_permissions()
+
     @mute_logger('odoo.addons.base.models.ir_rule')
     def test_article_permissions_inheritance_desync(self):
         """ Test desynchronize (and therefore member propagation that should be
@@ -0,0 +1,244 @@
+# onboarding_web/app/bulk.py
+"""
+Bulk tenant import: parse + validate a CSV/JSONL of clients in one pass and
+record a provisioning batch in Redis for the worker to fan out.
+
+Accepted columns / keys (ClientInfo fields plus provisioning options):
+    company_name, admin_email, odoo_edition, db_name      (required)
+    modules      CSV: space/comma/semicolon separated; JSONL: list
+    lang, country, phone, demo, db_password              (optional; a password is
+                                                          generated when blank)
+
+Redis layout (shared with onboarding_worker/tasks/batches.py):
+    onboard:batch:<id>            hash {total, parallelism, in_flight, created_at}
+    onboard:batch:<id>:jobs       list of job ids in file order
+    onboard:batch:<id>:pending    list of job ids not yet handed to the worker
+    onboard:batch:<id>:payloads   hash job_id -> job payload (deleted on success)
+Each row also gets a normal job record (onboard:job:<id>, state=pending), so
+/api/jobs/{id} works for batch jobs too.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import secrets
+import time
+
+from jobs import JOB_KEY_FMT, JOB_TTL, redis_client
+
+BULK_PARALLELISM = int(os.getenv("BULK_PARALLELISM", "5"))
+BULK_MAX_ROWS    = int(os.getenv("BULK_MAX_ROWS", "5000"))
+
+BATCH_KEY_FMT   = "onboard:batch:{batch_id}"
+REQUIRED_FIELDS = ("company_name", "admin_email", "odoo_edition", "db_name")
+EMAIL_RE        = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+ACTIVE_STATES   = ("queued", "waiting", "running")
+
+
+def _batch_keys(batch_id: str) -> dict[str, str]:
+    base = BATCH_KEY_FMT.format(batch_id=batch_id)
+    return {"meta": base, "jobs": f"{base}:jobs", "pending": f"{base}:pending", "payloads": f"{base}:payloads"}
+
+
+def _read_records(filename: str, content: bytes) -> list[tuple[int, dict]]:
+    """(line number, raw record) pairs from a .csv or .jsonl/.ndjson upload."""
+    text = content.decode("utf-8-sig")
+    if filename.lower().endswith((".jsonl", ".ndjson", ".json")):
+        records = []
+        for lineno, line in enumerate(text.splitlines(), start=1):
+            if line.strip():
+                try:
+                    value = json.loads(line)
+                except ValueError as e:
+                    value = {"__error__": f"invalid JSON: {e}"}
+                records.append((lineno, value if isinstance(value, dict) else {"__error__": "not an object"}))
+        return records
+    reader = csv.DictReader(io.StringIO(text))
+    # Header is line 1, so the first data row is line 2
+    return [(lineno, dict(row)) for lineno, row in enumerate(reader, start=2)]
+
+
+def _modules(value) -> list[str]:
+    if isinstance(value, list):
+        items = value
+    else:
+        items = re.split(r"[\s,;]+", str(value or ""))
+    return list(dict.fromkeys(m.strip() for m in items if str(m).strip()))
+
+
+def candidate_db_names(filename: str, content: bytes) -> set[str]:
+    """Normalized db_names in the upload, for a scoped "already taken" lookup."""
+    names = set()
+    for _, rec in _read_records(filename, content):
+        for key, value in rec.items():
+            if key and key.strip().lower() == "db_name" and value:
+                names.add(str(value).strip().lower())
+    return names
+
+
+def parse_and_validate(filename: str, content: bytes, existing_db_names: set[str]):
+    """
+    Validate every row before anything is written.
+    Returns (rows, errors): rows are normalized dicts, errors is
+    [{"line": n, "errors": [...]}, ...] — the batch is only accepted if empty.
+    """
+    records = _read_records(filename, content)
+    if len(records) > BULK_MAX_ROWS:
+        return [], [{"line": 0, "errors": [f"Too many rows ({len(records)} > {BULK_MAX_ROWS})."]}]
+
+    rows, errors, seen = [], [], {}
+    for lineno, rec in records:
+        problems = [rec["__error__"]] if "__error__" in rec else []
+        rec = {k.strip().lower(): v for k, v in rec.items() if k and k != "__error__"}
+        for field in REQUIRED_FIELDS:
+            if not str(rec.get(field) or "").strip():
+                problems.append(f"{field} is required")
+
+        db_name = str(rec.get("db_name") or "").strip().lower()
+        if db_name and not all(c.islower() or c.isdigit() or c == "_" for c in db_name):
+            problems.append("db_name: use lowercase letters, numbers, and underscores only")
+        if len(db_name) > 63:
+            problems.append("db_name: at most 63 characters")
+        if db_name in seen:
+            problems.append(f"db_name duplicates line {seen[db_name]}")
+        elif db_name in existing_db_names:
+            problems.append("db_name already exists")
+        if db_name:
+            seen.setdefault(db_name, lineno)
+
+        email = str(rec.get("admin_email") or "").strip()
+        if email and not EMAIL_RE.match(email):
+            problems.append("admin_email is not a valid address")
+
+        edition = str(rec.get("odoo_edition") or "").strip().lower()
+        if edition and edition not in ("community", "enterprise"):
+            problems.append("odoo_edition must be Community or Enterprise")
+
+        if problems:
+            errors.append({"line": lineno, "errors": problems})
+            continue
+        rows.append({
+            "company_name": str(rec["company_name"]).strip(),
+            "admin_email": email,
+            "odoo_edition": "Enterprise" if edition == "enterprise" else "Community",
+            "db_name": db_name,
+            "modules": _modules(rec.get("modules")),
+            "lang": str(rec.get("lang") or "en_US").strip(),
+            "country": str(rec.get("country") or "ZM").strip().upper(),
+            "phone": str(rec.get("phone") or "").strip(),
+            "demo": str(rec.get("demo") or "").strip().lower() in ("1", "true", "yes"),
+            "db_password": str(rec.get("db_password") or "").strip(),
+        })
+    return rows, errors
+
+
+async def create_batch(rows: list[dict], parallelism: int, trace_id: str) -> tuple[str, list[dict]]:
+    """
+    Record the batch + one pending job per row in a single Redis round trip.
+    Returns (batch_id, [{db_name, job_id, generated_password?}, ...]).
+    """
+    batch_id = secrets.token_urlsafe(12)
+    keys = _batch_keys(batch_id)
+    now = str(time.time())
+    summary = []
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(keys["meta"], mapping={
+            "total": len(rows), "parallelism": parallelism, "in_flight": 0,
+            "created_at": now, "trace_id": trace_id,
+        })
+        for row in rows:
+            job_id = secrets.token_urlsafe(16)
+            generated = None
+            if not row["db_password"]:
+                generated = row["db_password"] = secrets.token_urlsafe(12)
+            payload = {
+                "db_name": row["db_name"],
+                "db_password": row["db_password"],
+                "phone": row["phone"],
+                "lang": row["lang"],
+                "country": row["country"],
+                "demo": row["demo"],
+                "edition": row["odoo_edition"],
+                "admin_login": row["admin_email"],
+                "company_name": row["company_name"],
+                "modules": row["modules"],
+                "batch_id": batch_id,
+            }
+            job_key = JOB_KEY_FMT.format(job_id=job_id)
+            pipe.hset(job_key, mapping={
+                "state": "pending", "db_name": row["db_name"], "edition": row["odoo_edition"],
+                "batch_id": batch_id, "trace_id": trace_id, "created_at": now, "updated_at": now,
+            })
+            pipe.expire(job_key, JOB_TTL)
+            pipe.rpush(keys["jobs"], job_id)
+            pipe.rpush(keys["pending"], job_id)
+            pipe.hset(keys["payloads"], job_id, json.dumps(payload))
+            entry = {"db_name": row["db_name"], "job_id": job_id}
+            if generated:
+                entry["generated_password"] = generated
+            summary.append(entry)
+        for key in keys.values():
+            pipe.expire(key, JOB_TTL)
+        await pipe.execute()
+    return batch_id, summary
+
+
+async def batch_progress(batch_id: str) -> dict | None:
+    """Counts per state plus failures; None for an unknown/expired batch."""
+    keys = _batch_keys(batch_id)
+    meta = await redis_client.hgetall(keys["meta"])
+    if not meta:
+        return None
+    job_ids = await redis_client.lrange(keys["jobs"], 0, -1)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for job_id in job_ids:
+            pipe.hmget(JOB_KEY_FMT.format(job_id=job_id), "state", "db_name", "error")
+        records = await pipe.execute()
+
+    counts: dict[str, int] = {}
+    failures = []
+    for job_id, (state, db_name, error) in zip(job_ids, records):
+        state = state or "expired"
+        counts[state] = counts.get(state, 0) + 1
+        if state == "failed":
+            failures.append({"job_id": job_id, "db_name": db_name, "error": error})
+    total = int(meta.get("total", len(job_ids)))
+    done = counts.get("succeeded", 0) + counts.get("failed", 0)
+    return {
+        "batch_id": batch_id,
+        "total": total,
+        "parallelism": int(meta.get("parallelism", BULK_PARALLELISM)),
+        "counts": counts,
+        "done": done,
+        "complete": done >= total,
+        "failures": failures,
+    }
+
+
+async def prepare_resume(batch_id: str) -> int:
+    """
+    Re-queue every job that failed or never reached the worker (e.g. after a
+    worker crash) and re-sync the in-flight counter. Returns how many were re-queued.
+    """
+    keys = _batch_keys(batch_id)
+    job_ids = await redis_client.lrange(keys["jobs"], 0, -1)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for job_id in job_ids:
+            pipe.hget(JOB_KEY_FMT.format(job_id=job_id), "state")
+        states = await pipe.execute()
+    payload_ids = set(await redis_client.hkeys(keys["payloads"]))
+
+    requeue = [j for j, st in zip(job_ids, states) if st in ("failed", "pending") and j in payload_ids]
+    in_flight = sum(1 for st in states if st in ACTIVE_STATES)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(keys["pending"])
+        if requeue:
+            pipe.rpush(keys["pending"], *requeue)
+        for job_id in requeue:
+            pipe.hset(JOB_KEY_FMT.format(job_id=job_id),
+                      mapping={"state": "pending", "error": "", "updated_at": str(time.time())})
+        pipe.hset(keys["meta"], "in_flight", in_flight)
+        await pipe.execute()
+    return len(requeue)
@@ -0,0 +1,93 @@
+# onboarding_web/app/bulk_import.py
+"""
+Command-line client for the bulk tenant import API.
+
+Usage:
+    python bulk_import.py import clients.csv [--parallelism 5] [--wait]
+    python bulk_import.py status <batch_id>
+    python bulk_import.py resume <batch_id>
+
+--url defaults to $ONBOARD_URL or http://localhost:8000. Generated admin
+passwords are printed once on import; store them before closing the terminal.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import httpx
+
+
+def _print(body: dict) -> None:
+    print(json.dumps(body, indent=2))
+
+
+def cmd_import(client: httpx.Client, args) -> int:
+    with open(args.file, "rb") as fh:
+        resp = client.post(
+            "/admin/clients/import",
+            files={"file": (os.path.basename(args.file), fh)},
+            data={"parallelism": str(args.parallelism)},
+        )
+    body = resp.json()
+    _print(body)
+    if not body.get("ok"):
+        return 1
+    if args.wait:
+        return _wait(client, body["batch_id"])
+    return 0
+
+
+def _wait(client: httpx.Client, batch_id: str) -> int:
+    while True:
+        body = client.get(f"/admin/batches/{batch_id}").json()
+        if not body.get("ok"):
+            _print(body)
+            return 1
+        print(f"{body['done']}/{body['total']} done  {body['counts']}", file=sys.stderr)
+        if body["complete"]:
+            _print(body)
+            return 1 if body["failures"] else 0
+        time.sleep(5)
+
+
+def cmd_status(client: httpx.Client, args) -> int:
+    resp = client.get(f"/admin/batches/{args.batch_id}")
+    _print(resp.json())
+    return 0 if resp.is_success else 1
+
+
+def cmd_resume(client: httpx.Client, args) -> int:
+    resp = client.post(f"/admin/batches/{args.batch_id}/resume")
+    _print(resp.json())
+    return 0 if resp.is_success else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.getenv("ONBOARD_URL", "http://localhost:8000"))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="validate and queue a CSV/JSONL of clients")
+    p_import.add_argument("file")
+    p_import.add_argument("--parallelism", type=int, default=int(os.getenv("BULK_PARALLELISM", "5")))
+    p_import.add_argument("--wait", action="store_true", help="poll until the batch completes")
+    p_import.set_defaults(func=cmd_import)
+
+    p_status = sub.add_parser("status", help="show batch progress")
+    p_status.add_argument("batch_id")
+    p_status.set_defaults(func=cmd_status)
+
+    p_resume = sub.add_parser("resume", help="re-queue failed jobs of a batch")
+    p_resume.add_argument("batch_id")
+    p_resume.set_defaults(func=cmd_resume)
+
+    args = parser.parse_args()
+    with httpx.Client(base_url=args.url, timeout=60) as client:
+        return args.func(client, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# onboarding_web/app/jobs.py
+"""
+Provisioning job helpers for the onboarding gateway.
+
+The web tier never talks to /web/database/create itself any more: it records a
+job in Redis (state=queued), hands the payload to the Celery worker by task
+name, and lets the browser poll /api/jobs/{id}.
+
+Key layout must stay in sync with onboarding_worker/tasks/jobs.py:
+    onboard:job:<job_id>  -> hash {state, db_name, edition, error, ...}
+"""
+
+import json
+import os
+import secrets
+import time
+
+import redis.asyncio as aioredis
+from celery import Celery
+from starlette.concurrency import run_in_threadpool
+
+REDIS_URL   = os.getenv("REDIS_URL", "redis://redis:6379/0")
+BROKER_URL  = os.getenv("CELERY_BROKER_URL", REDIS_URL)
+JOB_TTL     = int(os.getenv("JOB_TTL_SECONDS", "86400"))
+JOB_KEY_FMT = "onboard:job:{job_id}"
+
+# Producer-only Celery app: tasks are addressed by name, the code lives in the worker
+celery_app = Celery("onboarding_web", broker=BROKER_URL)
+
+redis_client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+
+
+async def create_job(**fields) -> str:
+    """Create a queued job record and return its id."""
+    job_id = secrets.token_urlsafe(16)
+    now = str(time.time())
+    mapping = {k: v if isinstance(v, str) else json.dumps(v) for k, v in fields.items() if v is not None}
+    mapping.update(state="queued", created_at=now, updated_at=now)
+    key = JOB_KEY_FMT.format(job_id=job_id)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, JOB_TTL)
+        await pipe.execute()
+    return job_id
+
+
+async def get_job(job_id: str) -> dict[str, str]:
+    """Return the raw job hash ({} if unknown/expired)."""
+    return await redis_client.hgetall(JOB_KEY_FMT.format(job_id=job_id))
+
+
+async def fail_job(job_id: str, error: str) -> None:
+    """Mark a job failed from the web side (e.g. broker unreachable)."""
+    await redis_client.hset(
+        JOB_KEY_FMT.format(job_id=job_id),
+        mapping={"state": "failed", "error": error, "updated_at": str(time.time())},
+    )
+
+
+async def queue_depths() -> dict[str, int]:
+    """
+    Pending Celery messages (default "celery" list on the Redis broker) plus jobs
+    the worker's scheduler has parked waiting for an Odoo slot, per edition.
+    """
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.llen("celery")
+        for edition in ("Community", "Enterprise"):
+            pipe.zcard(f"onboard:sched:queue:{edition}")
+        celery_len, community, enterprise = await pipe.execute()
+    return {"celery": celery_len, "waiting_community": community, "waiting_enterprise": enterprise}
+
+
+async def enqueue(task_name: str, *args) -> None:
+    """Publish a task to the broker without blocking the event loop."""
+    await run_in_threadpool(celery_app.send_task, task_name, args=list(args))
@@ -3,33 +3,62 @@
 FastAPI app for the Odoo onboarding gateway.
 
 Author: Adam ChapChap Ng'uni
-Last Updated: 2025-08-10 18:05 CAT
+Last Updated: 2026-10-18 10:15 CAT
 
 What changed (this revision):
-- Redirect target after successful DB creation (and when DB exists) now points to:
-    Enterprise -> https://enter.savannasolutions.co.zm/web/database/manager
-    Community  -> https://comm.savannasolutions.co.zm/web/database/manager
-- Defaults for EXTERNAL Odoo URLs now use the enter/comm hostnames over HTTPS.
+- Bulk tenant import: POST /admin/clients/import takes a CSV/JSONL of clients,
+  validates every row up front (format, duplicates in the file, names already in
+  the intake DB or on Odoo) and writes nothing unless the whole file is valid.
+  Valid files become one multi-row intake insert + one Redis batch (bulk.py)
+  that the worker provisions with a bounded number of jobs in flight.
+- GET /admin/batches/{id} reports per-state progress and failures;
+  POST /admin/batches/{id}/resume re-queues failed/unstarted jobs.
 - Kept idempotency, nonce guard, and existing validation intact.
 """
 
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import RedirectResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from sqlalchemy import create_engine, Column, Integer, String, text
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import Column, DateTime, Integer, String, func, insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 import httpx
 from dotenv import load_dotenv
-import os, time, secrets
+from contextlib import asynccontextmanager
+from datetime import datetime
+import asyncio, base64, json, os, time, secrets
+
+from bulk import (
+    BULK_PARALLELISM, batch_progress, candidate_db_names, create_batch, parse_and_validate, prepare_resume,
+)
+from jobs import create_job, enqueue, fail_job, get_job, queue_depths
+from metrics import (
+    DB_LIST_CACHE, IDEMPOTENCY_CHECKS, JOBS_ENQUEUED, NONCE_CHECKS, QUEUE_DEPTH, REQUEST_LATENCY,
+    odoo_call, render_latest,
+)
+from state import get_state_backend
 
 # ---------------------------------------------------------------------------
 # Environment & App Setup
 # ---------------------------------------------------------------------------
 load_dotenv()
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Migrate the intake DB and open the shared Odoo connection pools; close all on shutdown."""
+    await _migrate()
+    for base in (ODOO_COMMUNITY_INTERNAL, ODOO_ENTERPRISE_INTERNAL):
+        _odoo_client(base)
+    yield
+    for client in list(_odoo_clients.values()):
+        await client.aclose()
+    _odoo_clients.clear()
+    await engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 # Serve static assets and Jinja2 templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -37,6 +66,10 @@ templates = Jinja2Templates(directory="templates")
 
 # Onboarding PostgreSQL (client intake DB)
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://clientadmin:clientpass@pg_clients/clients")
+DB_POOL_SIZE    = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", "50"))
 
 # Odoo internal URLs (container network) for API calls
 ODOO_COMMUNITY_INTERNAL  = os.getenv("ODOO_COMMUNITY_URL",  "http://odoo_community:8069")
@@ -47,12 +80,32 @@ ODOO_ENTERPRISE_INTERNAL = os.getenv("ODOO_ENTERPRISE_URL", "http://odoo_enterpr
 ODOO_COMMUNITY_EXTERNAL  = os.getenv("ODOO_COMMUNITY_EXTERNAL",  "https://comm.savannasolutions.co.zm")
 ODOO_ENTERPRISE_EXTERNAL = os.getenv("ODOO_ENTERPRISE_EXTERNAL", "https://enter.savannasolutions.co.zm")
 
-# Odoo master password (read from .env; never shown to the user)
-ODOO_MASTER_PASSWORD = os.getenv("MASTER_PASSWORD", "admin")
-
-# SQLAlchemy session & base
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Odoo HTTP connection pool (per edition) + /web/database/list cache
+ODOO_POOL_MAX_CONNECTIONS = int(os.getenv("ODOO_POOL_MAX_CONNECTIONS", "20"))
+ODOO_POOL_MAX_KEEPALIVE   = int(os.getenv("ODOO_POOL_MAX_KEEPALIVE", "10"))
+DB_LIST_CACHE_TTL         = float(os.getenv("DB_LIST_CACHE_TTL", "10"))  # seconds; 0 disables
+
+# Per-browser session cookie (opaque id; values live in the state backend)
+SESSION_COOKIE        = os.getenv("SESSION_COOKIE", "onboard_sid")
+SESSION_COOKIE_SECURE = os.getenv("SESSION_COOKIE_SECURE", "0") == "1"
+NONCE_TTL             = int(os.getenv("NONCE_TTL_SECONDS", "300"))  # 5 minutes
+
+# SQLAlchemy async engine, session factory & base
+def _async_url(url: str) -> str:
+    """postgresql:// (or +psycopg2) URLs -> postgresql+asyncpg:// for the async engine."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+engine = create_async_engine(
+    _async_url(DATABASE_URL),
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
 
 # ---------------------------------------------------------------------------
@@ -65,75 +118,156 @@ class ClientInfo(Base):
     admin_email   = Column(String, nullable=False)
     odoo_edition  = Column(String, nullable=False)  # "Community" or "Enterprise"
     db_name       = Column(String, nullable=False)  # Database name (<=63 chars)
+    created_at    = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
-# Create table if it doesn't exist
-Base.metadata.create_all(bind=engine)
-
-# Light-touch migration: ensure db_name column & index exist for old deployments
-with engine.begin() as conn:
-    conn.execute(text("""
-        ALTER TABLE clients
-        ADD COLUMN IF NOT EXISTS db_name VARCHAR(63) NOT NULL DEFAULT '';
-    """))
-    conn.execute(text("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1 FROM pg_indexes
-                WHERE schemaname = 'public' AND indexname = 'idx_clients_db_name'
-            ) THEN
-                CREATE INDEX idx_clients_db_name ON clients (db_name);
-            END IF;
-        END$$;
-    """))
+async def _migrate() -> None:
+    """
+    Create the table if it doesn't exist, then light-touch migrate old deployments
+    (db_name/created_at columns + listing indexes). An advisory lock keeps several
+    workers/replicas starting at once from racing on the DDL.
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('onboard_clients_migrate'))"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("""
+            ALTER TABLE clients
+            ADD COLUMN IF NOT EXISTS db_name VARCHAR(63) NOT NULL DEFAULT '';
+        """))
+        await conn.execute(text("""
+            ALTER TABLE clients
+            ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now();
+        """))
+        for ddl in (
+            "CREATE INDEX IF NOT EXISTS idx_clients_db_name ON clients (db_name)",
+            # Keyset pagination: newest first, id breaks ties
+            "CREATE INDEX IF NOT EXISTS idx_clients_created_at ON clients (created_at DESC, id DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_clients_edition_created_at "
+            "ON clients (odoo_edition, created_at DESC, id DESC)",
+            # Case-insensitive prefix search on email
+            "CREATE INDEX IF NOT EXISTS idx_clients_admin_email "
+            "ON clients (lower(admin_email) text_pattern_ops)",
+        ):
+            await conn.execute(text(ddl))
 
 # ---------------------------------------------------------------------------
-# Simple in-memory state (session-like cache for next step)
+# Shared state (nonces + per-browser session values for the next step)
 # ---------------------------------------------------------------------------
-_runtime_state: dict[str, str | None] = {
-    "last_selected_edition": None,
-    "last_admin_email": None,
-    "last_db_name": None,
-}
-
-# One-time nonces to prevent duplicate creation on refresh
-_nonces: dict[str, float] = {}  # {nonce: expiry_timestamp}
-
-def _clean_nonces() -> None:
-    """Remove expired nonces."""
-    now = time.time()
-    for k, v in list(_nonces.items()):
-        if v < now:
-            _nonces.pop(k, None)
+state = get_state_backend()
+
+@app.middleware("http")
+async def session_cookie(request: Request, call_next):
+    """Give every browser an opaque session id (request.state.sid) and persist it as a cookie."""
+    sid = request.cookies.get(SESSION_COOKIE)
+    is_new = not sid or len(sid) > 64
+    if is_new:
+        sid = secrets.token_urlsafe(24)
+    request.state.sid = sid
+    response = await call_next(request)
+    if is_new:
+        response.set_cookie(
+            SESSION_COOKIE, sid, httponly=True, samesite="lax", secure=SESSION_COOKIE_SECURE,
+        )
+    return response
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """Request id propagation + latency histogram labelled by route template (not raw path)."""
+    request_id = request.headers.get("X-Request-ID", "")[:64] or secrets.token_hex(8)
+    request.state.request_id = request_id
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status),
+        ).observe(time.perf_counter() - started)
+
+async def _session(request: Request) -> dict[str, str]:
+    """Values carried between steps for this browser ({} for a fresh visitor)."""
+    return await state.get_session(request.state.sid)
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
-async def list_databases(odoo_base: str) -> list[str]:
+_odoo_clients: dict[str, httpx.AsyncClient] = {}           # {odoo_base: pooled client}
+_db_list_cache: dict[str, tuple[float, list[str]]] = {}  # {odoo_base: (expiry, names)}
+_db_list_locks: dict[str, asyncio.Lock] = {}             # {odoo_base: fetch lock}
+
+def _odoo_client(odoo_base: str) -> httpx.AsyncClient:
+    """Shared keep-alive client for one Odoo edition (created lazily, closed in lifespan)."""
+    client = _odoo_clients.get(odoo_base)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=odoo_base,
+            timeout=30,
+            headers={"User-Agent": "onboard/1.0"},
+            limits=httpx.Limits(
+                max_connections=ODOO_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=ODOO_POOL_MAX_KEEPALIVE,
+            ),
+        )
+        _odoo_clients[odoo_base] = client
+    return client
+
+def invalidate_db_list(odoo_base: str) -> None:
+    """Forget the cached DB list for an edition (call after a create)."""
+    _db_list_cache.pop(odoo_base, None)
+
+async def _fetch_databases(odoo_base: str) -> list[str] | None:
     """
     Robust DB listing for Odoo 17/18:
       1) Try JSON-RPC body
       2) Fallback to legacy empty-form POST
-    Returns [] on any error.
+    Returns None on any error (so failures are never cached).
     """
-    url = f"{odoo_base}/web/database/list"
+    client = _odoo_client(odoo_base)
     try:
-        async with httpx.AsyncClient(timeout=30, headers={"User-Agent": "onboard/1.0"}) as client:
+        with odoo_call("/web/database/list"):
             # Preferred JSON-RPC
-            r = await client.post(url, json={"jsonrpc": "2.0", "method": "call", "params": {}})
+            r = await client.post("/web/database/list", json={"jsonrpc": "2.0", "method": "call", "params": {}})
             if r.status_code == 200:
                 j = r.json()
                 if isinstance(j, dict) and isinstance(j.get("result"), list):
                     return j["result"]
             # Fallback legacy
-            r = await client.post(url, data={})
+            r = await client.post("/web/database/list", data={})
             if r.status_code == 200:
                 j = r.json()
                 if isinstance(j, dict) and isinstance(j.get("result"), list):
                     return j["result"]
     except Exception:
         pass
-    return []
+    return None
+
+async def list_databases(odoo_base: str, fresh: bool = False) -> list[str]:
+    """
+    Database names on an Odoo edition, served from a short-TTL cache.
+    `fresh=True` bypasses (and refreshes) the cache. Returns [] on any error.
+    """
+    now = time.monotonic()
+    cached = _db_list_cache.get(odoo_base)
+    if not fresh and cached and cached[0] > now:
+        DB_LIST_CACHE.labels("hit").inc()
+        return cached[1]
+    DB_LIST_CACHE.labels("miss").inc()
+
+    lock = _db_list_locks.setdefault(odoo_base, asyncio.Lock())
+    async with lock:
+        # Another request may have refreshed it while we waited
+        cached = _db_list_cache.get(odoo_base)
+        if not fresh and cached and cached[0] > time.monotonic():
+            return cached[1]
+        names = await _fetch_databases(odoo_base)
+        if names is None:
+            return []
+        if DB_LIST_CACHE_TTL > 0:
+            _db_list_cache[odoo_base] = (time.monotonic() + DB_LIST_CACHE_TTL, names)
+        return names
 
 def _mk_redirect(base: str, path: str) -> str:
     """Build a full URL with base + path."""
@@ -169,7 +303,7 @@ async def handle_submit(
     Handle company form submission.
     - Validates db_name (lowercase, numbers, underscores only)
     - Stores client info in PostgreSQL onboarding DB
-    - Saves db_name and email in runtime state for next step
+    - Saves db_name and email in this browser's session for the next step
     - Redirects user to appropriate /database/<edition> page
     """
     # Normalize/validate db_name
@@ -186,62 +320,60 @@ async def handle_submit(
         )
 
     # Persist intake data
-    db = SessionLocal()
-    try:
-        row = ClientInfo(
+    async with SessionLocal() as db:
+        db.add(ClientInfo(
             company_name=company_name.strip(),
             admin_email=admin_email.strip(),
             odoo_edition=odoo_edition.strip(),
             db_name=safe_name,
-        )
-        db.add(row)
-        db.commit()
-    finally:
-        db.close()
+        ))
+        await db.commit()
 
     # Carry values to the next page
-    _runtime_state["last_admin_email"] = admin_email.strip()
-    _runtime_state["last_db_name"]     = safe_name
+    selected = "Enterprise" if "enterprise" in odoo_edition.strip().lower() else "Community"
+    await state.update_session(
+        request.state.sid,
+        last_admin_email=admin_email.strip(),
+        last_company_name=company_name.strip(),
+        last_db_name=safe_name,
+        last_selected_edition=selected,
+    )
 
     # Route to the correct edition page
-    ed = odoo_edition.strip().lower()
-    if "enterprise" in ed:
-        _runtime_state["last_selected_edition"] = "Enterprise"
-        return RedirectResponse("/database/enterprise", status_code=302)
-
-    _runtime_state["last_selected_edition"] = "Community"
-    return RedirectResponse("/database/community", status_code=302)
+    return RedirectResponse(f"/database/{selected.lower()}", status_code=302)
 
 @app.get("/database/community")
 async def database_community(request: Request):
     """Render DB creation form for Community (db_name is read-only)."""
-    _runtime_state["last_selected_edition"] = "Community"
+    await state.update_session(request.state.sid, last_selected_edition="Community")
+    session = await _session(request)
     return templates.TemplateResponse(
         "database.html",
         {
             "request": request,
             "edition": "Community",
-            "last_db_name": _runtime_state.get("last_db_name", ""),
+            "last_db_name": session.get("last_db_name", ""),
         },
     )
 
 @app.get("/database/enterprise")
 async def database_enterprise(request: Request):
     """Render DB creation form for Enterprise (db_name is read-only)."""
-    _runtime_state["last_selected_edition"] = "Enterprise"
+    await state.update_session(request.state.sid, last_selected_edition="Enterprise")
+    session = await _session(request)
     return templates.TemplateResponse(
         "database.html",
         {
             "request": request,
             "edition": "Enterprise",
-            "last_db_name": _runtime_state.get("last_db_name", ""),
+            "last_db_name": session.get("last_db_name", ""),
         },
     )
 
 @app.post("/create-db")
 async def create_db_page(
     request: Request,
-    db_name: str = Form(None),          # May arrive from read-only field; fallback to state
+    db_name: str = Form(None),          # May arrive from read-only field; fallback to session
     db_password: str = Form(...),
     phone: str = Form(""),
     lang: str = Form(...),
@@ -253,11 +385,12 @@ async def create_db_page(
     """
     Render the "Creating..." page with a one-time nonce; the page will call /api/create-db.
     """
-    selected = (edition or _runtime_state.get("last_selected_edition") or "Community").strip()
+    session = await _session(request)
+    selected = (edition or session.get("last_selected_edition") or "Community").strip()
     is_enterprise = selected.lower().startswith("enter")
 
     # Respect carried name if form didn't include it.
-    safe_name = (db_name or _runtime_state.get("last_db_name") or "").lower()
+    safe_name = (db_name or session.get("last_db_name") or "").lower()
     if not safe_name or not all(c.islower() or c.isdigit() or c == "_" for c in safe_name):
         return templates.TemplateResponse(
             "error.html",
@@ -271,13 +404,14 @@ async def create_db_page(
     # Short-circuit: DB already exists -> send to the edition's manager
     existing = await list_databases(odoo_internal)
     if safe_name in existing:
+        IDEMPOTENCY_CHECKS.labels("create_page", "exists").inc()
         _, manager_url = _edition_targets(is_enterprise)
         return RedirectResponse(manager_url, status_code=302)
+    IDEMPOTENCY_CHECKS.labels("create_page", "new").inc()
 
     # One-time nonce for the async API call
-    _clean_nonces()
-    nonce = secrets.token_urlsafe(24)
-    _nonces[nonce] = time.time() + 300  # 5 minutes
+    nonce = await state.issue_nonce(NONCE_TTL)
+    NONCE_CHECKS.labels("issued").inc()
 
     # Render creating page with payload & cache-busters
     resp = templates.TemplateResponse(
@@ -295,7 +429,8 @@ async def create_db_page(
                 "country": country or "ZM",
                 "demo": bool(demo),
                 "edition": "Enterprise" if is_enterprise else "Community",
-                "admin_login": (admin_login or _runtime_state.get("last_admin_email") or "admin").strip(),
+                "admin_login": (admin_login or session.get("last_admin_email") or "admin").strip(),
+                "company_name": session.get("last_company_name") or "",
                 "nonce": nonce,
             },
         },
@@ -307,15 +442,16 @@ async def create_db_page(
 @app.post("/api/create-db")
 async def api_create_db(request: Request):
     """
-    Called by JS on the "Creating..." page to create the DB in Odoo.
-    Returns JSON: { ok: bool, redirect?: str, error?: str }
+    Called by JS on the "Creating..." page to queue DB creation on the worker.
+    Returns JSON: { ok: bool, job_id?: str, redirect?: str, error?: str }
+    (`redirect` only when the DB already exists; otherwise poll /api/jobs/{job_id}.)
     """
     data = await request.json()
     nonce = data.get("nonce")
-    _clean_nonces()
-    if not nonce or nonce not in _nonces:
+    if not nonce or not isinstance(nonce, str) or not await state.consume_nonce(nonce):
+        NONCE_CHECKS.labels("rejected").inc()
         return JSONResponse({"ok": False, "error": "Expired or invalid request (nonce)."}, status_code=409)
-    _nonces.pop(nonce, None)  # Consume the nonce
+    NONCE_CHECKS.labels("accepted").inc()
 
     safe_name   = (data.get("db_name") or "").lower()
     db_password = data.get("db_password") or ""
@@ -324,64 +460,215 @@ async def api_create_db(request: Request):
     country     = data.get("country") or "ZM"
     demo        = bool(data.get("demo") or False)
     edition     = (data.get("edition") or "Community").strip()
-    admin_login = (data.get("admin_login") or _runtime_state.get("last_admin_email") or "admin").strip()
+    admin_login = (data.get("admin_login") or (await _session(request)).get("last_admin_email") or "admin").strip()
+    company     = (data.get("company_name") or "").strip()
 
     if not safe_name or not all(c.islower() or c.isdigit() or c == "_" for c in safe_name):
         return JSONResponse({"ok": False, "error": "Invalid database name."}, status_code=400)
 
     is_enterprise = edition.lower().startswith("enter")
     odoo_internal = ODOO_ENTERPRISE_INTERNAL if is_enterprise else ODOO_COMMUNITY_INTERNAL
+    edition = "Enterprise" if is_enterprise else "Community"
 
-    # Idempotency: re-check before creating
+    # Idempotency: re-check before queueing (the worker checks again before creating)
     existing = await list_databases(odoo_internal)
     if safe_name in existing:
-        # ✅ After creation (or if already present), always send to the edition's manager
+        IDEMPOTENCY_CHECKS.labels("api", "exists").inc()
+        # ✅ Already present -> send to the edition's manager
         _, manager_url = _edition_targets(is_enterprise)
         return JSONResponse({"ok": True, "redirect": manager_url})
+    IDEMPOTENCY_CHECKS.labels("api", "new").inc()
 
-    # Odoo create DB POST payload (form-encoded)
-    payload = {
-        "master_pwd": ODOO_MASTER_PASSWORD,
-        "name": safe_name,
-        "login": admin_login,
-        "password": db_password,
-        "lang": lang,
-        "country_code": country,
-        "phone": phone,
-        "demo": "true" if demo else "false",
-    }
-
-    create_url = f"{odoo_internal}/web/database/create"
+    job_id = await create_job(db_name=safe_name, edition=edition, trace_id=request.state.request_id)
     try:
-        async with httpx.AsyncClient(timeout=180, follow_redirects=True) as client:
-            r = await client.post(create_url, data=payload)
-    except httpx.RequestError as e:
-        return JSONResponse({"ok": False, "error": f"Network error to Odoo: {e}"}, status_code=502)
+        await enqueue("tasks.create_database_job", job_id, {
+            "db_name": safe_name,
+            "db_password": db_password,
+            "phone": phone,
+            "lang": lang,
+            "country": country,
+            "demo": demo,
+            "edition": edition,
+            "admin_login": admin_login,
+            "company_name": company,
+            "modules": [],
+        })
+    except Exception as e:
+        JOBS_ENQUEUED.labels(edition, "broker_error").inc()
+        await fail_job(job_id, f"Could not queue the request: {e}")
+        return JSONResponse({"ok": False, "error": "Provisioning queue unavailable. Please try again."}, status_code=503)
+    JOBS_ENQUEUED.labels(edition, "queued").inc()
+    invalidate_db_list(odoo_internal)
+
+    return JSONResponse({"ok": True, "job_id": job_id}, status_code=202)
+
+@app.get("/api/jobs/{job_id}")
+async def api_job_status(job_id: str):
+    """
+    Job status for the "Creating..." page.
+    Returns JSON: { ok: bool, state?: str, redirect?: str, error?: str }
+    """
+    job = await get_job(job_id)
+    if not job:
+        return JSONResponse({"ok": False, "error": "Unknown or expired job."}, status_code=404)
+
+    body = {"ok": True, "state": job.get("state"), "db_name": job.get("db_name")}
+    if job.get("modules"):
+        body["modules"] = json.loads(job["modules"])
+    if job.get("state") == "succeeded":
+        # ✅ Success path -> manager of the backend that hosts it (edition default otherwise)
+        is_enterprise = job.get("edition") == "Enterprise"
+        invalidate_db_list(ODOO_ENTERPRISE_INTERNAL if is_enterprise else ODOO_COMMUNITY_INTERNAL)
+        body["redirect"] = job.get("redirect") or _edition_targets(is_enterprise)[1]
+    elif job.get("state") == "waiting" and job.get("position"):
+        body["position"] = int(job["position"])
+    elif job.get("state") == "failed":
+        body["error"] = job.get("error") or "Database creation failed."
+    resp = JSONResponse(body)
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
 
-    # Final verification after creation attempt
-    existing = await list_databases(odoo_internal)
-    if safe_name in existing:
-        # ✅ Success path -> edition's /web/database/manager
-        _, manager_url = _edition_targets(is_enterprise)
-        return JSONResponse({"ok": True, "redirect": manager_url})
+def _encode_cursor(row: ClientInfo) -> str:
+    """Opaque keyset cursor for the row after which the next page starts."""
+    raw = f"{row.created_at.isoformat()}|{row.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-    return JSONResponse({"ok": False, "error": f"Odoo error HTTP {r.status_code}"}, status_code=502)
+def _decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """Inverse of _encode_cursor; None for anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, _, row_id = raw.partition("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError:
+        return None
 
 @app.get("/admin/clients")
-async def admin_clients(request: Request):
-    """Admin view to list all clients."""
-    db = SessionLocal()
+async def admin_clients(
+    request: Request,
+    edition: str = "",      # "Community" / "Enterprise"; empty = all
+    email: str = "",        # case-insensitive prefix
+    cursor: str = "",       # keyset cursor from the previous page
+    limit: int = ADMIN_PAGE_SIZE,
+):
+    """Admin view: newest clients first, keyset-paginated and filterable."""
+    limit = max(1, min(limit, 500))
+    query = select(ClientInfo)
+    if edition.strip():
+        query = query.where(ClientInfo.odoo_edition == edition.strip())
+    if email.strip():
+        # Escape LIKE wildcards so the prefix is matched literally
+        prefix = email.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.where(func.lower(ClientInfo.admin_email).like(prefix + "%", escape="\\"))
+    position = _decode_cursor(cursor) if cursor else None
+    if position:
+        query = query.where(tuple_(ClientInfo.created_at, ClientInfo.id) < tuple_(*position))
+    query = query.order_by(ClientInfo.created_at.desc(), ClientInfo.id.desc()).limit(limit + 1)
+
+    async with SessionLocal() as db:
+        rows = list((await db.scalars(query)).all())
+
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return templates.TemplateResponse(
+        "admin_clients.html",
+        {
+            "request": request,
+            "clients": rows[:limit],
+            "filters": {"edition": edition.strip(), "email": email.strip(), "limit": limit},
+            "next_cursor": next_cursor,
+            "is_first_page": not position,
+        },
+    )
+
+@app.post("/admin/clients/import")
+async def admin_import_clients(
+    request: Request,
+    file: UploadFile = File(...),               # .csv (header row) or .jsonl
+    parallelism: int = Form(BULK_PARALLELISM),  # max jobs of this batch in flight
+):
+    """
+    Bulk tenant import. All rows are validated before anything is written; any
+    error rejects the whole file with a per-line report (400).
+    Returns JSON: { ok, batch_id, jobs: [{db_name, job_id, generated_password?}] }
+    """
+    content = await file.read()
     try:
-        rows = db.query(ClientInfo).all()
-    finally:
-        db.close()
-    return templates.TemplateResponse("admin_clients.html", {"request": request, "clients": rows})
+        content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return JSONResponse({"ok": False, "error": "File must be UTF-8 encoded."}, status_code=400)
+
+    # Names already taken: intake DB + both Odoo editions (one listing each, cached)
+    listings = await asyncio.gather(
+        list_databases(ODOO_COMMUNITY_INTERNAL), list_databases(ODOO_ENTERPRISE_INTERNAL),
+    )
+    existing = {name for names in listings for name in names}
+    candidates = candidate_db_names(file.filename or "", content)
+    if candidates:
+        async with SessionLocal() as db:
+            taken = await db.scalars(select(ClientInfo.db_name).where(ClientInfo.db_name.in_(candidates)))
+            existing.update(taken.all())
+
+    rows, errors = parse_and_validate(file.filename or "", content, existing)
+    if errors:
+        return JSONResponse({"ok": False, "error": "Validation failed; nothing was imported.", "lines": errors},
+                            status_code=400)
+    if not rows:
+        return JSONResponse({"ok": False, "error": "The file has no rows."}, status_code=400)
+
+    async with SessionLocal() as db:
+        await db.execute(insert(ClientInfo), [
+            {k: row[k] for k in ("company_name", "admin_email", "odoo_edition", "db_name")} for row in rows
+        ])
+        await db.commit()
+
+    parallelism = max(1, min(parallelism, 50))
+    batch_id, summary = await create_batch(rows, parallelism, request.state.request_id)
+    try:
+        await enqueue("tasks.dispatch_batch", batch_id)
+    except Exception:
+        # Batch is recorded; POST /admin/batches/{id}/resume starts it once the broker is back
+        return JSONResponse({"ok": False, "batch_id": batch_id, "jobs": summary,
+                             "error": "Provisioning queue unavailable; resume the batch later."}, status_code=503)
+    return JSONResponse({"ok": True, "batch_id": batch_id, "jobs": summary}, status_code=202)
+
+@app.get("/admin/batches/{batch_id}")
+async def admin_batch_status(batch_id: str):
+    """Progress of a bulk import: counts per job state plus the failed rows."""
+    progress = await batch_progress(batch_id)
+    if progress is None:
+        return JSONResponse({"ok": False, "error": "Unknown or expired batch."}, status_code=404)
+    resp = JSONResponse({"ok": True, **progress})
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+@app.post("/admin/batches/{batch_id}/resume")
+async def admin_batch_resume(batch_id: str):
+    """Re-queue failed (or never started) jobs of a batch and restart its dispatch."""
+    if await batch_progress(batch_id) is None:
+        return JSONResponse({"ok": False, "error": "Unknown or expired batch."}, status_code=404)
+    requeued = await prepare_resume(batch_id)
+    try:
+        await enqueue("tasks.dispatch_batch", batch_id)
+    except Exception:
+        return JSONResponse({"ok": False, "error": "Provisioning queue unavailable. Please try again."},
+                            status_code=503)
+    return JSONResponse({"ok": True, "batch_id": batch_id, "requeued": requeued}, status_code=202)
 
 @app.get("/error")
 async def error(request: Request):
     """Generic error page."""
     return templates.TemplateResponse("error.html", {"request": request})
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint (keep it off the public vhost)."""
+    try:
+        for queue, depth in (await queue_depths()).items():
+            QUEUE_DEPTH.labels(queue).set(depth)
+    except Exception:
+        pass  # Redis down: still serve the rest
+    payload, content_type = render_latest()
+    return Response(payload, media_type=content_type)
+
 @app.get("/healthz")
 async def healthz():
     """Liveness probe."""
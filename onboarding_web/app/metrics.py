@@ -0,0 +1,85 @@
+# onboarding_web/app/metrics.py
+"""
+Prometheus metrics for the onboarding gateway (served on /metrics).
+
+With several uvicorn workers set PROMETHEUS_MULTIPROC_DIR to an empty, writable
+directory so every worker's samples are aggregated on scrape.
+
+Metric names are shared with the worker (onboarding_worker/tasks/metrics.py)
+where they mean the same thing, e.g. onboard_odoo_call_duration_seconds.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    "onboard_http_request_duration_seconds",
+    "Gateway request latency by route template.",
+    ["method", "route", "status"],
+)
+ODOO_CALL_LATENCY = Histogram(
+    "onboard_odoo_call_duration_seconds",
+    "Latency of calls to Odoo by endpoint.",
+    ["endpoint", "outcome"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+DB_LIST_CACHE = Counter(
+    "onboard_db_list_cache_total",
+    "/web/database/list cache lookups.",
+    ["outcome"],  # hit | miss
+)
+NONCE_CHECKS = Counter(
+    "onboard_nonce_checks_total",
+    "One-time nonce outcomes.",
+    ["outcome"],  # issued | accepted | rejected
+)
+IDEMPOTENCY_CHECKS = Counter(
+    "onboard_idempotency_checks_total",
+    "Does-the-database-already-exist checks before queueing.",
+    ["step", "outcome"],  # step: create_page | api ; outcome: exists | new
+)
+JOBS_ENQUEUED = Counter(
+    "onboard_jobs_enqueued_total",
+    "Provisioning jobs handed to the worker.",
+    ["edition", "outcome"],  # queued | broker_error
+)
+QUEUE_DEPTH = Gauge(
+    "onboard_queue_depth",
+    "Pending messages in the Celery queue / jobs waiting for an Odoo slot.",
+    ["queue"],
+    multiprocess_mode="max",
+)
+
+
+@contextmanager
+def odoo_call(endpoint: str):
+    """Time an Odoo call; the outcome label is "error" if the block raises."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        ODOO_CALL_LATENCY.labels(endpoint, outcome).observe(time.perf_counter() - started)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition payload + content type (aggregated across workers in multiprocess mode)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,103 @@
+# onboarding_web/app/state.py
+"""
+Pluggable nonce + per-browser session state for the onboarding gateway.
+
+STATE_BACKEND selects the implementation:
+    redis  (default) shared by every uvicorn worker/replica; nonces are consumed
+           atomically with GETDEL, so a refresh/double-click on any replica
+           can only ever create one database.
+    memory single-process dicts (local development only).
+
+Sessions are keyed by an opaque browser cookie (see SESSION_COOKIE in main.py),
+so concurrent users no longer overwrite each other's last_db_name.
+"""
+
+import os
+import secrets
+import time
+
+import redis.asyncio as aioredis
+
+STATE_BACKEND = os.getenv("STATE_BACKEND", "redis").strip().lower()
+REDIS_URL     = os.getenv("REDIS_URL", "redis://redis:6379/0")
+SESSION_TTL   = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+NONCE_KEY_FMT   = "onboard:nonce:{nonce}"
+SESSION_KEY_FMT = "onboard:sess:{sid}"
+
+
+class MemoryStateBackend:
+    """In-process state; only correct with a single uvicorn worker."""
+
+    def __init__(self):
+        self._nonces: dict[str, float] = {}                           # {nonce: expiry}
+        self._sessions: dict[str, tuple[float, dict[str, str]]] = {}  # {sid: (expiry, values)}
+
+    def _clean(self) -> None:
+        now = time.time()
+        for k, v in list(self._nonces.items()):
+            if v < now:
+                self._nonces.pop(k, None)
+        for k, (exp, _) in list(self._sessions.items()):
+            if exp < now:
+                self._sessions.pop(k, None)
+
+    async def issue_nonce(self, ttl: int) -> str:
+        self._clean()
+        nonce = secrets.token_urlsafe(24)
+        self._nonces[nonce] = time.time() + ttl
+        return nonce
+
+    async def consume_nonce(self, nonce: str) -> bool:
+        self._clean()
+        return self._nonces.pop(nonce, None) is not None
+
+    async def get_session(self, sid: str) -> dict[str, str]:
+        self._clean()
+        entry = self._sessions.get(sid)
+        return dict(entry[1]) if entry else {}
+
+    async def update_session(self, sid: str, **values: str) -> None:
+        self._clean()
+        current = self._sessions.get(sid, (0, {}))[1]
+        current.update({k: v for k, v in values.items() if v is not None})
+        self._sessions[sid] = (time.time() + SESSION_TTL, current)
+
+
+class RedisStateBackend:
+    """Redis state shared across workers/replicas; every key carries a TTL."""
+
+    def __init__(self, url: str = REDIS_URL):
+        self._redis = aioredis.Redis.from_url(url, decode_responses=True)
+
+    async def issue_nonce(self, ttl: int) -> str:
+        while True:
+            nonce = secrets.token_urlsafe(24)
+            # NX: never overwrite (and thereby revive) an existing nonce
+            if await self._redis.set(NONCE_KEY_FMT.format(nonce=nonce), "1", ex=ttl, nx=True):
+                return nonce
+
+    async def consume_nonce(self, nonce: str) -> bool:
+        # GETDEL is atomic: of two concurrent consumers exactly one sees the value
+        return await self._redis.getdel(NONCE_KEY_FMT.format(nonce=nonce)) is not None
+
+    async def get_session(self, sid: str) -> dict[str, str]:
+        return await self._redis.hgetall(SESSION_KEY_FMT.format(sid=sid))
+
+    async def update_session(self, sid: str, **values: str) -> None:
+        mapping = {k: v for k, v in values.items() if v is not None}
+        key = SESSION_KEY_FMT.format(sid=sid)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+            pipe.expire(key, SESSION_TTL)
+            await pipe.execute()
+
+
+def get_state_backend():
+    """Build the backend selected by STATE_BACKEND."""
+    if STATE_BACKEND == "memory":
+        return MemoryStateBackend()
+    if STATE_BACKEND == "redis":
+        return RedisStateBackend()
+    raise ValueError(f"Unknown STATE_BACKEND {STATE_BACKEND!r} (expected 'redis' or 'memory')")
@@ -0,0 +1 @@
+# Makes the `tasks` package importable when running `pytest` from the worker directory.
@@ -1,17 +1,259 @@
+import os
+import time
+
 from celery import Celery
-        from .odoo_provision import provision_odoo_company
-
-        app = Celery("tasks", broker="redis://redis:6379/0")
-
-        @app.task
-        def create_odoo_company(data):
-            result = provision_odoo_company(
-                host="odoo_enterprise",
-                port=8069,
-                db="Savanna",
-                user="admin",
-                password="admin",
-                company_name=data["company_name"],
-                modules=data["modules"]
+from celery.exceptions import Retry
+from celery.signals import worker_init, worker_process_shutdown, worker_ready
+
+from .jobs import get_job, update_job
+from .metrics import (
+    JOB_DURATION,
+    JOB_QUEUE_WAIT,
+    JOB_WAIT_RETRIES,
+    MODULE_INSTALL,
+    MODULE_STATES,
+    TEMPLATE_CLONES,
+    mark_process_dead,
+    start_metrics_server,
+)
+from .odoo_provision import (
+    create_odoo_database,
+    drop_odoo_database,
+    duplicate_odoo_database,
+    install_database_modules,
+    list_databases,
+    provision_odoo_company,
+    rekey_odoo_database,
+)
+from . import batches, scheduler, templates
+
+app = Celery("tasks", broker=os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0"))
+app.conf.update(
+    task_acks_late=True,              # a crashed worker re-delivers the job instead of losing it
+    worker_prefetch_multiplier=1,     # DB creation is long; don't hoard jobs on one worker
+    beat_schedule={
+        "warm-template-pool": {
+            "task": "tasks.warm_template_pool",
+            "schedule": float(os.getenv("TEMPLATE_POOL_WARM_INTERVAL", "600")),
+        },
+    },
+)
+
+# How often a job waiting for a free Odoo backend re-checks (its FIFO position is kept)
+SCHEDULER_RETRY_SECONDS = int(os.getenv("SCHEDULER_RETRY_SECONDS", "5"))
+
+
+@app.task
+def create_odoo_company(data, job_id=None):
+    db = data.get("db", "Savanna")
+    backend = scheduler.locate_database(db, data.get("edition"))
+    if backend is None:
+        raise RuntimeError(f"Database {db} not found on any Odoo backend")
+    host, _, port = backend.url.split("://", 1)[-1].partition(":")
+    started = time.time()
+    result = provision_odoo_company(
+        host=host,
+        port=int(port or 8069),
+        db=db,
+        user=data.get("user", "admin"),
+        password=data.get("password", "admin"),
+        company_name=data["company_name"],
+        modules=data["modules"]
+    )
+    if job_id:
+        update_job(job_id, modules=result["modules"], modules_seconds=f"{time.time() - started:.1f}")
+    print(f"Provisioned: {result}")
+
+
+def _clone_from_template(job_id, backend, data):
+    """
+    Fast path: clone a pre-warmed template and re-key it.
+    Returns True when the database is ready, False when no template applies
+    (caller falls back to a full /web/database/create).
+    """
+    if data["demo"]:
+        return False  # templates are built without demo data
+    odoo_internal = backend.url
+    if data["db_name"] in list_databases(odoo_internal):
+        return False  # re-delivered job: the create path handles "already exists"
+    template = templates.acquire_template(backend, backend.edition, data["lang"], data.get("modules") or [], job_id)
+    if not template:
+        TEMPLATE_CLONES.labels("no_template").inc()
+        return False
+
+    update_job(job_id, template=template)
+    try:
+        duplicate_odoo_database(odoo_internal, template, data["db_name"])
+    except Exception as e:
+        print(f"Job {job_id}: clone of {template} failed ({e}); falling back to full create")
+        TEMPLATE_CLONES.labels("clone_failed").inc()
+        drop_odoo_database(odoo_internal, data["db_name"])  # in case a half-finished clone landed
+        return False
+    finally:
+        templates.release_template(backend, template, job_id)
+
+    try:
+        rekey_odoo_database(
+            odoo_internal, data["db_name"],
+            template_login=templates.TEMPLATE_ADMIN_LOGIN,
+            template_password=templates.TEMPLATE_ADMIN_PASSWORD,
+            admin_login=data["admin_login"],
+            password=data["db_password"],
+            company_name=data.get("company_name"),
+            country=data["country"],
+            phone=data["phone"],
+        )
+    except Exception as e:
+        # Never leave a clone behind that still opens with the template password
+        print(f"Job {job_id}: re-key of {data['db_name']} failed ({e}); dropping clone")
+        TEMPLATE_CLONES.labels("rekey_failed").inc()
+        drop_odoo_database(odoo_internal, data["db_name"])
+        return False
+    TEMPLATE_CLONES.labels("cloned").inc()
+    return True
+
+
+def _install_job_modules(job_id, backend, data, modules):
+    """Batch-install the requested apps and record per-module state on the job."""
+    update_job(job_id, modules={m: "to install" for m in modules})
+    started = time.time()
+    states = install_database_modules(
+        backend.url, data["db_name"], data["admin_login"], data["db_password"], modules,
+    )
+    MODULE_INSTALL.labels(backend.name).observe(time.time() - started)
+    for state in states.values():
+        MODULE_STATES.labels(state).inc()
+    update_job(job_id, modules=states, modules_seconds=f"{time.time() - started:.1f}")
+    missing = [m for m, st in states.items() if st != "installed"]
+    if missing:
+        raise RuntimeError(f"Modules not installed: {', '.join(missing)}")
+
+
+@app.task(name="tasks.create_database_job", bind=True, max_retries=None)
+def create_database_job(self, job_id, data):
+    """
+    Run one provisioning job (see _run_database_job). Jobs from a bulk import
+    carry a batch_id; their final outcome frees a slot in the batch window.
+    A scheduler retry (celery Retry) propagates before the batch hook; any other
+    error fails the job, so it neither stays in flight nor holds its batch slot.
+    """
+    try:
+        result = _run_database_job(self, job_id, data)
+    except Retry:
+        raise
+    except Exception as e:
+        print(f"Job {job_id}: unexpected error ({e}); marking it failed")
+        try:
+            update_job(job_id, state="failed", error=str(e), finished_at=str(time.time()))
+            if data.get("batch_id"):
+                batches.job_finished(app, data["batch_id"], job_id, False)
+        except Exception as hook_error:
+            print(f"Job {job_id}: could not record the failure ({hook_error})")
+        raise
+    if data.get("batch_id"):
+        batches.job_finished(app, data["batch_id"], job_id, result["ok"])
+    return result
+
+
+def _run_database_job(task, job_id, data):
+    """
+    Create a client database for the onboarding web and record progress on the job.
+    `data` is the validated payload from /api/create-db (includes the admin password,
+    which is only carried through the broker, never stored on the job).
+
+    The scheduler picks the backend; when every backend of the edition is at its
+    creation cap the job waits (state=waiting, FIFO position on the job) and
+    re-checks every SCHEDULER_RETRY_SECONDS. Uses a pre-warmed template when one
+    matches, otherwise a full create.
+    """
+    edition = "Enterprise" if (data.get("edition") or "").lower().startswith("enter") else "Community"
+
+    # Idempotent across nodes: a re-delivered or duplicate job finds the DB wherever it landed
+    existing = scheduler.locate_database(data["db_name"], edition)
+    if existing:
+        scheduler.leave_queue(edition, job_id)
+        update_job(job_id, state="succeeded", backend=existing.name,
+                   redirect=existing.manager_url, finished_at=str(time.time()))
+        return {"ok": True}
+
+    backend, position = scheduler.place(edition, job_id)
+    if backend is None:
+        if task.request.retries * SCHEDULER_RETRY_SECONDS > scheduler.QUEUE_MAX_WAIT:
+            scheduler.leave_queue(edition, job_id)
+            update_job(job_id, state="failed", error="No Odoo capacity available, please try again later.",
+                       finished_at=str(time.time()))
+            return {"ok": False, "error": "no capacity"}
+        JOB_WAIT_RETRIES.labels(edition).inc()
+        update_job(job_id, state="waiting", position=position)
+        raise task.retry(countdown=SCHEDULER_RETRY_SECONDS)
+
+    odoo_internal = backend.url
+    started = time.time()
+    trace = "-"
+    method = "create"
+    try:
+        job = get_job(job_id)
+        trace = job.get("trace_id", "-")
+        if job.get("created_at"):
+            JOB_QUEUE_WAIT.observe(max(0.0, started - float(job["created_at"])))
+        update_job(job_id, state="running", position="", started_at=str(started),
+                   backend=backend.name, redirect=backend.manager_url)
+        if _clone_from_template(job_id, backend, data):
+            method = "template"
+            update_job(job_id, method=method)
+        else:
+            update_job(job_id, method=method)
+            create_odoo_database(
+                odoo_internal,
+                db_name=data["db_name"],
+                admin_login=data["admin_login"],
+                password=data["db_password"],
+                lang=data["lang"],
+                country=data["country"],
+                phone=data["phone"],
+                demo=data["demo"],
             )
-            print(f"Provisioned: {result}")
\ No newline at end of file
+        modules = data.get("modules") or []
+        if modules:
+            _install_job_modules(job_id, backend, data, modules)
+    except Exception as e:
+        JOB_DURATION.labels(method, "failed", backend.name).observe(time.time() - started)
+        update_job(job_id, state="failed", error=str(e), finished_at=str(time.time()))
+        print(f"Job {job_id} [trace {trace}]: creating {data['db_name']} on {backend.name} failed: {e}")
+        return {"ok": False, "error": str(e)}
+    finally:
+        scheduler.release(backend, job_id)
+
+    JOB_DURATION.labels(method, "succeeded", backend.name).observe(time.time() - started)
+    update_job(job_id, state="succeeded", finished_at=str(time.time()))
+    print(f"Job {job_id} [trace {trace}]: created {data['db_name']} on {backend.name} "
+          f"via {method} in {time.time() - started:.1f}s")
+    return {"ok": True}
+
+
+@app.task(name="tasks.dispatch_batch")
+def dispatch_batch(batch_id):
+    """Start (or resume) a bulk-import batch: fill its window of in-flight jobs."""
+    return batches.dispatch(app, batch_id)
+
+
+@app.task(name="tasks.warm_template_pool")
+def warm_template_pool():
+    """Create/repair the configured template databases (runs on beat + worker start)."""
+    return templates.warm_pool(scheduler.BACKENDS)
+
+
+@worker_init.connect
+def _start_metrics(**kwargs):
+    start_metrics_server()
+
+
+@worker_process_shutdown.connect
+def _metrics_process_gone(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+
+@worker_ready.connect
+def _warm_on_start(sender=None, **kwargs):
+    if templates.parse_specs():
+        sender.app.send_task("tasks.warm_template_pool")
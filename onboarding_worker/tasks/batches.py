@@ -0,0 +1,58 @@
+# onboarding_worker/tasks/batches.py
+"""
+Bounded fan-out for bulk imports (batches recorded by onboarding_web/app/bulk.py).
+
+A batch keeps at most `parallelism` of its jobs handed to the worker pool at a
+time: dispatch() fills the window from the batch's pending list, and every job
+that reaches a final state calls job_finished(), which frees its window slot and
+dispatches the next one. The payload of a job is only deleted once it succeeds,
+so failed jobs can be resumed from the admin API.
+"""
+
+import json
+
+from .jobs import get_redis, update_job
+
+BATCH_KEY_FMT = "onboard:batch:{batch_id}"
+
+
+def _keys(batch_id):
+    base = BATCH_KEY_FMT.format(batch_id=batch_id)
+    return base, f"{base}:pending", f"{base}:payloads"
+
+
+def dispatch(app, batch_id):
+    """Hand pending jobs to the pool until the batch's window is full. Returns how many."""
+    r = get_redis()
+    meta_key, pending_key, payloads_key = _keys(batch_id)
+    parallelism = int(r.hget(meta_key, "parallelism") or 1)
+    sent = 0
+    while True:
+        # Reserve a window slot first so concurrent dispatchers can't overshoot
+        if r.hincrby(meta_key, "in_flight", 1) > parallelism:
+            r.hincrby(meta_key, "in_flight", -1)
+            break
+        job_id = r.lpop(pending_key)
+        if job_id is None:
+            r.hincrby(meta_key, "in_flight", -1)
+            break
+        payload = r.hget(payloads_key, job_id)
+        if payload is None:
+            r.hincrby(meta_key, "in_flight", -1)
+            update_job(job_id, state="failed", error="Batch payload expired; re-import this row.")
+            continue
+        update_job(job_id, state="queued")
+        app.send_task("tasks.create_database_job", args=[job_id, json.loads(payload)])
+        sent += 1
+    return sent
+
+
+def job_finished(app, batch_id, job_id, ok):
+    """Called once per job on a final outcome: free its slot and keep the batch moving."""
+    r = get_redis()
+    meta_key, _, payloads_key = _keys(batch_id)
+    if ok:
+        r.hdel(payloads_key, job_id)  # the admin password is no longer needed
+    if r.hincrby(meta_key, "in_flight", -1) < 0:
+        r.hset(meta_key, "in_flight", 0)
+    dispatch(app, batch_id)
@@ -0,0 +1,48 @@
+# onboarding_worker/tasks/jobs.py
+"""
+Redis-backed job records for provisioning tasks.
+
+Each job lives in a Redis hash at ``onboard:job:<job_id>`` and is shared with
+the onboarding web, which creates the record (state=queued) and serves it on
+/api/jobs/{id}. The worker only moves it forward:
+
+    queued -> running -> succeeded | failed
+
+Secrets (database password, master password) are never written here.
+"""
+
+import json
+import os
+import time
+
+import redis
+
+REDIS_URL   = os.getenv("REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0"))
+JOB_TTL     = int(os.getenv("JOB_TTL_SECONDS", "86400"))  # keep finished jobs for a day
+JOB_KEY_FMT = "onboard:job:{job_id}"
+
+_client: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Process-wide Redis client (lazy; safe after Celery forks)."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    return _client
+
+
+def update_job(job_id: str, **fields) -> None:
+    """Merge fields into the job hash and refresh its TTL. Non-str values are JSON-encoded."""
+    key = JOB_KEY_FMT.format(job_id=job_id)
+    mapping = {k: v if isinstance(v, str) else json.dumps(v) for k, v in fields.items() if v is not None}
+    mapping["updated_at"] = str(time.time())
+    pipe = get_redis().pipeline()
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, JOB_TTL)
+    pipe.execute()
+
+
+def get_job(job_id: str) -> dict[str, str]:
+    """Return the raw job hash ({} if unknown/expired)."""
+    return get_redis().hgetall(JOB_KEY_FMT.format(job_id=job_id))
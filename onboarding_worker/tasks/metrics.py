@@ -0,0 +1,89 @@
+# onboarding_worker/tasks/metrics.py
+"""
+Prometheus metrics for the provisioning worker.
+
+Celery's prefork pool runs tasks in child processes, so metrics use the
+prometheus_client multiprocess mode: set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory and the parent process serves the aggregate on
+WORKER_METRICS_PORT (see start_metrics_server, wired to worker_init).
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess, start_http_server
+
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "9100"))
+
+_LONG_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1200, 1800)
+
+JOB_DURATION = Histogram(
+    "onboard_job_duration_seconds",
+    "Provisioning job run time (slot acquired -> finished).",
+    ["method", "outcome", "backend"],  # method: template | create
+    buckets=_LONG_BUCKETS,
+)
+JOB_QUEUE_WAIT = Histogram(
+    "onboard_job_queue_wait_seconds",
+    "Time from the web queueing a job to the worker starting it (incl. waiting for a slot).",
+    buckets=_LONG_BUCKETS,
+)
+JOB_WAIT_RETRIES = Counter(
+    "onboard_job_wait_retries_total",
+    "Times a job found every backend of its edition at the creation cap.",
+    ["edition"],
+)
+MODULE_INSTALL = Histogram(
+    "onboard_module_install_duration_seconds",
+    "Batched module installation time per job.",
+    ["backend"],
+    buckets=_LONG_BUCKETS,
+)
+MODULE_STATES = Counter(
+    "onboard_module_install_total",
+    "Requested modules by resulting state.",
+    ["state"],
+)
+ODOO_CALL_LATENCY = Histogram(
+    "onboard_odoo_call_duration_seconds",
+    "Latency of calls to Odoo by endpoint.",
+    ["endpoint", "outcome"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+TEMPLATE_CLONES = Counter(
+    "onboard_template_clones_total",
+    "Template fast-path outcomes.",
+    ["outcome"],  # cloned | no_template | clone_failed | rekey_failed
+)
+
+
+@contextmanager
+def odoo_call(endpoint):
+    """Time an Odoo call; the outcome label is "error" if the block raises."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        ODOO_CALL_LATENCY.labels(endpoint, outcome).observe(time.perf_counter() - started)
+
+
+def start_metrics_server():
+    """Serve aggregated metrics from the worker's parent process (no-op without multiproc dir)."""
+    mp_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not mp_dir:
+        return
+    # Must be empty at start (compose mounts a tmpfs) or stale samples get summed in
+    os.makedirs(mp_dir, exist_ok=True)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(WORKER_METRICS_PORT, registry=registry)
+
+
+def mark_process_dead(pid):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -1,5 +1,196 @@
+import os
+from urllib.parse import urlsplit
+
+import httpx
 import odoorpc
 
+from .metrics import odoo_call
+
+# Odoo master password (read from .env; never written to job records)
+ODOO_MASTER_PASSWORD = os.getenv("MASTER_PASSWORD", "admin")
+
+# /web/database/create installs base + lang from scratch; give it room
+ODOO_CREATE_TIMEOUT = float(os.getenv("ODOO_CREATE_TIMEOUT", "600"))
+
+_http = None
+
+
+def _client():
+    """Per-process keep-alive client for Odoo calls (lazy, so each forked worker gets its own)."""
+    global _http
+    if _http is None:
+        _http = httpx.Client(timeout=30, headers={"User-Agent": "onboard-worker/1.0"})
+    return _http
+
+
+def fetch_databases(odoo_base):
+    """
+    DB listing for Odoo 17/18 (JSON-RPC body, then legacy empty-form POST).
+    Returns None on any error, so callers can tell "unreachable" from "empty".
+    """
+    url = f"{odoo_base}/web/database/list"
+    try:
+        with odoo_call("/web/database/list"):
+            r = _client().post(url, json={"jsonrpc": "2.0", "method": "call", "params": {}})
+            if r.status_code == 200:
+                j = r.json()
+                if isinstance(j, dict) and isinstance(j.get("result"), list):
+                    return j["result"]
+            r = _client().post(url, data={})
+            if r.status_code == 200:
+                j = r.json()
+                if isinstance(j, dict) and isinstance(j.get("result"), list):
+                    return j["result"]
+    except Exception:
+        pass
+    return None
+
+
+def list_databases(odoo_base):
+    """DB names on an Odoo instance; [] on any error (same contract as the web helper)."""
+    return fetch_databases(odoo_base) or []
+
+
+def create_odoo_database(odoo_base, db_name, admin_login, password, lang, country, phone, demo):
+    """
+    Create a database through Odoo's /web/database/create and verify it exists.
+    Idempotent: returns True straight away if the database is already listed.
+    Raises RuntimeError with a user-presentable message on failure.
+    """
+    if db_name in list_databases(odoo_base):
+        return True
+
+    payload = {
+        "master_pwd": ODOO_MASTER_PASSWORD,
+        "name": db_name,
+        "login": admin_login,
+        "password": password,
+        "lang": lang,
+        "country_code": country,
+        "phone": phone,
+        "demo": "true" if demo else "false",
+    }
+    try:
+        with odoo_call("/web/database/create"):
+            r = _client().post(
+                f"{odoo_base}/web/database/create", data=payload,
+                timeout=ODOO_CREATE_TIMEOUT, follow_redirects=True,
+            )
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Network error to Odoo: {e}") from e
+
+    # Final verification after creation attempt
+    if db_name in list_databases(odoo_base):
+        return True
+    raise RuntimeError(f"Odoo error HTTP {r.status_code}")
+
+
+def duplicate_odoo_database(odoo_base, template_name, db_name):
+    """
+    Clone `template_name` into `db_name` through Odoo's /web/database/duplicate.
+    Odoo runs CREATE DATABASE ... TEMPLATE, copies the filestore and resets the
+    database uuid/secret, so the clone is a distinct instance.
+    Raises RuntimeError on failure.
+    """
+    payload = {
+        "master_pwd": ODOO_MASTER_PASSWORD,
+        "name": template_name,
+        "new_name": db_name,
+    }
+    try:
+        with odoo_call("/web/database/duplicate"):
+            r = _client().post(
+                f"{odoo_base}/web/database/duplicate", data=payload,
+                timeout=ODOO_CREATE_TIMEOUT, follow_redirects=True,
+            )
+    except httpx.RequestError as e:
+        raise RuntimeError(f"Network error to Odoo: {e}") from e
+
+    if db_name in list_databases(odoo_base):
+        return True
+    raise RuntimeError(f"Odoo duplicate error HTTP {r.status_code}")
+
+
+def drop_odoo_database(odoo_base, db_name):
+    """Drop a database through /web/database/drop (best effort; errors are swallowed)."""
+    try:
+        with odoo_call("/web/database/drop"):
+            _client().post(
+                f"{odoo_base}/web/database/drop",
+                data={"master_pwd": ODOO_MASTER_PASSWORD, "name": db_name},
+                timeout=ODOO_CREATE_TIMEOUT, follow_redirects=True,
+            )
+    except httpx.RequestError:
+        pass
+
+
+def _connect(odoo_base, db, user, password):
+    """odoorpc session on `db` for an internal base URL like http://odoo_enterprise:8069."""
+    parts = urlsplit(odoo_base)
+    protocol = "jsonrpc+ssl" if parts.scheme == "https" else "jsonrpc"
+    odoo = odoorpc.ODOO(parts.hostname, protocol=protocol, port=parts.port or 8069, timeout=ODOO_CREATE_TIMEOUT)
+    odoo.login(db, user, password)
+    return odoo
+
+
+def install_modules(odoo, modules):
+    """
+    Install `modules` in one go: a single search_read resolves every name, then one
+    button_immediate_install on the combined recordset lets Odoo resolve dependencies
+    and reload the registry once instead of once per module.
+    Returns {module: state} where state is Odoo's module state after the install
+    ("installed", ...) or "not found".
+    """
+    modules = list(dict.fromkeys(modules))  # dedupe, keep order
+    if not modules:
+        return {}
+    Module = odoo.env['ir.module.module']
+    found = Module.search_read([('name', 'in', modules)], ['name', 'state'])
+    pending = [m['id'] for m in found if m['state'] in ('uninstalled', 'to install')]
+    if pending:
+        with odoo_call("ir.module.module/button_immediate_install"):
+            Module.button_immediate_install(pending)
+        found = Module.search_read([('name', 'in', modules)], ['name', 'state'])
+    states = {m['name']: m['state'] for m in found}
+    return {name: states.get(name, "not found") for name in modules}
+
+
+def prepare_template_database(odoo_base, db, user, password, modules):
+    """Install `modules` into a freshly created template database."""
+    odoo = _connect(odoo_base, db, user, password)
+    states = install_modules(odoo, modules)
+    print(f"Template {db}: modules {states}")
+    return states
+
+
+def install_database_modules(odoo_base, db, user, password, modules):
+    """Log in to a client database and batch-install `modules` (see install_modules)."""
+    return install_modules(_connect(odoo_base, db, user, password), modules)
+
+
+def rekey_odoo_database(odoo_base, db, template_login, template_password,
+                        admin_login, password, company_name, country, phone):
+    """
+    Turn a database cloned from a template into the client's own: replace the
+    template admin's login/password and set the main company's name, country and phone.
+    """
+    odoo = _connect(odoo_base, db, template_login, template_password)
+
+    values = {'login': admin_login, 'password': password}
+    if "@" in admin_login:
+        values['email'] = admin_login
+    odoo.env['res.users'].browse(odoo.env.uid).write(values)
+
+    company_vals = {'phone': phone or False}
+    if company_name:
+        company_vals['name'] = company_name
+    country_ids = odoo.env['res.country'].search([('code', '=', (country or '').upper())], limit=1)
+    if country_ids:
+        company_vals['country_id'] = country_ids[0]
+    odoo.env['res.company'].browse(odoo.env.user.company_id.id).write(company_vals)
+    return True
+
+
 def provision_odoo_company(host, port, db, user, password, company_name, modules):
     odoo = odoorpc.ODOO(host, port=port)
     odoo.login(db, user, password)
@@ -8,12 +199,7 @@ def provision_odoo_company(host, port, db, user, password, company_name, modules
     new_company = Company.create({'name': company_name})
     print(f"Created company: {company_name} with ID {new_company}")
 
-    Module = odoo.env['ir.module.module']
-    for module in modules:
-        ids = Module.search([('name', '=', module), ('state', '=', 'uninstalled')])
-        if ids:
-            Module.button_install(ids)
-            print(f"Installing module: {module}")
-        else:
-            print(f"Module {module} not found or already installed.")
-    return {"company_id": new_company, "modules": modules}
+    states = install_modules(odoo, modules)
+    for module, state in states.items():
+        print(f"Module {module}: {state}")
+    return {"company_id": new_company, "modules": states}
@@ -0,0 +1,185 @@
+# onboarding_worker/tasks/scheduler.py
+"""
+Multi-node placement for new tenant databases.
+
+Backends (one Odoo + its Postgres each) are declared per edition in ODOO_BACKENDS,
+a JSON list:
+    [{"name": "ent1", "edition": "Enterprise",
+      "url": "http://odoo_enterprise:8069",              # internal (worker -> Odoo)
+      "external": "https://enter.savannasolutions.co.zm", # browser-facing
+      "max_concurrent": 2,                               # DB creations in flight
+      "weight": 1},                                      # relative capacity
+     ...]
+If unset, one backend per edition is derived from ODOO_COMMUNITY_URL /
+ODOO_ENTERPRISE_URL (+ *_EXTERNAL) with ODOO_MAX_CONCURRENT_CREATES slots.
+
+Placement: among reachable backends with a free slot, pick the one with the
+lowest (in-flight / max_concurrent, databases / weight).
+
+Concurrency caps are Redis counting semaphores (one sorted set of holders per
+backend, entries expire after SLOT_TIMEOUT so a crashed worker can't leak a slot).
+Jobs that find every backend busy wait in a per-edition FIFO (sorted set scored by
+first arrival); only the oldest waiters may take a freed slot, so retries can't
+jump the queue.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from .jobs import get_redis
+from .odoo_provision import fetch_databases
+
+MAX_CONCURRENT_CREATES = int(os.getenv("ODOO_MAX_CONCURRENT_CREATES", "2"))
+SLOT_TIMEOUT           = int(os.getenv("SCHEDULER_SLOT_TIMEOUT", "1800"))    # seconds a slot may be held
+QUEUE_MAX_WAIT         = int(os.getenv("SCHEDULER_QUEUE_MAX_WAIT", "7200"))  # drop waiters older than this
+DB_COUNT_TTL           = float(os.getenv("SCHEDULER_DB_COUNT_TTL", "15"))
+
+SLOTS_KEY_FMT = "onboard:sched:slots:{backend}"   # zset holder -> acquired_at
+QUEUE_KEY_FMT = "onboard:sched:queue:{edition}"   # zset job_id -> first_seen
+
+
+@dataclass(frozen=True)
+class Backend:
+    name: str
+    edition: str
+    url: str
+    external: str
+    max_concurrent: int = MAX_CONCURRENT_CREATES
+    weight: float = 1.0
+
+    @property
+    def manager_url(self):
+        return f"{self.external}/web/database/manager"
+
+
+def _default_backends():
+    return [
+        Backend(
+            name="community",
+            edition="Community",
+            url=os.getenv("ODOO_COMMUNITY_URL", "http://odoo_community:8069"),
+            external=os.getenv("ODOO_COMMUNITY_EXTERNAL", "https://comm.savannasolutions.co.zm"),
+        ),
+        Backend(
+            name="enterprise",
+            edition="Enterprise",
+            url=os.getenv("ODOO_ENTERPRISE_URL", "http://odoo_enterprise:8069"),
+            external=os.getenv("ODOO_ENTERPRISE_EXTERNAL", "https://enter.savannasolutions.co.zm"),
+        ),
+    ]
+
+
+def load_backends(raw=None):
+    """Parse ODOO_BACKENDS (or fall back to the single-node defaults)."""
+    raw = os.getenv("ODOO_BACKENDS", "") if raw is None else raw
+    if not raw.strip():
+        return _default_backends()
+    backends = []
+    for entry in json.loads(raw):
+        edition = "Enterprise" if str(entry.get("edition", "")).lower().startswith("enter") else "Community"
+        backends.append(Backend(
+            name=entry["name"],
+            edition=edition,
+            url=entry["url"].rstrip("/"),
+            external=(entry.get("external") or entry["url"]).rstrip("/"),
+            max_concurrent=int(entry.get("max_concurrent", MAX_CONCURRENT_CREATES)),
+            weight=float(entry.get("weight", 1.0)),
+        ))
+    return backends
+
+
+BACKENDS = load_backends()
+
+_db_cache = {}  # {backend name: (expiry, names or None)}
+
+
+def backends_for(edition):
+    return [b for b in BACKENDS if b.edition == edition]
+
+
+def _databases(backend, fresh=False):
+    """Cached DB names on a backend; None when it is unreachable."""
+    cached = _db_cache.get(backend.name)
+    if not fresh and cached and cached[0] > time.monotonic():
+        return cached[1]
+    names = fetch_databases(backend.url)
+    _db_cache[backend.name] = (time.monotonic() + DB_COUNT_TTL, names)
+    return names
+
+
+def locate_database(db_name, edition=None):
+    """Backend that already hosts `db_name` (fresh listing), or None."""
+    for backend in (backends_for(edition) if edition else BACKENDS):
+        names = _databases(backend, fresh=True)
+        if names and db_name in names:
+            return backend
+    return None
+
+
+def _in_flight(r, backend):
+    key = SLOTS_KEY_FMT.format(backend=backend.name)
+    r.zremrangebyscore(key, "-inf", time.time() - SLOT_TIMEOUT)
+    return r.zcard(key)
+
+
+def try_slot(r, backend, holder):
+    """Take one of backend.max_concurrent slots atomically; True on success."""
+    key = SLOTS_KEY_FMT.format(backend=backend.name)
+    now = time.time()
+    pipe = r.pipeline(transaction=True)
+    pipe.zremrangebyscore(key, "-inf", now - SLOT_TIMEOUT)
+    pipe.zadd(key, {holder: now})
+    pipe.zrank(key, holder)
+    pipe.expire(key, SLOT_TIMEOUT)
+    rank = pipe.execute()[2]
+    if rank is not None and rank < backend.max_concurrent:
+        return True
+    r.zrem(key, holder)
+    return False
+
+
+def release(backend, holder):
+    """Give a creation slot back."""
+    get_redis().zrem(SLOTS_KEY_FMT.format(backend=backend.name), holder)
+
+
+def place(edition, holder):
+    """
+    Try to reserve a slot for `holder` (the job id) on the best backend.
+    Returns (backend, None) on success or (None, queue_position) when the caller
+    must wait and retry. The holder's place in the FIFO survives retries.
+    """
+    r = get_redis()
+    queue = QUEUE_KEY_FMT.format(edition=edition)
+    now = time.time()
+    r.zremrangebyscore(queue, "-inf", now - QUEUE_MAX_WAIT)
+    r.zadd(queue, {holder: now}, nx=True)
+    r.expire(queue, QUEUE_MAX_WAIT)
+    position = r.zrank(queue, holder) or 0
+
+    candidates = []
+    for backend in backends_for(edition):
+        names = _databases(backend)
+        if names is None:
+            continue  # unreachable: never place tenants on it
+        busy = _in_flight(r, backend)
+        if busy >= backend.max_concurrent:
+            continue
+        candidates.append(((busy / backend.max_concurrent, len(names) / backend.weight), backend))
+    free_slots = sum(b.max_concurrent - _in_flight(r, b) for _, b in candidates)
+
+    # Only the oldest `free_slots` waiters may take a slot (fair ordering)
+    if position < free_slots:
+        for _, backend in sorted(candidates, key=lambda c: c[0]):
+            if try_slot(r, backend, holder):
+                r.zrem(queue, holder)
+                _db_cache.pop(backend.name, None)  # its DB count is about to change
+                return backend, None
+    return None, position + 1
+
+
+def leave_queue(edition, holder):
+    """Drop a job from the waiting FIFO (e.g. it failed for another reason)."""
+    get_redis().zrem(QUEUE_KEY_FMT.format(edition=edition), holder)
@@ -0,0 +1,131 @@
+# onboarding_worker/tasks/templates.py
+"""
+Pre-warmed template database pool.
+
+A template is a fully initialised Odoo database (base + lang + module set) that
+new tenants are cloned from with /web/database/duplicate (CREATE DATABASE ...
+TEMPLATE + filestore copy), followed by a re-key of admin login/password and
+company details. That skips the minutes-long module installation per client.
+
+Configuration (env):
+    TEMPLATE_POOL_SPECS     ";"-separated "Edition:lang:mod1,mod2" entries, e.g.
+                            "Enterprise:en_US:sale_management,crm;Community:en_US:"
+                            (empty = pool disabled, every job does a full create)
+    TEMPLATE_POOL_SIZE      copies kept per spec (concurrent clones, default 2)
+    TEMPLATE_ADMIN_PASSWORD admin password set on templates (required for re-key)
+
+Templates are kept on every backend of their edition (see scheduler.py), since a
+clone can only be made inside the same Postgres cluster.
+
+Redis keys:
+    onboard:tmpl:ready:<backend>          set of template names that finished warming
+    onboard:tmpl:lease:<backend>:<name>   short lease held while a template is cloned/warmed
+"""
+
+import hashlib
+import os
+
+from . import scheduler
+from .jobs import get_redis
+from .odoo_provision import create_odoo_database, fetch_databases, prepare_template_database
+
+TEMPLATE_POOL_SPECS     = os.getenv("TEMPLATE_POOL_SPECS", "")
+TEMPLATE_POOL_SIZE      = int(os.getenv("TEMPLATE_POOL_SIZE", "2"))
+TEMPLATE_ADMIN_LOGIN    = "admin"
+TEMPLATE_ADMIN_PASSWORD = os.getenv("TEMPLATE_ADMIN_PASSWORD", "")
+TEMPLATE_LEASE_SECONDS  = int(os.getenv("TEMPLATE_LEASE_SECONDS", "900"))
+
+READY_KEY_FMT = "onboard:tmpl:ready:{backend}"
+LEASE_KEY_FMT = "onboard:tmpl:lease:{backend}:{name}"
+
+
+def parse_specs(raw=TEMPLATE_POOL_SPECS):
+    """Parse TEMPLATE_POOL_SPECS into [(edition, lang, (modules...)), ...]."""
+    specs = []
+    for entry in filter(None, (e.strip() for e in raw.split(";"))):
+        edition, _, rest = entry.partition(":")
+        lang, _, mods = rest.partition(":")
+        is_enterprise = edition.strip().lower().startswith("enter")
+        modules = tuple(sorted({m.strip() for m in mods.split(",") if m.strip()}))
+        specs.append(("Enterprise" if is_enterprise else "Community", lang.strip() or "en_US", modules))
+    return specs
+
+
+def template_names(edition, lang, modules):
+    """Deterministic DB names for one spec's pool (valid Odoo DB names, <= 63 chars)."""
+    digest = hashlib.sha1(",".join(sorted(modules)).encode()).hexdigest()[:8]
+    prefix = f"tmpl_{edition[:3].lower()}_{lang.lower()}_{digest}"
+    return [f"{prefix}_{i}" for i in range(TEMPLATE_POOL_SIZE)]
+
+
+def acquire_template(backend, edition, lang, modules, holder):
+    """
+    Lease a ready template on `backend` matching the request, or return None.
+    Only enabled when TEMPLATE_ADMIN_PASSWORD is set and the spec is configured.
+    """
+    key = (edition, lang, tuple(sorted(set(modules))))
+    if not TEMPLATE_ADMIN_PASSWORD or key not in parse_specs():
+        return None
+    r = get_redis()
+    ready_key = READY_KEY_FMT.format(backend=backend.name)
+    for name in template_names(*key):
+        if not r.sismember(ready_key, name):
+            continue
+        lease_key = LEASE_KEY_FMT.format(backend=backend.name, name=name)
+        if r.set(lease_key, holder, nx=True, ex=TEMPLATE_LEASE_SECONDS):
+            return name
+    return None
+
+
+def release_template(backend, name, holder):
+    """Release a lease, but only if we still hold it."""
+    r = get_redis()
+    key = LEASE_KEY_FMT.format(backend=backend.name, name=name)
+    if r.get(key) == holder:
+        r.delete(key)
+
+
+def warm_pool(backends):
+    """
+    Make sure every configured template exists and is marked ready on each backend
+    of its edition. Warming takes a scheduler creation slot like any other create,
+    so it never pushes a node past its concurrency cap (busy nodes are retried on
+    the next run). Returns names created this run as "backend/name".
+    """
+    if not TEMPLATE_ADMIN_PASSWORD:
+        return []
+    r = get_redis()
+    created = []
+    for edition, lang, modules in parse_specs():
+        for backend in (b for b in backends if b.edition == edition):
+            existing = fetch_databases(backend.url)
+            if existing is None:
+                continue  # unreachable; next run
+            ready_key = READY_KEY_FMT.format(backend=backend.name)
+            for name in template_names(edition, lang, modules):
+                if name in existing and r.sismember(ready_key, name):
+                    continue
+                lease_key = LEASE_KEY_FMT.format(backend=backend.name, name=name)
+                if not r.set(lease_key, "warming", nx=True, ex=TEMPLATE_LEASE_SECONDS * 4):
+                    continue  # another worker is on it
+                holder = f"warm:{name}"
+                if not scheduler.try_slot(r, backend, holder):
+                    release_template(backend, name, "warming")
+                    break  # node is busy with client creations
+                try:
+                    r.srem(ready_key, name)
+                    create_odoo_database(
+                        backend.url, name,
+                        admin_login=TEMPLATE_ADMIN_LOGIN, password=TEMPLATE_ADMIN_PASSWORD,
+                        lang=lang, country="", phone="", demo=False,
+                    )
+                    prepare_template_database(backend.url, name, TEMPLATE_ADMIN_LOGIN, TEMPLATE_ADMIN_PASSWORD, modules)
+                    r.sadd(ready_key, name)
+                    created.append(f"{backend.name}/{name}")
+                    print(f"Template {name} ready on {backend.name} ({edition}, {lang}, {len(modules)} modules)")
+                except Exception as e:
+                    print(f"Template {name} warm-up on {backend.name} failed: {e}")
+                finally:
+                    scheduler.release(backend, holder)
+                    release_template(backend, name, "warming")
+    return created
@@ -0,0 +1,119 @@
+# onboarding_worker/tests/test_batch_jobs.py
+"""
+A job of a bulk-import batch must give its window slot back whatever happens to
+it, otherwise the batch stalls (see tasks/batches.py).
+"""
+
+import json
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("celery")
+pytest.importorskip("redis")
+pytest.importorskip("prometheus_client")
+
+import tasks
+from tasks import batches, jobs, scheduler
+
+BACKEND = scheduler.Backend(name="community", edition="Community",
+                            url="http://odoo_community:8069", external="https://comm.example.com")
+
+
+class FakeRedis:
+    """The few hash/list commands used by the job records and the batches."""
+
+    def __init__(self):
+        self.data = {}
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        h = self.data.setdefault(key, {})
+        if field is not None:
+            h[field] = str(value)
+        h.update({k: str(v) for k, v in (mapping or {}).items()})
+
+    def hdel(self, key, field):
+        self.data.get(key, {}).pop(field, None)
+
+    def hincrby(self, key, field, amount):
+        h = self.data.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    def lpop(self, key):
+        values = self.data.get(key) or []
+        return values.pop(0) if values else None
+
+    def expire(self, key, ttl):
+        pass
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def batch():
+    """A batch with parallelism 1: job-1 in flight, job-2 pending."""
+    r = FakeRedis()
+    meta_key, pending_key, payloads_key = batches._keys("b1")
+    r.hset(meta_key, mapping={"parallelism": 1, "in_flight": 1})
+    r.rpush(pending_key, "job-2")
+    for job_id in ("job-1", "job-2"):
+        r.hset(payloads_key, job_id, json.dumps({"db_name": job_id, "edition": "Community", "batch_id": "b1"}))
+    with mock.patch.object(jobs, "_client", r), \
+         mock.patch.object(tasks.app, "send_task") as send_task, \
+         mock.patch.object(scheduler, "locate_database", return_value=None), \
+         mock.patch.object(scheduler, "release") as release:
+        yield r, send_task, release
+
+
+def _run_job_1():
+    data = {"db_name": "job-1", "edition": "Community", "batch_id": "b1"}
+    return tasks.create_database_job.apply(args=["job-1", data])
+
+
+def _assert_next_job_dispatched(r, send_task):
+    assert r.hget(jobs.JOB_KEY_FMT.format(job_id="job-1"), "state") == "failed"
+    # job-1's slot was given back and taken by job-2
+    assert r.hget(batches._keys("b1")[0], "in_flight") == "1"
+    send_task.assert_called_once()
+    assert send_task.call_args.kwargs["args"][0] == "job-2"
+
+
+def test_job_failing_to_start_frees_its_batch_slot(batch):
+    r, send_task, release = batch
+    real_update_job = tasks.update_job
+
+    def update_job(job_id, **fields):
+        if fields.get("state") == "running":
+            raise ConnectionError("Redis went away")
+        real_update_job(job_id, **fields)
+
+    with mock.patch.object(scheduler, "place", return_value=(BACKEND, 0)), \
+         mock.patch.object(tasks, "update_job", side_effect=update_job):
+        _run_job_1()
+
+    release.assert_called_once_with(BACKEND, "job-1")
+    _assert_next_job_dispatched(r, send_task)
+
+
+def test_job_failing_before_placement_frees_its_batch_slot(batch):
+    r, send_task, release = batch
+    with mock.patch.object(scheduler, "place", side_effect=ConnectionError("Redis went away")):
+        result = _run_job_1()
+
+    assert result.failed()
+    release.assert_not_called()
+    _assert_next_job_dispatched(r, send_task)